@@ -0,0 +1,120 @@
+"""
+Postgres LISTEN/NOTIFY 기반 프로세스(레플리카) 간 캐시 무효화
+- 쓰기 경로: bump_generation(s, table) -> cache_generations 세대 번호 증가 + pg_notify (커밋 시 전달)
+- 각 프로세스: InvalidationBus 리스너 스레드가 알림 수신 -> 해당 테이블에 등록된 캐시 clear
+- 재연결 시 누락된 알림은 cache_generations 세대 비교로 보정
+"""
+import json
+import select
+import threading
+
+import psycopg2
+from sqlalchemy import text
+
+CHANNEL = 'ck_cache_invalidate'
+
+CREATE_GENERATIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS cache_generations (
+        table_name TEXT PRIMARY KEY,
+        generation BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMPTZ DEFAULT NOW()
+    );
+"""
+
+
+def bump_generation(s, table_name):
+    """세대 번호 증가 + NOTIFY 발행 (호출 측 트랜잭션 안에서 실행, 커밋 시 전달)"""
+    gen = s.execute(text("""
+        INSERT INTO cache_generations (table_name, generation) VALUES (:t, 1)
+        ON CONFLICT (table_name) DO UPDATE
+        SET generation = cache_generations.generation + 1, updated_at = NOW()
+        RETURNING generation
+    """), {"t": table_name}).scalar()
+    s.execute(text("SELECT pg_notify(:ch, :payload)"),
+              {"ch": CHANNEL, "payload": json.dumps({"table": table_name, "generation": gen})})
+    return gen
+
+
+class InvalidationBus:
+    """프로세스당 1개: 테이블명 -> 캐시 clear 함수 목록, 백그라운드 LISTEN 스레드"""
+
+    def __init__(self, dsn, poll_timeout=5.0, max_backoff=30.0):
+        self.dsn = dsn
+        self.poll_timeout = poll_timeout
+        self.max_backoff = max_backoff
+        self._handlers = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, table_name, clear_fn):
+        with self._lock:
+            fns = self._handlers.setdefault(table_name, [])
+            if clear_fn not in fns: fns.append(clear_fn)
+
+    def generation(self, table_name):
+        """마지막으로 관측한 세대 번호 (캐시 키 구성용, 미관측 시 0)"""
+        with self._lock:
+            return self._generations.get(table_name, 0)
+
+    def start(self):
+        if self._thread and self._thread.is_alive(): return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ck-cache-bus", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _clear(self, table_name):
+        with self._lock:
+            fns = list(self._handlers.get(table_name, []))
+        for fn in fns:
+            try: fn()
+            except Exception: pass
+
+    def _observe(self, table_name, gen):
+        """새 세대이면 기록 후 True (중복/지연 알림 무시)"""
+        with self._lock:
+            if gen is not None and gen <= self._generations.get(table_name, 0): return False
+            self._generations[table_name] = gen if gen is not None else self._generations.get(table_name, 0) + 1
+            return True
+
+    def _resync(self, cur, first):
+        """(재)연결 직후: 세대 비교로 누락 알림 보정 (최초 연결 시 기록만)"""
+        cur.execute("SELECT table_name, generation FROM cache_generations")
+        for table_name, gen in cur.fetchall():
+            if self._observe(table_name, gen) and not first: self._clear(table_name)
+
+    def _run(self):
+        backoff, first = 1.0, True
+        while not self._stop.is_set():
+            listen_conn = None
+            try:
+                listen_conn = psycopg2.connect(self.dsn)
+                listen_conn.autocommit = True
+                cur = listen_conn.cursor()
+                cur.execute(f"LISTEN {CHANNEL};")
+                self._resync(cur, first)
+                first, backoff = False, 1.0
+
+                while not self._stop.is_set():
+                    if select.select([listen_conn], [], [], self.poll_timeout) == ([], [], []): continue
+                    listen_conn.poll()
+                    while listen_conn.notifies:
+                        note = listen_conn.notifies.pop(0)
+                        try:
+                            payload = json.loads(note.payload)
+                            table_name, gen = payload.get('table'), payload.get('generation')
+                        except Exception:
+                            table_name, gen = note.payload, None
+                        if table_name and self._observe(table_name, gen): self._clear(table_name)
+            except Exception:
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+            finally:
+                if listen_conn is not None:
+                    try: listen_conn.close()
+                    except Exception: pass
@@ -0,0 +1,52 @@
+"""
+공용 유틸리티 (Streamlit/DB 비의존 - 앱, 엑셀 파서, 워커 프로세스에서 공용)
+"""
+import json
+import re
+from datetime import datetime
+
+import pandas as pd
+import pytz
+
+KST = pytz.timezone('Asia/Seoul')
+
+def get_kst_today():
+    return datetime.now(KST).date()
+
+def safe_date_parse(val):
+    if pd.isna(val) or str(val).strip() == '': return None
+    try:
+        if isinstance(val, datetime): return val.strftime('%Y-%m-%d')
+        s_val = str(val).strip()
+        if re.match(r'^\d{2}/\d{2}/\d{2}$', s_val): # 25/01/01
+            dt = datetime.strptime(s_val, "%y/%m/%d")
+            if dt.year < 2000: dt = dt.replace(year=dt.year+2000)
+            return dt.strftime('%Y-%m-%d')
+        if re.match(r'^\d{4}-\d{2}-\d{2}$', s_val): return datetime.strptime(s_val, "%Y-%m-%d").strftime('%Y-%m-%d')
+        return pd.to_datetime(val).strftime('%Y-%m-%d')
+    except: return None
+
+def safe_float_parse(val):
+    if pd.isna(val) or str(val).strip() == '': return 0.0
+    try: return float(str(val).replace(',', '').replace(' ', '').strip())
+    except: return 0.0
+
+def load_json_list(val):
+    """JSONB 컬럼 값(list 또는 JSON 문자열) -> list"""
+    if isinstance(val, list): return val
+    if isinstance(val, str) and val.strip():
+        try:
+            loaded = json.loads(val)
+            return loaded if isinstance(loaded, list) else []
+        except: return []
+    return []
+
+def py_value(val):
+    """pandas/NumPy 스칼라 -> 파이썬 값 (NaN/NA/NaT -> None, JSONB list/dict 는 그대로)"""
+    if isinstance(val, (list, dict)): return val
+    if val is None or pd.isna(val): return None
+    return val.item() if hasattr(val, 'item') else val
+
+def to_records(df):
+    """압축 dtype(category/Arrow 문자열/Int64) DataFrame -> 결측이 None 인 dict 리스트 (폼/HTML 렌더링용)"""
+    return [{k: py_value(v) for k, v in row.items()} for row in df.to_dict('records')]
@@ -0,0 +1,1130 @@
+"""
+DB 연결, 스키마 부트스트랩, 데이터 조회/액션 함수 (수입/수출 공용)
+- 모듈 import 는 프로세스당 1회, 스키마 부트스트랩은 st.cache_resource 로 프로세스당 1회 실행
+"""
+import json
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import cache_bus
+import common
+import delta_sync
+import excel_import
+import parse_cache
+import prefetch
+import read_routing
+import snapshot
+from common import get_kst_today, load_json_list, safe_date_parse, safe_float_parse, to_records
+
+conn = st.connection("supabase", type="sql")
+
+def _has_connection(name):
+    try: return name in st.secrets.get('connections', {})
+    except Exception: return False
+
+# 읽기 전용 레플리카 (선택) - secrets 에 [connections.supabase_replica] 가 있을 때만, 없으면 모든 읽기가 conn
+replica_conn = st.connection("supabase_replica", type="sql") if _has_connection("supabase_replica") else None
+
+# 레플리카 지연 허용치(초) - 증분 동기화 overlap(30초)보다 작게
+REPLICA_MAX_LAG = float(os.environ.get('CK_REPLICA_MAX_LAG', '5'))
+
+@st.cache_resource
+def get_read_router():
+    """프로세스당 1개: 읽기 헬퍼(get_schedule_data / get_products_df / get_triangular_trades)의 연결 선택"""
+    return read_routing.ReadRouter(conn, replica_conn, max_lag=REPLICA_MAX_LAG)
+
+def read_conn():
+    """읽기용 연결 (레플리카, 최근 쓰기/지연 초과 시 프라이머리)"""
+    return get_read_router().pick()
+
+def note_write():
+    """쓰기 직후 호출: 잠시 프라이머리에서 읽어 방금 쓴 값이 보이도록"""
+    get_read_router().note_write()
+
+# ==========================================
+# 0. 스키마 업데이트 (프로세스당 1회)
+# ==========================================
+
+@st.cache_resource
+def bootstrap_schema():
+    """테이블/컬럼/트리거/인덱스 생성 (IF NOT EXISTS) - 실패 시 캐시되지 않아 다음 rerun 에서 재시도"""
+    with conn.session as s:
+        # 공통 컬럼 정의 (수입/수출)
+        common_cols = [
+            ("ck_code", "TEXT"), ("size", "TEXT"), ("unit_price", "NUMERIC"), ("supplier", "TEXT"),
+            ("global_code", "TEXT"), ("doojin_code", "TEXT"), ("agency", "TEXT"), ("agency_contract", "TEXT"),
+            ("origin", "TEXT"), ("packing", "TEXT"), ("open_qty", "NUMERIC"), ("doc_qty", "NUMERIC"),
+            ("box_qty", "NUMERIC"), ("unit2", "TEXT"), ("open_amount", "NUMERIC"), ("doc_amount", "NUMERIC"),
+            ("tt_check", "TEXT"), ("bank", "TEXT"), ("usance", "TEXT"), ("at_sight", "TEXT"),
+            ("open_date", "DATE"), ("lc_no", "TEXT"), ("invoice_no", "TEXT"), ("bl_no", "TEXT"),
+            ("lg_no", "TEXT"), ("insurance", "TEXT"), ("customs_broker_date", "DATE"), ("etd", "DATE"),
+            ("arrival_date", "DATE"), ("warehouse", "TEXT"), ("actual_in_qty", "NUMERIC"), ("destination", "TEXT"),
+            ("doc_acceptance", "DATE"), ("acceptance_rate", "NUMERIC"), ("maturity_date", "DATE"),
+            ("ext_maturity_date", "DATE"), ("acceptance_fee", "NUMERIC"), ("discount_fee", "NUMERIC"),
+            ("payment_date", "DATE"), ("payment_amount", "NUMERIC"), ("exchange_rate", "NUMERIC"),
+            ("balance", "NUMERIC"), ("avg_exchange_rate", "NUMERIC"),
+            ("arrival_exchange_rate", "NUMERIC"), # 도착일 환율 (이미지 반영)
+            ("clearance_info", "JSONB"), ("declaration_info", "JSONB"),
+            ("status", "TEXT"), ("product_id", "INTEGER"), ("note", "TEXT"), ("quantity", "NUMERIC"), ("expected_date", "DATE")
+        ]
+
+        # 1. Import Schedules 테이블 업데이트
+        for col_name, col_type in common_cols:
+            s.execute(text(f"ALTER TABLE import_schedules ADD COLUMN IF NOT EXISTS {col_name} {col_type};"))
+        
+        # 2. Export Schedules 테이블 생성 (수입과 동일 구조)
+        s.execute(text("""
+            CREATE TABLE IF NOT EXISTS export_schedules (
+                id SERIAL PRIMARY KEY,
+                created_at TIMESTAMPTZ DEFAULT NOW()
+            );
+        """))
+        for col_name, col_type in common_cols:
+            s.execute(text(f"ALTER TABLE export_schedules ADD COLUMN IF NOT EXISTS {col_name} {col_type};"))
+        
+        # 3. Triangular Trades 테이블 생성 (부가 정보 태그용)
+        # ck_code, origin, product_name 등은 import_id로 찾을 수도 있지만, 스냅샷 성격으로 저장
+        s.execute(text("""
+            CREATE TABLE IF NOT EXISTS triangular_trades (
+                id SERIAL PRIMARY KEY,
+                import_id INTEGER,
+                ck_code TEXT,
+                importer TEXT,
+                origin TEXT,
+                product_name TEXT,
+                size TEXT,
+                packing TEXT,
+                open_qty NUMERIC,
+                unit TEXT,
+                open_amount NUMERIC,
+                invoice_no TEXT,
+                eta DATE,
+                payment_date DATE,
+                payment_amount NUMERIC,
+                exchange_rate NUMERIC,
+                created_at TIMESTAMPTZ DEFAULT NOW()
+            );
+        """))
+
+        # 4. ETA 요약 테이블 (expected_date × status 사전 집계, 트리거로 증분 유지)
+        s.execute(text("""
+            CREATE TABLE IF NOT EXISTS schedule_eta_summary (
+                table_name TEXT NOT NULL,
+                expected_date DATE NOT NULL,
+                status TEXT NOT NULL,
+                cnt INTEGER NOT NULL DEFAULT 0,
+                quantity NUMERIC NOT NULL DEFAULT 0,
+                open_amount NUMERIC NOT NULL DEFAULT 0,
+                PRIMARY KEY (table_name, expected_date, status)
+            );
+        """))
+        # 트리거 함수는 항상 최신 정의로 교체 (트리거 생성/백필은 최초 1회)
+        s.execute(text("""
+            CREATE OR REPLACE FUNCTION sync_eta_summary() RETURNS TRIGGER AS $$
+            BEGIN
+                -- 보관 이동(archive_closed_schedules)은 같은 트랜잭션에서 집합 단위로 요약을 조정
+                IF current_setting('ck.skip_eta_summary', true) = 'on' THEN
+                    RETURN NULL;
+                END IF;
+                IF TG_OP = 'UPDATE'
+                   AND OLD.expected_date IS NOT DISTINCT FROM NEW.expected_date
+                   AND OLD.status IS NOT DISTINCT FROM NEW.status
+                   AND OLD.quantity IS NOT DISTINCT FROM NEW.quantity
+                   AND OLD.open_amount IS NOT DISTINCT FROM NEW.open_amount THEN
+                    RETURN NULL;
+                END IF;
+                IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.expected_date IS NOT NULL THEN
+                    UPDATE schedule_eta_summary
+                    SET cnt = cnt - 1,
+                        quantity = quantity - COALESCE(OLD.quantity, 0),
+                        open_amount = open_amount - COALESCE(OLD.open_amount, 0)
+                    WHERE table_name = TG_TABLE_NAME AND expected_date = OLD.expected_date
+                      AND status = COALESCE(OLD.status, 'PENDING');
+                    DELETE FROM schedule_eta_summary
+                    WHERE table_name = TG_TABLE_NAME AND expected_date = OLD.expected_date
+                      AND status = COALESCE(OLD.status, 'PENDING') AND cnt <= 0;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.expected_date IS NOT NULL THEN
+                    INSERT INTO schedule_eta_summary (table_name, expected_date, status, cnt, quantity, open_amount)
+                    VALUES (TG_TABLE_NAME, NEW.expected_date, COALESCE(NEW.status, 'PENDING'), 1,
+                            COALESCE(NEW.quantity, 0), COALESCE(NEW.open_amount, 0))
+                    ON CONFLICT (table_name, expected_date, status) DO UPDATE
+                    SET cnt = schedule_eta_summary.cnt + 1,
+                        quantity = schedule_eta_summary.quantity + EXCLUDED.quantity,
+                        open_amount = schedule_eta_summary.open_amount + EXCLUDED.open_amount;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """))
+        for tbl in ['import_schedules', 'export_schedules']:
+            trg_name = f"trg_eta_summary_{tbl}"
+            if s.execute(text("SELECT 1 FROM pg_trigger WHERE tgname = :n"), {"n": trg_name}).fetchone(): continue
+            # 트리거가 없을 때만 트리거 생성 + 기존 데이터 백필 (동일 트랜잭션)
+            s.execute(text(f"""
+                CREATE TRIGGER {trg_name}
+                AFTER INSERT OR DELETE OR UPDATE OF expected_date, status, quantity, open_amount ON {tbl}
+                FOR EACH ROW EXECUTE FUNCTION sync_eta_summary();
+            """))
+            s.execute(text("DELETE FROM schedule_eta_summary WHERE table_name = :t"), {"t": tbl})
+            s.execute(text(f"""
+                INSERT INTO schedule_eta_summary (table_name, expected_date, status, cnt, quantity, open_amount)
+                SELECT :t, expected_date, COALESCE(status, 'PENDING'), COUNT(*),
+                       COALESCE(SUM(quantity), 0), COALESCE(SUM(open_amount), 0)
+                FROM {tbl} WHERE expected_date IS NOT NULL
+                GROUP BY expected_date, COALESCE(status, 'PENDING');
+            """), {"t": tbl})
+
+        # 5. 통관/수입신고 자식 테이블 (clearance_info / declaration_info JSONB 정규화, 건수 제한 없음)
+        need_backfill = s.execute(text("SELECT to_regclass('schedule_clearances') IS NULL")).scalar()
+        s.execute(text("""
+            CREATE TABLE IF NOT EXISTS schedule_clearances (
+                id SERIAL PRIMARY KEY,
+                table_name TEXT NOT NULL,
+                schedule_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                clearance_date DATE,
+                qty NUMERIC DEFAULT 0,
+                rate NUMERIC DEFAULT 0
+            );
+        """))
+        s.execute(text("""
+            CREATE TABLE IF NOT EXISTS schedule_declarations (
+                id SERIAL PRIMARY KEY,
+                table_name TEXT NOT NULL,
+                schedule_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                declaration_date DATE,
+                declaration_no TEXT
+            );
+        """))
+        s.execute(text("CREATE INDEX IF NOT EXISTS idx_sch_clr_schedule ON schedule_clearances (table_name, schedule_id);"))
+        s.execute(text("CREATE INDEX IF NOT EXISTS idx_sch_clr_date ON schedule_clearances (clearance_date);"))
+        s.execute(text("CREATE INDEX IF NOT EXISTS idx_sch_decl_schedule ON schedule_declarations (table_name, schedule_id);"))
+        s.execute(text("CREATE INDEX IF NOT EXISTS idx_sch_decl_date ON schedule_declarations (declaration_date);"))
+
+        if need_backfill:
+            # 최초 생성 시 기존 JSONB 배열에서 백필
+            date_expr = "CASE WHEN e.item->>'date' ~ '^[0-9]{4}-[0-9]{2}-[0-9]{2}$' THEN CAST(e.item->>'date' AS DATE) END"
+            for tbl in ['import_schedules', 'export_schedules']:
+                s.execute(text(f"""
+                    INSERT INTO schedule_clearances (table_name, schedule_id, seq, clearance_date, qty, rate)
+                    SELECT :t, s.id, e.ord, {date_expr},
+                           CASE WHEN e.item->>'qty' ~ '^-?[0-9]+([.][0-9]+)?$' THEN CAST(e.item->>'qty' AS NUMERIC) ELSE 0 END,
+                           CASE WHEN e.item->>'rate' ~ '^-?[0-9]+([.][0-9]+)?$' THEN CAST(e.item->>'rate' AS NUMERIC) ELSE 0 END
+                    FROM {tbl} s,
+                         jsonb_array_elements(CASE WHEN jsonb_typeof(s.clearance_info) = 'array' THEN s.clearance_info ELSE '[]' END) WITH ORDINALITY AS e(item, ord)
+                    WHERE jsonb_typeof(e.item) = 'object';
+                """), {"t": tbl})
+                s.execute(text(f"""
+                    INSERT INTO schedule_declarations (table_name, schedule_id, seq, declaration_date, declaration_no)
+                    SELECT :t, s.id, e.ord, {date_expr}, NULLIF(e.item->>'no', '')
+                    FROM {tbl} s,
+                         jsonb_array_elements(CASE WHEN jsonb_typeof(s.declaration_info) = 'array' THEN s.declaration_info ELSE '[]' END) WITH ORDINALITY AS e(item, ord)
+                    WHERE jsonb_typeof(e.item) = 'object';
+                """), {"t": tbl})
+
+        # 6. 캐시 무효화 세대 번호 (LISTEN/NOTIFY 버스)
+        s.execute(text(cache_bus.CREATE_GENERATIONS_SQL))
+
+        # 7. 증분 동기화: updated_at (트리거 유지) + 삭제 묘비
+        s.execute(text("""
+            CREATE TABLE IF NOT EXISTS schedule_tombstones (
+                id BIGSERIAL PRIMARY KEY,
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+        """))
+        s.execute(text("CREATE INDEX IF NOT EXISTS idx_tombstones_table_deleted ON schedule_tombstones (table_name, deleted_at);"))
+        for tbl in ['import_schedules', 'export_schedules', 'triangular_trades']:
+            s.execute(text(f"ALTER TABLE {tbl} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();"))
+            s.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{tbl}_updated_at ON {tbl} (updated_at);"))
+            trg_name = f"trg_touch_{tbl}"
+            if s.execute(text("SELECT 1 FROM pg_trigger WHERE tgname = :n"), {"n": trg_name}).fetchone(): continue
+            s.execute(text("""
+                CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS TRIGGER AS $$
+                BEGIN
+                    NEW.updated_at := NOW();
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+            s.execute(text(f"CREATE TRIGGER {trg_name} BEFORE INSERT OR UPDATE ON {tbl} FOR EACH ROW EXECUTE FUNCTION touch_updated_at();"))
+        # 삼각무역 태그 변경 -> 연결된 수입 건 updated_at 갱신 (장부의 tri_cnt 증분 반영용)
+        if not s.execute(text("SELECT 1 FROM pg_trigger WHERE tgname = 'trg_touch_parent_import'")).fetchone():
+            s.execute(text("""
+                CREATE OR REPLACE FUNCTION touch_parent_import() RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP <> 'INSERT' AND OLD.import_id IS NOT NULL THEN
+                        UPDATE import_schedules SET updated_at = NOW() WHERE id = OLD.import_id;
+                    END IF;
+                    IF TG_OP <> 'DELETE' AND NEW.import_id IS NOT NULL THEN
+                        UPDATE import_schedules SET updated_at = NOW() WHERE id = NEW.import_id;
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+            s.execute(text("CREATE TRIGGER trg_touch_parent_import AFTER INSERT OR UPDATE OR DELETE ON triangular_trades FOR EACH ROW EXECUTE FUNCTION touch_parent_import();"))
+        # 품목명/코드/단위 변경 -> 그 품목의 수입/수출 건 updated_at 갱신 (장부 JOIN 컬럼 증분 반영용, 재고 앱 등 외부 수정 포함)
+        for tbl in ['import_schedules', 'export_schedules']:
+            s.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{tbl}_product_id ON {tbl} (product_id);"))
+        if not s.execute(text("SELECT 1 FROM pg_trigger WHERE tgname = 'trg_touch_product_schedules'")).fetchone():
+            s.execute(text("""
+                CREATE OR REPLACE FUNCTION touch_product_schedules() RETURNS TRIGGER AS $$
+                BEGIN
+                    UPDATE import_schedules SET updated_at = NOW() WHERE product_id = NEW.product_id;
+                    UPDATE export_schedules SET updated_at = NOW() WHERE product_id = NEW.product_id;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+            s.execute(text("""
+                CREATE TRIGGER trg_touch_product_schedules AFTER UPDATE OF product_name, product_code, unit ON products FOR EACH ROW
+                WHEN (OLD.product_name IS DISTINCT FROM NEW.product_name OR OLD.product_code IS DISTINCT FROM NEW.product_code OR OLD.unit IS DISTINCT FROM NEW.unit)
+                EXECUTE FUNCTION touch_product_schedules();
+            """))
+
+        # 8. 업로드 미리보기: CK관리번호 일괄 조회 (ck_code = ANY(:keys))
+        for tbl in ['import_schedules', 'export_schedules']:
+            s.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{tbl}_ck_code ON {tbl} (ck_code);"))
+
+        # 9. 품목코드 유일 인덱스 (일괄 등록 ON CONFLICT 대상) - 기존 데이터에 중복 코드가 있으면 만들지 않음
+        dup_code = s.execute(text("SELECT 1 FROM products WHERE product_code IS NOT NULL GROUP BY product_code HAVING COUNT(*) > 1 LIMIT 1")).fetchone()
+        if not dup_code:
+            s.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS uq_products_product_code ON products (product_code);"))
+
+        # 10. 마감 건 보관 테이블 (운영 테이블과 같은 컬럼 + archived_at, 운영 테이블에 새로 생긴 컬럼만 추가)
+        for tbl in ['import_schedules', 'export_schedules']:
+            s.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {tbl}_archive (
+                    LIKE {tbl} INCLUDING DEFAULTS,
+                    archived_at TIMESTAMPTZ DEFAULT NOW(),
+                    PRIMARY KEY (id)
+                );
+            """))
+            missing = s.execute(text("""
+                SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+                FROM pg_attribute a
+                WHERE a.attrelid = CAST(:hot AS regclass) AND a.attnum > 0 AND NOT a.attisdropped
+                  AND NOT EXISTS (SELECT 1 FROM pg_attribute b WHERE b.attrelid = CAST(:arc AS regclass) AND b.attname = a.attname AND NOT b.attisdropped)
+            """), {"hot": tbl, "arc": f"{tbl}_archive"}).fetchall()
+            for col_name, col_type in missing:
+                s.execute(text(f'ALTER TABLE {tbl}_archive ADD COLUMN IF NOT EXISTS "{col_name}" {col_type};'))
+            s.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{tbl}_archive_expected ON {tbl}_archive (expected_date);"))
+            s.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{tbl}_archive_ck_code ON {tbl}_archive (ck_code);"))
+
+        # 11. 조회 경로 인덱스 (tools/check_query_plans.py 로 실행 계획 확인)
+        # 장부 tri_cnt 서브쿼리 / 삼각무역 태그 조회 (import_id = :id)
+        s.execute(text("CREATE INDEX IF NOT EXISTS idx_triangular_trades_import_id ON triangular_trades (import_id);"))
+        # 재고 중복 확인/롤백 삭제 (STOCK_LOT_CHECK_SQL / STOCK_LOT_DELETE_SQL) - stock_by_lot 은 재고 앱 테이블이므로 있을 때만
+        if s.execute(text("SELECT to_regclass('stock_by_lot') IS NOT NULL")).scalar():
+            s.execute(text("CREATE INDEX IF NOT EXISTS idx_stock_by_lot_product_lot ON stock_by_lot (product_id, lot_number) WHERE is_cleared = FALSE;"))
+
+        s.commit()
+    return True
+
+# ==========================================
+# 1. 데이터 조회 및 액션 함수
+# ==========================================
+
+@st.cache_data(ttl=86400)
+def get_products_df():
+    """DB에 등록된 품목 리스트 조회"""
+    try:
+        with read_conn().session as s:
+            df = pd.DataFrame(s.execute(text("SELECT product_id, product_name, product_code, category, unit FROM products WHERE is_active = TRUE ORDER BY category, product_name")).fetchall())
+            if not df.empty:
+                df.columns = ['ID', '품목명', '품목코드', '카테고리', '단위']
+            return df
+    except Exception:
+        return pd.DataFrame()
+
+def register_new_product(code, name, cat, unit):
+    """신규 품목 DB 등록"""
+    try:
+        with conn.session as s:
+            chk = s.execute(text("SELECT 1 FROM products WHERE product_code = :code"), {"code": code}).fetchone()
+            if chk: return False, "이미 존재하는 품목코드입니다."
+            s.execute(text("""
+                INSERT INTO products (product_code, product_name, category, unit, is_active)
+                VALUES (:code, :name, :cat, :unit, TRUE)
+            """), {"code": code, "name": name, "cat": cat, "unit": unit})
+            cache_bus.bump_generation(s, 'products')
+            s.commit()
+        note_write()
+        clear_product_caches()
+        return True, "품목 등록 완료"
+    except Exception as e: return False, str(e)
+
+@st.cache_resource
+def has_product_code_index():
+    """품목코드 유일 인덱스 존재 여부 (부트스트랩에서 기존 중복 코드 때문에 못 만들었을 수 있음)"""
+    with conn.session as s:
+        return s.execute(text("SELECT to_regclass('uq_products_product_code') IS NOT NULL")).scalar()
+
+def register_products_bulk(items):
+    """신규 품목 일괄 등록 (items: [{'code', 'name', 'cat', 'unit'}]) - INSERT 1번, 이미 있는 품목코드는 건너뜀
+    -> (성공 여부, 메시지)"""
+    items = [it for it in items if it.get('code') and it.get('name')]
+    if not items: return False, "등록할 품목이 없습니다."
+    conflict = "ON CONFLICT (product_code) DO NOTHING" if has_product_code_index() else ""
+    try:
+        with conn.session as s:
+            res = s.execute(text(f"""
+                INSERT INTO products (product_code, product_name, category, unit, is_active)
+                SELECT u.code, u.name, u.cat, u.unit, TRUE
+                FROM unnest(CAST(:codes AS TEXT[]), CAST(:names AS TEXT[]), CAST(:cats AS TEXT[]), CAST(:units AS TEXT[])) AS u(code, name, cat, unit)
+                WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.product_code = u.code)
+                {conflict}
+                RETURNING product_code
+            """), {"codes": [str(it['code']).strip() for it in items], "names": [str(it['name']).strip() for it in items],
+                   "cats": [it.get('cat') or None for it in items], "units": [it.get('unit') or None for it in items]})
+            added = len(res.fetchall())
+            if added: cache_bus.bump_generation(s, 'products')
+            s.commit()
+        if added: note_write(); clear_product_caches()
+        skipped = len(items) - added
+        return True, f"품목 {added}건 등록 완료" + (f" (이미 있는 품목코드 {skipped}건 제외)" if skipped else "")
+    except Exception as e: return False, str(e)
+
+# 값 종류가 적은 컬럼 -> category (세션 간 공유 캐시 메모리 절감)
+SCHEDULE_CATEGORICAL_COLS = ('status', 'supplier', 'origin', 'warehouse', 'bank', 'unit2', 'tt_check')
+
+def schedule_select_sql(table_name, source=None):
+    """장부 조회 SELECT (source: 실제 조회 테이블, 보관 테이블 조회 시 '{table_name}_archive')"""
+    # 수입인 경우 삼각무역 태그 존재 여부 확인 (태그 변경 시 트리거가 수입 건 updated_at 갱신)
+    extra_col = ""
+    if table_name == 'import_schedules':
+        extra_col = ", (SELECT COUNT(*) FROM triangular_trades WHERE import_id = s.id) as tri_cnt"
+
+    return f"""
+        SELECT s.*, p.product_name, p.product_code as db_prod_code, p.unit as p_unit{extra_col}
+        FROM {source or table_name} s
+        LEFT JOIN products p ON s.product_id = p.product_id
+    """
+
+@st.cache_resource
+def get_schedule_frame(table_name):
+    """프로세스 로컬 증분 동기화 캐시 (updated_at 워터마크 + 삭제 묘비)"""
+    base_sql = schedule_select_sql(table_name)
+    frame = delta_sync.DeltaFrame(table_name, base_sql, categorical=SCHEDULE_CATEGORICAL_COLS)
+    snapshot.seed_delta_frame(frame, table_name)  # 로컬 스냅샷이 있으면 변경분만 조회
+    return frame
+
+@st.cache_resource
+def get_snapshot_worker():
+    """프로세스당 1회: 스냅샷 백그라운드 갱신 (장부: 증분 동기화 후 변경 시에만 재기록, 품목: 'products' 알림 시 전체 재조회)"""
+    def load_products():
+        with conn.session as s:
+            return delta_sync.normalize_frame(pd.DataFrame(s.execute(text("SELECT * FROM products ORDER BY product_id")).fetchall()))
+
+    worker = snapshot.SnapshotWorker(interval=60)
+    for tbl in ['import_schedules', 'export_schedules']:
+        worker.add_frame(tbl, get_schedule_frame(tbl), lambda: conn.session)
+    worker.add_table('products', load_products)
+    get_invalidation_bus().register('products', lambda: worker.reload('products'))
+    return worker.start()
+
+def get_schedule_data(table_name='import_schedules', status_filter='ALL', include_archive=False):
+    """데이터 조회 (수입/수출 공용, 변경분만 조회해 병합) - 기본은 운영 테이블만, include_archive 시 보관 건 포함('archived' 컬럼)"""
+    with read_conn().session as s:
+        df = get_schedule_frame(table_name).refresh(s)
+    if include_archive:
+        arc = get_archived_schedules(table_name)
+        if not arc.empty:
+            df = pd.concat([df.assign(archived=False), arc.assign(archived=True)], ignore_index=True)
+            df = delta_sync.compact_frame(df.sort_values(['expected_date', 'id'], ascending=[True, False], na_position='last', kind='stable')
+                                          .reset_index(drop=True), SCHEDULE_CATEGORICAL_COLS)
+    if status_filter != 'ALL' and not df.empty:
+        df = df[df['status'] == status_filter].reset_index(drop=True)
+    return df
+
+@st.cache_data(ttl=86400)
+def get_archived_schedules(table_name):
+    """보관 테이블 조회 (읽기 전용, 보관 작업 / 다른 프로세스의 쓰기 알림 시 clear)"""
+    try:
+        with read_conn().session as s:
+            df = pd.DataFrame(s.execute(text(schedule_select_sql(table_name, f"{table_name}_archive"))).fetchall())
+        return delta_sync.compact_frame(delta_sync.normalize_frame(df), SCHEDULE_CATEGORICAL_COLS)
+    except Exception:
+        return pd.DataFrame()
+
+# 보관 대상: ETA 가 horizon 보다 오래된 취소 건 / 잔액이 남지 않은 도착 건
+# (FX 미결제 잔액 = fx_exposure.prepare_positions, 미통관 잔량 = clearance_balance_sql 과 같은 기준 - 잔액이 있으면 운영 테이블에 남김)
+ARCHIVE_PREDICATE = """
+    s.expected_date < CURRENT_DATE - CAST(:days AS INTEGER)
+    AND (s.status = 'CANCELED' OR (
+        s.status = 'ARRIVED'
+        AND CASE WHEN s.doc_amount > 0 THEN s.doc_amount ELSE COALESCE(s.open_amount, 0) END - COALESCE(s.payment_amount, 0) <= 0
+        AND COALESCE(NULLIF(s.actual_in_qty, 0), NULLIF(s.open_qty, 0), s.quantity, 0)
+            - COALESCE((SELECT SUM(c.qty) FROM schedule_clearances c WHERE c.table_name = :t AND c.schedule_id = s.id), 0) <= 0
+    ))
+"""
+
+def archive_closed_schedules(table_name, horizon_days):
+    """마감 후 ETA 가 horizon_days 보다 오래되고 잔액이 없는 건 -> 보관 테이블 이동 (1문장: DELETE … RETURNING + 보관 INSERT + ETA 요약 차감 + 묘비)
+    -> 이동 건수"""
+    with conn.session as s:
+        cols = [r[0] for r in s.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :t ORDER BY ordinal_position
+        """), {"t": table_name}).fetchall()]
+        col_str = ", ".join(f'"{c}"' for c in cols)
+        # 행 단위 ETA 요약 트리거 대신 이동분을 (ETA, 상태)별로 묶어 1번에 차감
+        s.execute(text("SET LOCAL ck.skip_eta_summary = 'on'"))
+        moved = s.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {table_name} s
+                WHERE {ARCHIVE_PREDICATE}
+                RETURNING s.*
+            ), arc AS (
+                INSERT INTO {table_name}_archive ({col_str}) SELECT {col_str} FROM moved
+            ), summary AS (
+                UPDATE schedule_eta_summary e
+                SET cnt = e.cnt - m.cnt, quantity = e.quantity - m.quantity, open_amount = e.open_amount - m.open_amount
+                FROM (
+                    SELECT expected_date, status, COUNT(*) AS cnt,
+                           COALESCE(SUM(quantity), 0) AS quantity, COALESCE(SUM(open_amount), 0) AS open_amount
+                    FROM moved GROUP BY expected_date, status
+                ) m
+                WHERE e.table_name = :t AND e.expected_date = m.expected_date AND e.status = m.status
+            )
+            INSERT INTO schedule_tombstones (table_name, row_id) SELECT :t, id FROM moved
+        """), {"days": horizon_days, "t": table_name}).rowcount
+        s.execute(text("DELETE FROM schedule_eta_summary WHERE table_name = :t AND cnt <= 0"), {"t": table_name})
+        s.execute(text("SET LOCAL ck.skip_eta_summary = 'off'"))
+        if moved: cache_bus.bump_generation(s, table_name)
+        s.commit()
+    if moved:
+        clear_schedule_caches(table_name)
+        get_archived_schedules.clear(table_name)
+    return moved
+
+def get_schedule_record(table_name, sid):
+    """선택 건 1행 dict (세션에는 id만 보관, 값은 공유 캐시에서 조회 / 없으면 {})"""
+    if sid is None: return {}
+    df = get_schedule_data(table_name, 'ALL')
+    rows = to_records(df[df['id'] == sid]) if not df.empty else []
+    return rows[0] if rows else {}
+
+@st.cache_data(ttl=86400)
+def get_eta_summary(table_name='import_schedules', date_from=None, date_to=None):
+    """ETA × 상태별 사전 집계 조회 (트리거로 유지되는 schedule_eta_summary)"""
+    try:
+        with conn.session as s:
+            sql = "SELECT expected_date, status, cnt, quantity, open_amount FROM schedule_eta_summary WHERE table_name = :t"
+            params = {"t": table_name}
+            if date_from:
+                sql += " AND expected_date >= :df"; params['df'] = date_from
+            if date_to:
+                sql += " AND expected_date <= :dt"; params['dt'] = date_to
+            df = pd.DataFrame(s.execute(text(sql + " ORDER BY expected_date"), params).fetchall())
+            if not df.empty:
+                df['cnt'] = df['cnt'].astype(int)
+                df['quantity'] = df['quantity'].astype(float)
+                df['open_amount'] = df['open_amount'].astype(float)
+            return df
+    except Exception: return pd.DataFrame()
+
+def eta_board_sql(table_name):
+    """현황판 표 조회: 표시 컬럼만 ETA 순, 입항일 묶음(표시 문자열/건수)은 쿼리에서 계산 (ETA 없는 건 제외)"""
+    return f"""
+        SELECT to_char(s.expected_date, 'YY/MM/DD') AS eta_str, COUNT(*) OVER (PARTITION BY s.expected_date) AS day_cnt,
+               s.supplier, p.product_name, s.ck_code, s.size, s.unit_price, s.quantity, s.status
+        FROM {table_name} s
+        LEFT JOIN products p ON s.product_id = p.product_id
+        WHERE s.expected_date IS NOT NULL
+        ORDER BY s.expected_date, s.id DESC
+    """
+
+@st.cache_data(ttl=86400)
+def get_eta_board(table_name='import_schedules'):
+    """현황판 표 데이터 (장부 전체 프레임 대신 eta_board_sql 결과만 캐시)"""
+    try:
+        with read_conn().session as s:
+            return delta_sync.normalize_frame(pd.DataFrame(s.execute(text(eta_board_sql(table_name))).fetchall()))
+    except Exception: return pd.DataFrame()
+
+# 수입 도착 -> 재고 중복 확인 / 도착 취소 시 롤백 삭제 (미통관 재고만)
+STOCK_LOT_CHECK_SQL = """
+    SELECT stock_id FROM stock_by_lot 
+    WHERE product_id = :pid AND lot_number = :lot AND quantity = :qty AND is_cleared = FALSE
+"""
+STOCK_LOT_DELETE_SQL = "DELETE FROM stock_by_lot WHERE product_id = :pid AND lot_number = :lot AND note LIKE :note AND is_cleared = FALSE"
+
+def sync_import_to_inventory(sid):
+    """수입 일정 -> 재고 동기화 (수입 전용)"""
+    try:
+        with conn.session as s:
+            sch = s.execute(text("SELECT * FROM import_schedules WHERE id = :sid"), {"sid": sid}).mappings().fetchone()
+            if not sch: return False, "일정 정보를 찾을 수 없습니다."
+            
+            def to_date(d):
+                if isinstance(d, str):
+                    try: return datetime.strptime(d, '%Y-%m-%d').date()
+                    except: return None
+                return d
+            
+            def to_float(v):
+                try: return float(v) if v else 0.0
+                except: return 0.0
+
+            if sch['status'] == 'ARRIVED':
+                missing_fields = []
+                qty = 0.0
+                if to_float(sch.get('actual_in_qty')) > 0: qty = to_float(sch.get('actual_in_qty'))
+                elif to_float(sch.get('open_qty')) > 0: qty = to_float(sch.get('open_qty'))
+                elif to_float(sch.get('quantity')) > 0: qty = to_float(sch.get('quantity'))
+                
+                if qty <= 0: missing_fields.append("수량(실입고, 오픈, 또는 기본수량)")
+                entry_date = to_date(sch.get('arrival_date')) or to_date(sch.get('expected_date'))
+                if not entry_date: missing_fields.append("입고일(실입고일 또는 ETA)")
+
+                if missing_fields: return False, f"필수 정보 누락: {', '.join(missing_fields)}"
+                
+                prod = s.execute(text("SELECT category, unit FROM products WHERE product_id = :pid"), {"pid": sch['product_id']}).fetchone()
+                cat = prod[0] if prod else '기타'
+                unit = prod[1] if prod else 'Box'
+                lot_no = entry_date.strftime("%Y-%m-%d")
+                wh = sch.get('warehouse') if sch.get('warehouse') else '미정'
+                ck_code_val = sch.get('ck_code') or '-'
+                note_text = f"수입도착({ck_code_val}) {sch.get('note', '')}"
+                price = to_float(sch.get('unit_price'))
+
+                check = s.execute(text(STOCK_LOT_CHECK_SQL), {"pid": sch['product_id'], "lot": lot_no, "qty": qty}).fetchone()
+                
+                if not check:
+                    s.execute(text("""
+                        INSERT INTO stock_by_lot 
+                        (product_id, lot_number, quantity, entry_date, warehouse_loc, manufacturer, unit_price, size, note, category, unit, is_cleared)
+                        VALUES (:pid, :lot, :qty, :ed, :wh, :man, :price, :size, :note, :cat, :unit, FALSE)
+                    """), {
+                        "pid": sch['product_id'], "lot": lot_no, "qty": qty, "ed": entry_date, "wh": wh,
+                        "man": sch.get('supplier', ''), "price": price, "size": sch.get('size', ''),
+                        "note": note_text, "cat": cat, "unit": unit
+                    })
+                    
+                    s.execute(text("""
+                        INSERT INTO transactions 
+                        (trans_type, product_id, lot_number, quantity, manager_id, remarks, status, trans_date) 
+                        VALUES ('IN', :pid, :lot, :qty, (SELECT user_id FROM users LIMIT 1), '수입도착(미통관)', 'VALID', NOW())
+                    """), {"pid": sch['product_id'], "lot": lot_no, "qty": qty})
+                    s.commit()
+                    return True, "재고(미통관) 등록 완료"
+                else: return True, "이미 등록된 재고입니다."
+
+            else:
+                e_date = to_date(sch.get('arrival_date')) or to_date(sch.get('expected_date'))
+                if not e_date: return True, "삭제할 대상 날짜 없음"
+                l_no = e_date.strftime("%Y-%m-%d")
+                ck_code_val = sch.get('ck_code') or '-'
+                note_pattern = f"수입도착({ck_code_val})%"
+                s.execute(text(STOCK_LOT_DELETE_SQL), {"pid": sch['product_id'], "lot": l_no, "note": note_pattern})
+                s.commit()
+                return True, "관련 재고 삭제 완료 (롤백)"
+    except Exception as e: return False, f"동기화 오류: {str(e)}"
+
+def sync_schedule_children(s, table_name, sid, clearance_list, declaration_list):
+    """통관/수입신고 목록 -> 자식 테이블 재작성 (호출 측 세션/트랜잭션 안에서 실행)"""
+    sync_schedule_children_bulk(s, table_name, {sid: (clearance_list, declaration_list)})
+
+def sync_schedule_children_bulk(s, table_name, children):
+    """여러 건의 자식 테이블 재작성 (children: {일정 id: (통관 목록, 수입신고 목록)}) - 삭제 1번 + 테이블별 일괄 INSERT"""
+    if not children: return
+    ids = list(children)
+    s.execute(text("DELETE FROM schedule_clearances WHERE table_name = :t AND schedule_id = ANY(:ids)"), {"t": table_name, "ids": ids})
+    s.execute(text("DELETE FROM schedule_declarations WHERE table_name = :t AND schedule_id = ANY(:ids)"), {"t": table_name, "ids": ids})
+
+    clr_rows = [
+        {"t": table_name, "sid": sid, "seq": i + 1, "d": safe_date_parse(c.get('date')),
+         "q": safe_float_parse(c.get('qty')), "r": safe_float_parse(c.get('rate'))}
+        for sid, (clearance_list, _) in children.items()
+        for i, c in enumerate(clearance_list) if isinstance(c, dict)
+    ]
+    if clr_rows:
+        s.execute(text("""
+            INSERT INTO schedule_clearances (table_name, schedule_id, seq, clearance_date, qty, rate)
+            VALUES (:t, :sid, :seq, :d, :q, :r)
+        """), clr_rows)
+
+    decl_rows = [
+        {"t": table_name, "sid": sid, "seq": i + 1, "d": safe_date_parse(d.get('date')), "no": d.get('no') or None}
+        for sid, (_, declaration_list) in children.items()
+        for i, d in enumerate(declaration_list) if isinstance(d, dict)
+    ]
+    if decl_rows:
+        s.execute(text("""
+            INSERT INTO schedule_declarations (table_name, schedule_id, seq, declaration_date, declaration_no)
+            VALUES (:t, :sid, :seq, :d, :no)
+        """), decl_rows)
+
+def clearance_balance_sql(table_name, only_outstanding=True):
+    base_qty = "COALESCE(NULLIF(s.actual_in_qty, 0), NULLIF(s.open_qty, 0), s.quantity, 0)"
+    sql = f"""
+        SELECT s.id, s.ck_code, p.product_name, s.expected_date, s.arrival_date, s.status,
+               {base_qty} AS base_qty,
+               COALESCE(c.cleared_qty, 0) AS cleared_qty,
+               {base_qty} - COALESCE(c.cleared_qty, 0) AS outstanding_qty,
+               c.clearance_cnt, c.last_clearance_date
+        FROM {table_name} s
+        LEFT JOIN products p ON s.product_id = p.product_id
+        LEFT JOIN (
+            SELECT schedule_id, SUM(qty) AS cleared_qty, COUNT(*) AS clearance_cnt, MAX(clearance_date) AS last_clearance_date
+            FROM schedule_clearances WHERE table_name = :t
+            GROUP BY schedule_id
+        ) c ON c.schedule_id = s.id
+        WHERE COALESCE(s.status, 'PENDING') != 'CANCELED'
+    """
+    if only_outstanding:
+        sql += f" AND {base_qty} - COALESCE(c.cleared_qty, 0) > 0"
+    return sql + " ORDER BY s.expected_date ASC, s.id DESC"
+
+def get_clearance_balance(table_name='import_schedules', only_outstanding=True):
+    """건(lot)별 통관 수량 / 미통관 잔량 (SQL 집계)"""
+    try:
+        with conn.session as s:
+            return pd.DataFrame(s.execute(text(clearance_balance_sql(table_name, only_outstanding)), {"t": table_name}).fetchall())
+    except Exception: return pd.DataFrame()
+
+def clearances_between_sql(table_name):
+    return f"""
+        SELECT c.clearance_date, s.ck_code, p.product_name, s.supplier, c.seq, c.qty, c.rate, c.schedule_id
+        FROM schedule_clearances c
+        JOIN {table_name} s ON s.id = c.schedule_id
+        LEFT JOIN products p ON s.product_id = p.product_id
+        WHERE c.table_name = :t AND c.clearance_date BETWEEN :df AND :dt
+        ORDER BY c.clearance_date, s.ck_code
+    """
+
+def get_clearances_between(date_from, date_to, table_name='import_schedules'):
+    """기간 내 통관 내역 (clearance_date 인덱스 사용)"""
+    try:
+        with conn.session as s:
+            df = pd.DataFrame(s.execute(text(clearances_between_sql(table_name)),
+                                        {"t": table_name, "df": date_from, "dt": date_to}).fetchall())
+            return df
+    except Exception: return pd.DataFrame()
+
+@st.cache_data(ttl=86400)
+def get_open_positions():
+    """FX/만기 분석용 미결제 L/C 포지션 (통관 가중평균 환율 포함, 일괄 조회 후 캐시)"""
+    with conn.session as s:
+        pos_df = pd.DataFrame(s.execute(text("""
+            SELECT s.id, s.ck_code, p.product_name, s.supplier, s.bank, s.status, s.lc_no,
+                   s.open_amount, s.doc_amount, s.payment_amount, s.maturity_date, s.ext_maturity_date,
+                   s.exchange_rate, s.arrival_exchange_rate, s.avg_exchange_rate
+            FROM import_schedules s
+            LEFT JOIN products p ON s.product_id = p.product_id
+            WHERE COALESCE(s.status, 'PENDING') != 'CANCELED'
+        """)).fetchall())
+        clr_df = pd.DataFrame(s.execute(text("""
+            SELECT schedule_id, qty, rate FROM schedule_clearances
+            WHERE table_name = 'import_schedules' AND qty > 0 AND rate > 0
+        """)).fetchall())
+    import fx_exposure
+    return fx_exposure.prepare_positions(pos_df, clr_df)
+
+# 상세 저장 컬럼 (수입/수출 공용)
+SCHEDULE_COLS = [
+    'product_id', 'expected_date', 'quantity', 'note', 'status', 'size', 'supplier', 'unit_price', 'ck_code',
+    'global_code', 'doojin_code', 'agency', 'agency_contract', 'origin', 'packing', 
+    'open_qty', 'doc_qty', 'box_qty', 'unit2', 'open_amount', 'doc_amount',
+    'tt_check', 'bank', 'usance', 'at_sight', 'open_date', 'lc_no', 'invoice_no', 'bl_no', 'lg_no', 'insurance',
+    'customs_broker_date', 'etd', 'arrival_date', 'warehouse', 'actual_in_qty', 'destination',
+    'doc_acceptance', 'acceptance_rate', 'maturity_date', 'ext_maturity_date', 'acceptance_fee', 'discount_fee',
+    'payment_date', 'payment_amount', 'exchange_rate', 'balance', 'avg_exchange_rate', 'arrival_exchange_rate',
+    'clearance_info', 'declaration_info'
+]
+SCHEDULE_NUMERIC_COLS = ['quantity', 'unit_price', 'open_qty', 'doc_qty', 'box_qty', 'open_amount', 'doc_amount', 
+                         'actual_in_qty', 'acceptance_rate', 'acceptance_fee', 'discount_fee', 'payment_amount', 
+                         'exchange_rate', 'balance', 'avg_exchange_rate', 'arrival_exchange_rate']
+SCHEDULE_JSON_COLS = ['clearance_info', 'declaration_info']
+
+def schedule_params(data):
+    """입력 dict -> 저장 파라미터 (숫자 빈 값 0, 문자열 빈 값 None, JSONB 는 JSON 문자열, 상태 기본 PENDING)"""
+    params = {}
+    for k in SCHEDULE_COLS:
+        val = data.get(k)
+        if k in SCHEDULE_NUMERIC_COLS:
+            if val is None or str(val).strip() == '': params[k] = 0
+            else:
+                try: params[k] = float(str(val).replace(',', '').strip())
+                except: params[k] = 0
+        elif k in SCHEDULE_JSON_COLS:
+            if isinstance(val, (list, dict)): params[k] = json.dumps(val, ensure_ascii=False)
+            elif isinstance(val, str) and (val.startswith('[') or val.startswith('{')): params[k] = val 
+            else: params[k] = '[]'
+        else:
+            if val is None or str(val).strip() == '' or str(val).lower() == 'nan': params[k] = None
+            else: params[k] = val
+    
+    if not params.get('status'): params['status'] = 'PENDING'
+    return params
+
+def _schedule_value_sql(c):
+    return f"CAST(:{c} AS JSONB)" if c in SCHEDULE_JSON_COLS else f":{c}"
+
+def _revert_failed_arrivals(table_name, target_ids):
+    """ARRIVED 저장 건 재고 동기화 -> 실패 건은 PENDING 으로 되돌림 (1번에 갱신) -> {id: 실패 사유}"""
+    failed = {}
+    if table_name != 'import_schedules': return failed
+    for tid in target_ids:
+        ok, msg = sync_import_to_inventory(tid)
+        if not ok: failed[tid] = msg
+    if failed:
+        with conn.session as s:
+            s.execute(text(f"UPDATE {table_name} SET status = 'PENDING' WHERE id = ANY(:ids)"), {"ids": list(failed)})
+            cache_bus.bump_generation(s, table_name)
+            s.commit()
+        clear_schedule_caches(table_name)
+    return failed
+
+def save_schedule(data, sid=None, table_name='import_schedules'):
+    """상세 정보 저장 (수입/수출 공용)"""
+    try:
+        params = schedule_params(data)
+        with conn.session as s:
+            if sid:
+                set_clause = ", ".join(f"{c} = {_schedule_value_sql(c)}" for c in SCHEDULE_COLS)
+                s.execute(text(f"UPDATE {table_name} SET {set_clause} WHERE id = :id"), {**params, "id": sid})
+                target_id = sid
+            else:
+                col_str = ", ".join(SCHEDULE_COLS)
+                val_str = ", ".join(_schedule_value_sql(c) for c in SCHEDULE_COLS)
+                res = s.execute(text(f"INSERT INTO {table_name} ({col_str}) VALUES ({val_str}) RETURNING id"), params)
+                target_id = res.fetchone()[0]
+            sync_schedule_children(s, table_name, target_id, load_json_list(params['clearance_info']), load_json_list(params['declaration_info']))
+            cache_bus.bump_generation(s, table_name)
+            s.commit()
+        clear_schedule_caches(table_name)
+
+        if params['status'] == 'ARRIVED' and target_id:
+            failed = _revert_failed_arrivals(table_name, [target_id])
+            if failed: return False, f"저장되었으나 재고생성 실패: {failed[target_id]}"
+        
+        return True, "저장 완료"
+    except Exception as e: return False, str(e)
+
+def delete_schedule(sid, table_name='import_schedules'):
+    try:
+        with conn.session as s:
+            s.execute(text(f"DELETE FROM {table_name} WHERE id = :sid"), {"sid": sid})
+            delta_sync.write_tombstone(s, table_name, sid)
+            sync_schedule_children(s, table_name, sid, [], [])
+            cache_bus.bump_generation(s, table_name)
+            s.commit()
+        clear_schedule_caches(table_name)
+        return True, "삭제 완료"
+    except Exception as e: return False, str(e)
+
+def clear_schedule_caches(table_name):
+    """일정 쓰기 후 이 프로세스의 파생 캐시 clear (다른 프로세스는 InvalidationBus 가 처리)"""
+    note_write()
+    get_eta_summary.clear()
+    if table_name == 'import_schedules': get_open_positions.clear(); get_eta_board.clear()
+
+def clear_product_caches():
+    """품목 쓰기 후 / 다른 프로세스의 품목 알림 시: 품목 목록 + 품목 JOIN 컬럼(품목명/코드/단위)을 가진 캐시 clear
+    장부 프레임은 다음 조회 때 전체 재로드 (스냅샷도 재기록), 재로드 전 다른 경로로 시드된 프레임은 트리거가 갱신한 updated_at 으로 반영"""
+    get_products_df.clear()
+    get_eta_board.clear()
+    get_open_positions.clear()
+    get_archived_schedules.clear()
+    for tbl in ['import_schedules', 'export_schedules']:
+        get_schedule_frame(tbl).invalidate()
+
+def save_editor_changes(edited_rows, original_df, table_name='export_schedules'):
+    """st.data_editor 변경사항 DB 저장"""
+    try:
+        success_cnt = 0
+        for idx, changes in edited_rows.items():
+            row_data = to_records(original_df.iloc[[idx]])[0]
+            row_data.update(changes)
+            ok, msg = save_schedule(row_data, row_data['id'], table_name)
+            if ok: success_cnt += 1
+        return True, f"{success_cnt}건 수정 완료"
+    except Exception as e: return False, str(e)
+
+@st.cache_resource
+def get_invalidation_bus():
+    """프로세스당 1회: 캐시 무효화 리스너 시작 (다른 레플리카의 쓰기 -> 이 프로세스 캐시 clear)"""
+    dsn = conn.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+    bus = cache_bus.InvalidationBus(dsn)
+    bus.register('products', clear_product_caches)
+    bus.register('import_schedules', get_open_positions.clear)
+    bus.register('import_schedules', get_eta_summary.clear)
+    bus.register('export_schedules', get_eta_summary.clear)
+    bus.register('import_schedules', get_eta_board.clear)
+    bus.register('triangular_trades', get_triangular_trades.clear)
+    bus.register('import_schedules', get_archived_schedules.clear)
+    bus.register('export_schedules', get_archived_schedules.clear)
+    # 다른 프로세스의 쓰기 -> 캐시를 다시 채우는 조회는 잠시 프라이머리에서
+    for tbl in ['products', 'import_schedules', 'export_schedules', 'triangular_trades']:
+        bus.register(tbl, get_read_router().note_write)
+    return bus.start()
+
+# 마감 후 보관 테이블로 옮길 기준 (ETA 경과 일수), 0 이면 보관 안 함
+ARCHIVE_HORIZON_DAYS = int(os.environ.get('CK_ARCHIVE_HORIZON_DAYS', '365'))
+
+@st.cache_resource(ttl=86400)
+def start_archiver():
+    """프로세스당 하루 1회: 마감 건 보관 이동 (백그라운드 스레드, 여러 프로세스가 동시에 실행해도 DELETE 가 행 잠금으로 직렬화)"""
+    def run():
+        for tbl in ['import_schedules', 'export_schedules']:
+            try: archive_closed_schedules(tbl, ARCHIVE_HORIZON_DAYS)
+            except Exception: pass
+    if ARCHIVE_HORIZON_DAYS <= 0: return None
+    t = threading.Thread(target=run, name="ck-archive", daemon=True)
+    t.start()
+    return t
+
+def start_background_services():
+    """프로세스당 1회: 캐시 무효화 리스너 + 스냅샷 갱신 스레드 + 마감 건 보관 (이후 호출은 캐시 조회만)"""
+    return get_invalidation_bus(), get_snapshot_worker(), start_archiver()
+
+# --- 삼각무역 전용 함수 ---
+TRIANGULAR_BY_IMPORT_SQL = "SELECT * FROM triangular_trades WHERE import_id = :id ORDER BY id"
+
+@st.cache_data(ttl=86400)
+def get_triangular_trades(import_id):
+    """특정 수입 건에 연결된 삼각무역 태그 조회"""
+    try:
+        with read_conn().session as s:
+            df = pd.DataFrame(s.execute(text(TRIANGULAR_BY_IMPORT_SQL), {"id": import_id}).fetchall())
+            return df
+    except Exception: return pd.DataFrame()
+
+def save_triangular_trade(data, target_id=None):
+    """
+    삼각무역 태그 저장 (INSERT or UPDATE)
+    target_id가 있으면 UPDATE, 없으면 INSERT (단일 태그 관리)
+    """
+    try:
+        with conn.session as s:
+            cols = ['import_id', 'ck_code', 'importer', 'origin', 'product_name', 'size', 'packing', 
+                    'open_qty', 'unit', 'open_amount', 'invoice_no', 'eta', 'payment_date', 'payment_amount', 'exchange_rate']
+            
+            params = {}
+            for k in cols:
+                val = data.get(k)
+                if k in ['open_qty', 'open_amount', 'payment_amount', 'exchange_rate']:
+                    try: params[k] = float(str(val).replace(',', '').strip()) if val else 0.0
+                    except: params[k] = 0.0
+                elif k in ['eta', 'payment_date']:
+                    params[k] = val if val else None
+                else:
+                    params[k] = val if val else None
+
+            if target_id:
+                # Update
+                set_clause = ", ".join([f"{c} = :{c}" for c in cols])
+                sql = f"UPDATE triangular_trades SET {set_clause} WHERE id = :id"
+                params['id'] = target_id
+                s.execute(text(sql), params)
+                msg = "수정 완료"
+            else:
+                # Insert
+                col_str = ", ".join(cols)
+                val_str = ", ".join([f":{c}" for c in cols])
+                s.execute(text(f"INSERT INTO triangular_trades ({col_str}) VALUES ({val_str})"), params)
+                msg = "등록 완료"
+                
+            cache_bus.bump_generation(s, 'triangular_trades')
+            s.commit()
+        note_write()
+        get_triangular_trades.clear()
+        return True, msg
+    except Exception as e: return False, str(e)
+
+def delete_triangular_trade(tid):
+    try:
+        with conn.session as s:
+            s.execute(text("DELETE FROM triangular_trades WHERE id = :id"), {"id": tid})
+            delta_sync.write_tombstone(s, 'triangular_trades', tid)
+            cache_bus.bump_generation(s, 'triangular_trades')
+            s.commit()
+        note_write()
+        get_triangular_trades.clear()
+        return True, "삭제 완료"
+    except Exception as e: return False, str(e)
+
+# ==========================================
+# 2. 다음 탭 데이터 선조회 (views.prefetch_next 에서 호출)
+# ==========================================
+
+# 0 이면 선조회 끔
+PREFETCH_WORKERS = int(os.environ.get('CK_PREFETCH_WORKERS', '2'))
+
+@st.cache_resource
+def get_prefetcher():
+    """프로세스당 1개: 워커 수는 커넥션 풀의 절반 이하, 풀이 거의 다 사용 중이면 선조회 건너뜀 (화면 조회 우선)"""
+    pool = conn.engine.pool
+    size = pool.size() if hasattr(pool, 'size') else PREFETCH_WORKERS
+    busy = (lambda: pool.checkedout() >= max(1, size - 1)) if hasattr(pool, 'checkedout') else None
+    return prefetch.Prefetcher(max_workers=max(1, min(PREFETCH_WORKERS, size // 2)), is_busy=busy)
+
+def _warm_schedule_frame(table_name):
+    """증분 동기화 캐시는 최초 로드(콜드 스타트 / invalidate 후)만 선조회
+    (이미 채워져 있으면 화면 조회가 어차피 변경분을 반영하므로 선조회 refresh 는 워터마크/묘비 조회만 2배로 늘림)"""
+    frame = get_schedule_frame(table_name)
+    if frame.df is None:
+        with read_conn().session as s: frame.refresh(s)
+    return frame.df
+
+def _warm_triangular_trades():
+    # 삼각무역 탭의 기본 선택(목록 첫 건) 태그
+    df = _warm_schedule_frame('import_schedules')
+    if df is not None and not df.empty: get_triangular_trades(int(df['id'].iloc[0]))
+
+PREFETCH_WARMERS = {
+    'import_schedules': lambda: _warm_schedule_frame('import_schedules'),
+    'export_schedules': lambda: _warm_schedule_frame('export_schedules'),
+    'eta_summary': lambda: get_eta_summary('import_schedules'),
+    'eta_board': lambda: get_eta_board('import_schedules'),
+    'products': get_products_df,
+    'triangular_trades': _warm_triangular_trades,
+    'open_positions': get_open_positions,
+}
+
+def prefetch_data(keys):
+    """현재 세션의 선조회 목록 교체 (keys: PREFETCH_WARMERS 키, 이전 요청 중 대기 작업은 취소)"""
+    # 워커 스레드에는 세션 컨텍스트를 붙이지 않음 (캐시 미스 스피너가 현재 화면에 그려지지 않도록, SnapshotWorker 와 동일)
+    ctx = get_script_run_ctx()
+    if ctx is None or PREFETCH_WORKERS <= 0: return
+    get_prefetcher().schedule(ctx.session_id, {k: PREFETCH_WARMERS[k] for k in keys if k in PREFETCH_WARMERS})
+
+# ==========================================
+# 3. 엑셀 일괄 파싱 (여러 파일 / 전체 시트)
+# ==========================================
+
+# 0 이면 CPU 코어 수
+PARSE_WORKERS = int(os.environ.get('CK_PARSE_WORKERS', '0')) or os.cpu_count() or 1
+
+@st.cache_resource
+def get_parse_pool():
+    """프로세스당 1개: 워커 프로세스는 첫 일괄 업로드 때 띄우고 이후 재사용 (pandas import 비용 1회)"""
+    return excel_import.make_parse_pool(PARSE_WORKERS)
+
+# 업로드 파싱 결과 디스크 캐시 한도(MB), 0 이면 사용 안 함
+PARSE_CACHE_MB = int(os.environ.get('CK_PARSE_CACHE_MB', '256'))
+
+@st.cache_resource
+def get_parse_cache():
+    """프로세스당 1개 (디스크 디렉터리는 같은 서버의 프로세스끼리 공유)"""
+    if PARSE_CACHE_MB <= 0: return None
+    return parse_cache.ParseCache(max_bytes=PARSE_CACHE_MB * 1024 * 1024, version=parse_cache.module_digest(excel_import, common))
+
+def parse_uploads(files):
+    """업로드 파일 [(파일명, bytes)] -> 파일/시트별 파싱 결과 (등록 품목 목록은 1번 조회해 워커에 전달)
+    같은 파일 + 같은 품목 목록 + 같은 날이면 디스크 캐시 결과 사용 (읽기/처리 오류 결과는 저장하지 않음)"""
+    p_df = get_products_df()
+    cache = get_parse_cache()
+    keys, results = [None] * len(files), [None] * len(files)
+    if cache is not None:
+        catalogue = parse_cache.frame_digest(p_df)
+        today = get_kst_today()
+        keys = [cache.key(name, data, catalogue, today) for name, data in files]
+        results = [cache.get(k) for k in keys]
+
+    todo = [i for i, res in enumerate(results) if res is None]
+    if todo:
+        todo_files = [files[i] for i in todo]
+        try:
+            parsed = excel_import.parse_upload_files(todo_files, p_df, get_parse_pool() if len(todo) > 1 else None)
+        except BrokenProcessPool:
+            # 워커 비정상 종료 -> 깨진 풀 폐기(다음 업로드 때 새로 생성) 후 이번 업로드는 현재 프로세스에서 파싱
+            get_parse_pool().shutdown(wait=False, cancel_futures=True)
+            get_parse_pool.clear()
+            parsed = excel_import.parse_upload_files(todo_files, p_df)
+        for i, res in zip(todo, parsed):
+            results[i] = res
+            if cache is not None and all(r['sheet'] is not None for r in res): cache.put(keys[i], res)
+    return [dict(r, file=name) for (name, _), res in zip(files, results) for r in res]
+
+def preview_lookup_sql(table_name):
+    """미리보기 기존 건 일괄 조회 (운영 + 보관 테이블, 각 CK관리번호 인덱스) - 'archived' 컬럼으로 구분
+    보관 행은 운영 테이블 행 타입으로 이름 기준 변환 (보관 테이블의 컬럼 순서 / archived_at 차이 흡수)"""
+    return f"""
+        SELECT s.*, FALSE AS archived FROM {table_name} s WHERE s.ck_code = ANY(:keys)
+        UNION ALL
+        SELECT (jsonb_populate_record(NULL::{table_name}, to_jsonb(a))).*, TRUE AS archived
+        FROM {table_name}_archive a WHERE a.ck_code = ANY(:keys)
+    """
+
+def preview_import(rows, table_name='import_schedules'):
+    """업로드 등록 전 미리보기: 파싱 결과의 CK관리번호를 1번에 조회해 기존 건과 비교
+    -> 행별 {'status', 'db_id', 'changes', 'source', 'data'} ('변경' 건의 data 는 기존 값 + 파일에 값이 있는 칸)
+    보관 테이블에 있는 건은 '보관' (읽기 전용, 등록 실행 시 건너뜀 - 보관 포함 장부를 다시 올려도 중복 등록 안 됨)"""
+    keys = sorted({str(r['ck_code']).strip() for r in rows if r.get('ck_code') and str(r['ck_code']).strip().lower() != 'nan'})
+    cur_df = pd.DataFrame()
+    if keys:
+        with conn.session as s:
+            cur_df = pd.DataFrame(s.execute(text(preview_lookup_sql(table_name)), {"keys": keys}).fetchall())
+    res, provided = excel_import.diff_import(rows, cur_df)
+
+    cur_by_id = {r['id']: r for r in to_records(cur_df.drop(columns='archived'))} if not cur_df.empty else {}
+    archived_ids = set(cur_df.loc[cur_df['archived'].astype(bool), 'id'].tolist()) if not cur_df.empty else set()
+    items = []
+    for i, (row, r) in enumerate(zip(rows, res.to_dict('records'))):
+        data = row
+        if r['status'] in ('변경', '동일') and int(r['db_id']) in archived_ids:
+            r['status'] = '보관'
+        elif r['status'] == '변경':
+            # 파일에 없는 칸/상태는 기존 값 유지 (quantity 는 open_qty 와 함께 반영)
+            fields = [c for c, has in zip(excel_import.DIFF_COLS, provided.iloc[i].tolist()) if has]
+            if 'open_qty' in fields: fields.append('quantity')
+            data = {**cur_by_id[int(r['db_id'])], **{c: row.get(c) for c in fields}}
+        items.append({'status': r['status'], 'db_id': int(r['db_id']) if pd.notna(r['db_id']) else None, 'changes': r['changes'],
+                      'source': row.get('_source', '-'), 'data': data})
+    return items
+
+def commit_import(items, table_name='import_schedules', on_progress=None):
+    """미리보기 결과 반영: 신규 -> INSERT, 변경 -> UPDATE (동일/중복/보관은 건너뜀) -> (신규 건수, 변경 건수, 실패 사유)
+    전체를 1개 트랜잭션으로 일괄 기록 (신규 id 는 시퀀스에서 미리 받아 executemany) -> 세대 증가/NOTIFY/캐시 clear 1번
+    DB 오류 시 전체 롤백. ARRIVED 건 재고 동기화는 커밋 후 건별 (실패 건은 PENDING 으로 되돌리고 실패 사유에 포함)"""
+    todo = [it for it in items if it['status'] in ('신규', '변경')]
+    if not todo: return 0, 0, []
+    new_items = [it for it in todo if it['status'] == '신규']
+    upd_items = [it for it in todo if it['status'] == '변경']
+    new_params = [schedule_params(it['data']) for it in new_items]
+    upd_params = [{**schedule_params(it['data']), "id": it['db_id']} for it in upd_items]
+    try:
+        with conn.session as s:
+            if new_params:
+                ids = [r[0] for r in s.execute(text("SELECT nextval(pg_get_serial_sequence(:t, 'id')) FROM generate_series(1, :n)"),
+                                                {"t": table_name, "n": len(new_params)})]
+                for p, new_id in zip(new_params, ids): p['id'] = new_id
+                col_str = ", ".join(['id'] + SCHEDULE_COLS)
+                val_str = ", ".join([':id'] + [_schedule_value_sql(c) for c in SCHEDULE_COLS])
+                s.execute(text(f"INSERT INTO {table_name} ({col_str}) VALUES ({val_str})"), new_params)
+            if on_progress: on_progress(0.4)
+            if upd_params:
+                set_clause = ", ".join(f"{c} = {_schedule_value_sql(c)}" for c in SCHEDULE_COLS)
+                s.execute(text(f"UPDATE {table_name} SET {set_clause} WHERE id = :id"), upd_params)
+            if on_progress: on_progress(0.7)
+            sync_schedule_children_bulk(s, table_name, {
+                p['id']: (load_json_list(p['clearance_info']), load_json_list(p['declaration_info'])) for p in new_params + upd_params})
+            cache_bus.bump_generation(s, table_name)
+            s.commit()
+    except Exception as e:
+        return 0, 0, [f"일괄 반영 실패 (전체 롤백): {getattr(e, 'orig', None) or e}"]
+    clear_schedule_caches(table_name)
+    if on_progress: on_progress(0.8)
+
+    arrived = [p['id'] for p in new_params + upd_params if p['status'] == 'ARRIVED']
+    failed = _revert_failed_arrivals(table_name, arrived)
+    if on_progress: on_progress(1.0)
+    fails = [f"[{it['source']}] {it['data'].get('ck_code') or '-'}: 저장되었으나 재고생성 실패: {failed[p['id']]}"
+             for it, p in zip(new_items + upd_items, new_params + upd_params) if p['id'] in failed]
+    added = sum(1 for p in new_params if p['id'] not in failed)
+    updated = sum(1 for p in upd_params if p['id'] not in failed)
+    return added, updated, fails
@@ -0,0 +1,166 @@
+"""
+updated_at 워터마크 기반 증분 동기화 (프로세스 로컬 DataFrame 캐시)
+- 최초 1회 전체 로드 후에는 워터마크 이후 변경 행 + 삭제 묘비(schedule_tombstones)만 조회해 병합
+- updated_at 은 트랜잭션 시작 시각이므로 커밋 순서와 어긋날 수 있음 -> overlap 구간을 매번 재조회해 보정
+- 묘비 보존 기간(TOMBSTONE_RETENTION)보다 오래 동기화하지 않았으면 전체 재로드
+- 프로세스당 1개를 모든 세션이 읽기 전용으로 공유 -> compact_frame 으로 dtype 압축 (저카디널리티 category, Arrow 문자열, float64/Int64, 정수 키 Int64)
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+TOMBSTONE_RETENTION = timedelta(days=7)
+
+TOMBSTONES_SINCE_SQL = """
+    SELECT row_id, deleted_at FROM schedule_tombstones
+    WHERE table_name = :t AND deleted_at > :wm
+"""
+
+# Arrow 기반 문자열 (결측은 NaN - category 컬럼과 같은 결측 표현), 미지원 pandas 버전이면 object 유지
+try:
+    STRING_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)
+except TypeError:
+    STRING_DTYPE = object
+
+
+def write_tombstone(s, table_name, row_id):
+    """삭제 묘비 기록 + 보존 기간 지난 묘비 정리 (호출 측 트랜잭션 안에서 실행)"""
+    s.execute(text("INSERT INTO schedule_tombstones (table_name, row_id) VALUES (:t, :rid)"), {"t": table_name, "rid": row_id})
+    s.execute(text("DELETE FROM schedule_tombstones WHERE deleted_at < NOW() - CAST(:keep AS INTERVAL)"),
+              {"keep": f"{TOMBSTONE_RETENTION.days} days"})
+
+
+def normalize_frame(df):
+    """NUMERIC(Decimal) 값 -> float (None 유지), 조회 경로/스냅샷 로드 경로의 값 형태 통일"""
+    for c in df.columns:
+        if df[c].dtype != object: continue
+        sample = df[c].dropna()
+        if not sample.empty and isinstance(sample.iloc[0], Decimal):
+            df[c] = pd.Series([float(v) if isinstance(v, Decimal) else v for v in df[c]], index=df.index, dtype=object)
+    return df
+
+
+def is_key_column(name):
+    """정수 키 컬럼 (id, *_id) - NULL 이 섞여 float64/object 로 조회돼도 Int64 로 통일"""
+    return name == 'id' or str(name).endswith('_id')
+
+
+def compact_frame(df, categorical=()):
+    """공유 캐시용 dtype 압축: categorical 컬럼 -> category, 문자열 -> Arrow 문자열, 숫자 -> float64 / Int64
+    정수 키(id, product_id 등)는 결측이 있어도 Int64 (날짜, JSONB 리스트 컬럼은 object 유지)"""
+    out = {}
+    for c in df.columns:
+        col = df[c]
+        if c in categorical:
+            if not isinstance(col.dtype, pd.CategoricalDtype): out[c] = col.astype('category')
+            continue
+        if is_key_column(c) and not pd.api.types.is_integer_dtype(col.dtype):
+            num = pd.to_numeric(col, errors='coerce')
+            # 숫자가 아닌 값이나 소수가 있으면 키가 아니므로 그대로 둠 (값 손실 방지)
+            if num.notna().sum() == col.notna().sum() and (num.dropna() % 1 == 0).all():
+                out[c] = num.astype('Int64')
+                continue
+        if col.dtype != object and not pd.api.types.is_string_dtype(col.dtype): continue
+        kind = pd.api.types.infer_dtype(col, skipna=True)
+        if kind == 'string' and col.dtype != STRING_DTYPE: out[c] = col.astype(STRING_DTYPE)
+        elif kind in ('floating', 'mixed-integer-float', 'decimal'): out[c] = pd.to_numeric(col, errors='coerce').astype(float)
+        elif kind == 'integer': out[c] = col.astype('Int64')
+    return df.assign(**out) if out else df
+
+
+class DeltaFrame:
+    """테이블 1개의 조회 결과를 프로세스 안에서 유지하고 변경분만 병합"""
+
+    def __init__(self, table_name, select_sql, alias='s', key='id',
+                 sort_by=('expected_date', 'id'), ascending=(True, False), overlap=timedelta(seconds=30), categorical=()):
+        self.table_name = table_name
+        self.select_sql = select_sql
+        self.alias = alias
+        self.key = key
+        self.sort_by = list(sort_by)
+        self.ascending = list(ascending)
+        self.overlap = overlap
+        self.categorical = tuple(categorical)
+        self.df = None
+        self.row_watermark = None
+        self.tomb_watermark = None
+        self.synced_at = None
+        self.version = 0
+        self._versions = pd.Series(dtype=object)
+        self._lock = threading.Lock()
+
+    def refresh(self, s):
+        """최신 상태로 동기화 후 DataFrame 반환 (공유 데이터의 얕은 복사본)"""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            if self.df is None or self.synced_at is None or now - self.synced_at > TOMBSTONE_RETENTION - timedelta(hours=1):
+                self._full_load(s)
+            else:
+                self._apply_delta(s)
+            self.synced_at = now
+            return self.df.copy(deep=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.df = None
+
+    def seed(self, df, row_watermark, tomb_watermark, synced_at):
+        """로컬 스냅샷으로 초기화 (이후 refresh는 스냅샷 워터마크 이후 변경분만 조회)"""
+        with self._lock:
+            if self.df is not None: return
+            self.row_watermark = row_watermark
+            self._set_frame(df)
+            self.tomb_watermark = tomb_watermark
+            self.synced_at = synced_at
+
+    def state(self):
+        """(DataFrame, 행 워터마크, 묘비 워터마크, 동기화 시각, 버전) - 스냅샷 기록용"""
+        with self._lock:
+            return self.df, self.row_watermark, self.tomb_watermark, self.synced_at, self.version
+
+    def _sorted(self, df):
+        if df.empty or not all(c in df.columns for c in self.sort_by): return df.reset_index(drop=True)
+        return df.sort_values(self.sort_by, ascending=self.ascending, na_position='last', kind='stable').reset_index(drop=True)
+
+    def _set_frame(self, df):
+        self.df = compact_frame(self._sorted(df), self.categorical)
+        self.version += 1
+        if not self.df.empty and 'updated_at' in self.df.columns:
+            self._versions = pd.Series(self.df['updated_at'].to_numpy(), index=self.df[self.key].to_numpy())
+            latest = pd.Timestamp(self.df['updated_at'].max()).to_pydatetime()
+            self.row_watermark = max(self.row_watermark, latest) if self.row_watermark is not None else latest
+        else:
+            self._versions = pd.Series(dtype=object)
+
+    def _full_load(self, s):
+        db_now = s.execute(text("SELECT NOW()")).scalar()
+        self.row_watermark = None
+        self._set_frame(normalize_frame(pd.DataFrame(s.execute(text(self.select_sql)).fetchall())))
+        if self.row_watermark is None: self.row_watermark = db_now
+        self.tomb_watermark = db_now
+
+    def _apply_delta(self, s):
+        changed = normalize_frame(pd.DataFrame(s.execute(
+            text(f"{self.select_sql} WHERE {self.alias}.updated_at > :wm"),
+            {"wm": self.row_watermark - self.overlap}).fetchall()))
+        tombs = s.execute(text(TOMBSTONES_SINCE_SQL), {"t": self.table_name, "wm": self.tomb_watermark - self.overlap}).fetchall()
+
+        if tombs: self.tomb_watermark = max(self.tomb_watermark, max(t[1] for t in tombs))
+        dead = [t[0] for t in tombs if t[0] in self._versions.index]
+
+        if not changed.empty:
+            # overlap 구간 재조회분 중 실제로 바뀐 행만 남김
+            prev = self._versions.reindex(changed[self.key].to_numpy())
+            is_new = prev.isna().to_numpy() | (pd.Series(changed['updated_at'].to_numpy()) != pd.Series(prev.to_numpy())).to_numpy()
+            changed = changed[is_new]
+
+        if changed.empty and not dead: return
+
+        drop_ids = set(dead) | set(changed[self.key].tolist() if not changed.empty else [])
+        base = self.df[~self.df[self.key].isin(drop_ids)] if not self.df.empty else self.df
+        merged = changed if base.empty else (base if changed.empty else pd.concat([base, changed], ignore_index=True))
+        self._set_frame(merged)
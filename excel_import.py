@@ -0,0 +1,385 @@
+"""
+'수입' 탭(상세 장부) 엑셀/CSV 파싱 (Streamlit/DB 비의존 - 품목 목록은 인자로 전달)
+- 반복 컬럼 그룹(통관일자/수량/환율, 신고일/신고번호)은 파일당 1번 위치를 찾고 전체 행을 컬럼 단위로 일괄 변환
+- 여러 파일/전체 시트 업로드: 파일 단위로 프로세스 풀(spawn)에 분배, 결과는 파일/시트별로 모아 반환
+- 등록 전 미리보기: 파싱 결과와 기존 데이터(CK관리번호로 1번 조회)를 컬럼 단위로 비교해 신규/변경/동일/중복 판정
+"""
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from common import get_kst_today, load_json_list, safe_date_parse, safe_float_parse
+
+# (필드, 헤더 키워드) - 첫 필드 키워드가 그룹 시작, 나머지는 바로 뒤 컬럼에서 순서대로 확인
+CLEARANCE_GROUP = (('date', '통관일'), ('qty', '수량'), ('rate', '환율'))
+DECLARATION_GROUP = (('date', '신고일'), ('no', '신고번호'))
+
+
+def find_col_groups(cols, group):
+    """반복 컬럼 그룹 위치 탐색 -> [{필드: 컬럼 위치}] (그룹 순서 = 엑셀 좌->우 순서)"""
+    (first, first_key), rest = group[0], group[1:]
+    groups = []
+    for i, c in enumerate(cols):
+        if first_key not in c: continue
+        pos = {first: i}
+        for off, (field, key) in enumerate(rest, start=1):
+            if i + off < len(cols) and key in cols[i + off]: pos[field] = i + off
+        groups.append(pos)
+    return groups
+
+
+def _date_values(col):
+    """날짜 컬럼 일괄 변환 -> 'YYYY-MM-DD' (빈 값/변환 실패 NaN), safe_date_parse 와 같은 입력 형식"""
+    col = pd.Series(col, dtype=object)
+    txt = col.astype(str).str.strip()
+    short = txt.str.fullmatch(r'\d{2}/\d{2}/\d{2}')   # 25/01/01
+    out = pd.to_datetime(txt.where(short), format='%y/%m/%d', errors='coerce')
+    rest = ~short & col.notna() & (txt != '')
+    if rest.any(): out[rest] = pd.to_datetime(col[rest], format='mixed', errors='coerce')
+    return out.dt.strftime('%Y-%m-%d')
+
+
+def _float_values(col):
+    """숫자 컬럼 일괄 변환 (천 단위 쉼표/공백 제거, 빈 값/변환 실패 0.0) - safe_float_parse 와 같은 규칙"""
+    txt = pd.Series(col, dtype=object).astype(str).str.replace(r'[,\s]', '', regex=True)
+    return pd.to_numeric(txt, errors='coerce').fillna(0.0).astype(float)
+
+
+def _text_values(col):
+    """문자열 컬럼 일괄 변환 (숫자로 읽힌 번호는 소수점 없이, 빈 값 '')"""
+    txt = col.astype(str).str.strip().str.replace(r'^(\d+)\.0$', r'\1', regex=True)
+    return txt.where(col.notna() & ~txt.isin(['nan', 'None', '<NA>']), '')
+
+
+def parse_col_groups(data_df, groups, fields, converters, keep):
+    """반복 컬럼 그룹 -> {행 인덱스: [{필드: 값}]}
+    그룹별 컬럼을 세로로 이어 붙여 필드당 1번씩 변환 (셀 단위 파이썬 반복 없음), keep(long) 을 만족하는 항목만 유지"""
+    if not groups or data_df.empty: return {}
+    n = len(data_df)
+    empty = pd.Series(np.nan, index=range(n), dtype=object)
+    long = pd.DataFrame({
+        'row': np.tile(data_df.index.to_numpy(), len(groups)),
+        'seq': np.repeat(np.arange(len(groups)), n),
+        **{f: converters[f](pd.concat([data_df.iloc[:, g[f]].reset_index(drop=True) if f in g else empty for g in groups], ignore_index=True))
+           for f in fields},
+    })
+    long = long[keep(long)].sort_values(['row', 'seq'], kind='stable')
+    if long.empty: return {}
+    long = long.astype(object).where(long.notna(), None)
+
+    out = {}
+    for row, rec in zip(long['row'].tolist(), long[list(fields)].to_dict('records')):
+        out.setdefault(row, []).append(rec)
+    return out
+
+def product_key(name):
+    """품목명 비교 키 (공백 제거, 소문자)"""
+    return str(name).replace(" ", "").lower()
+
+
+def product_lookup(p_df):
+    """등록 품목 목록 -> {품목명 키: 품목 ID}"""
+    if p_df is None or p_df.empty: return {}
+    return dict(zip(p_df['품목명'].map(product_key).tolist(), p_df['ID'].tolist()))
+
+
+def parse_import_full_excel(df, p_df):
+    """'수입' 탭(상세 장부) 구조의 엑셀/CSV 파일 파싱 (p_df: 등록 품목 목록, get_products_df 결과)
+    -> (유효 행, 에러, 미등록 품목 행) - 미등록 품목 행은 product_id 없이 '_product_name', '_row' 를 담아 반환 (resolve_pending 으로 재판정)
+    ('_' 로 시작하는 키는 저장/비교 대상이 아님)"""
+    valid_data = []
+    errors = []
+    pending = []
+    
+    product_map = product_lookup(p_df)
+    
+    keywords = ['CK', '관리번호', '품명', '수량', '단가', '글로벌', '두진', '입고일', 'ETA']
+    
+    def clean_str(s):
+        return str(s).replace('\n', '').replace('\r', '').replace(' ', '').upper().strip()
+
+    data_df = pd.DataFrame()
+    header_row_idx = -1
+    
+    # 헤더 찾기 로직
+    col_str = "".join([clean_str(c) for c in df.columns])
+    score_cols = sum(1 for k in keywords if k in col_str)
+    
+    if score_cols >= 2 and (('CK' in col_str or '관리번호' in col_str) and '품명' in col_str):
+        data_df = df
+    else:
+        if df.empty: return [], ["파일 내용이 없습니다."], []
+        max_score = 0
+        for i in range(min(20, len(df))):
+            row_vals = [clean_str(x) for x in df.iloc[i].values if pd.notna(x)]
+            row_str = "".join(row_vals)
+            score = sum(1 for k in keywords if k in row_str)
+            if score > max_score and score >= 2:
+                max_score = score
+                header_row_idx = i
+                
+        if header_row_idx != -1:
+            df.columns = df.iloc[header_row_idx]
+            data_df = df.iloc[header_row_idx+1:].reset_index(drop=True)
+        else:
+            return [], ["헤더를 찾을 수 없습니다."], []
+
+    # 반복 그룹 헤더는 이름이 겹치므로 위치 접미사로 고유화 (환율, 환율.1 ...)
+    seen = {}
+    cols = []
+    for c in (clean_str(c) for c in data_df.columns):
+        cols.append(c if c not in seen else f"{c}.{seen[c]}")
+        seen[c] = seen.get(c, 0) + 1
+    data_df.columns = cols
+
+    clr_groups = find_col_groups(cols, CLEARANCE_GROUP)
+    decl_groups = find_col_groups(cols, DECLARATION_GROUP)
+    group_cols = {cols[i] for g in clr_groups + decl_groups for i in g.values()}
+    
+    def find_col(keywords):
+        for c in cols:
+            if c in group_cols: continue   # 통관/신고 그룹의 수량/환율 컬럼은 단건 컬럼 탐색에서 제외
+            for k in keywords:
+                if k.replace(" ", "").upper() in c: return c
+        return None
+
+    col_map = {
+        'ck': find_col(['CK', '관리번호']), 'global': find_col(['글로벌']), 'doojin': find_col(['두진']),
+        'agency': find_col(['대행']), 'agency_contract': find_col(['대행계약서']),
+        'supplier': find_col(['수출자', '수입자']), 'origin': find_col(['원산지']), 'name': find_col(['품명']),
+        'size': find_col(['사이즈']), 'packing': find_col(['Packing']), 'open_qty': find_col(['오픈수량']),
+        'unit': find_col(['단위']), 'doc_qty': find_col(['서류수량']), 'box_qty': find_col(['박스수량']),
+        'price': find_col(['단가']), 'open_amt': find_col(['오픈금액']), 'doc_amt': find_col(['서류금액']),
+        'tt': find_col(['T/T']), 'bank': find_col(['은행']), 'usance': find_col(['Usance']), 'at_sight': find_col(['AtSight']),
+        'open_date': find_col(['개설일']), 'lc_no': find_col(['LCNo', 'L/C']), 'inv_no': find_col(['Invoice']),
+        'bl_no': find_col(['BLNo', 'B/L']), 'lg_no': find_col(['LG', 'L/G']), 'insurance': find_col(['보험']),
+        'broker_date': find_col(['관세사']), 'etd': find_col(['ETD']), 'eta': find_col(['ETA']),
+        'arrival_date': find_col(['입고일']), 'wh': find_col(['창고']), 'real_in_qty': find_col(['실입고']),
+        'dest': find_col(['착지']), 'note': find_col(['비고']), 'doc_acc': find_col(['서류인수']),
+        'acc_rate': find_col(['인수수수료율']), 'mat_date': find_col(['만기일']), 'ext_date': find_col(['연장만기일']),
+        'acc_fee': find_col(['인수수수료']), 'dis_fee': find_col(['인수할인료']), 'pay_date': find_col(['결제일']),
+        'pay_amt': find_col(['결제금액']), 'ex_rate': find_col(['환율']), 'balance': find_col(['잔액']), 'avg_ex': find_col(['평균환율'])
+    }
+    
+    if col_map['agency'] and '계약서' in str(col_map['agency']):
+        col_map['agency'] = None
+        for c in cols:
+            if '대행' in c and '계약서' not in c: col_map['agency'] = c; break
+
+    try:
+        if col_map['price']:
+            idx = cols.index(col_map['price'])
+            col_map['unit2'] = cols[idx+1] if idx + 1 < len(cols) else None
+        else: col_map['unit2'] = None
+    except: col_map['unit2'] = None
+
+    clr_by_row = parse_col_groups(
+        data_df, clr_groups, ('date', 'qty', 'rate'),
+        {'date': _date_values, 'qty': _float_values, 'rate': _float_values},
+        lambda x: x['date'].notna() | (x['qty'] > 0))
+    decl_by_row = parse_col_groups(
+        data_df, decl_groups, ('date', 'no'),
+        {'date': _date_values, 'no': _text_values},
+        lambda x: x['date'].notna() | (x['no'] != ''))
+
+    for idx, row in data_df.iterrows():
+        if not col_map['name']: continue
+        name_val = str(row.get(col_map['name'], '')).strip()
+        if not name_val or name_val.lower() == 'nan': continue
+        
+        pid = product_map.get(product_key(name_val))
+            
+        try:
+            def get_val(key, parser=str):
+                col = col_map.get(key)
+                return parser(row.get(col)) if col else (0.0 if parser == safe_float_parse else None)
+
+            clearance_list = clr_by_row.get(idx, [])
+            declaration_list = decl_by_row.get(idx, [])
+
+            data = {
+                'product_id': pid, 'ck_code': get_val('ck'),
+                'global_code': get_val('global'), 'doojin_code': get_val('doojin'),
+                'agency': get_val('agency'), 'agency_contract': get_val('agency_contract'),
+                'supplier': get_val('supplier'), 'origin': get_val('origin'),
+                'size': get_val('size'), 'packing': get_val('packing'),
+                'open_qty': get_val('open_qty', safe_float_parse),
+                'quantity': get_val('open_qty', safe_float_parse),
+                'doc_qty': get_val('doc_qty', safe_float_parse),
+                'box_qty': get_val('box_qty', safe_float_parse),
+                'unit2': get_val('unit2'),
+                'unit_price': get_val('price', safe_float_parse),
+                'open_amount': get_val('open_amt', safe_float_parse),
+                'doc_amount': get_val('doc_amt', safe_float_parse),
+                'tt_check': get_val('tt'), 'bank': get_val('bank'),
+                'usance': get_val('usance'), 'at_sight': get_val('at_sight'),
+                'open_date': get_val('open_date', safe_date_parse),
+                'lc_no': get_val('lc_no'), 'invoice_no': get_val('inv_no'),
+                'bl_no': get_val('bl_no'), 'lg_no': get_val('lg_no'), 'insurance': get_val('insurance'),
+                'customs_broker_date': get_val('broker_date', safe_date_parse),
+                'etd': get_val('etd', safe_date_parse),
+                'expected_date': get_val('eta', safe_date_parse) or get_kst_today(),
+                'arrival_date': get_val('arrival_date', safe_date_parse),
+                'warehouse': get_val('wh'), 
+                'actual_in_qty': get_val('real_in_qty', safe_float_parse),
+                'destination': get_val('dest'), 'note': get_val('note'),
+                'doc_acceptance': get_val('doc_acc', safe_date_parse),
+                'acceptance_rate': get_val('acc_rate', safe_float_parse),
+                'maturity_date': get_val('mat_date', safe_date_parse),
+                'ext_maturity_date': get_val('ext_date', safe_date_parse),
+                'acceptance_fee': get_val('acc_fee', safe_float_parse),
+                'discount_fee': get_val('dis_fee', safe_float_parse),
+                'payment_date': get_val('pay_date', safe_date_parse),
+                'payment_amount': get_val('pay_amt', safe_float_parse),
+                'exchange_rate': get_val('ex_rate', safe_float_parse),
+                'balance': get_val('balance', safe_float_parse),
+                'avg_exchange_rate': get_val('avg_ex', safe_float_parse),
+                'clearance_info': clearance_list,
+                'declaration_info': declaration_list,
+                'status': 'PENDING'
+            }
+            if pid: valid_data.append(data)
+            else: pending.append({**data, '_product_name': name_val, '_row': idx + 2})
+        except Exception as e:
+            errors.append(f"[행 {idx+2}] 파싱 오류: {str(e)}")
+            
+    return valid_data, errors, pending
+
+
+def resolve_pending(pending, p_df):
+    """미등록 품목 행 재판정 (품목 등록 후 파일 재파싱 없이) -> (품목이 확인된 행, 여전히 미등록인 행)"""
+    product_map = product_lookup(p_df)
+    resolved, left = [], []
+    for d in pending:
+        pid = product_map.get(product_key(d['_product_name']))
+        if pid: resolved.append({k: v for k, v in d.items() if k not in ('_product_name', '_row')} | {'product_id': pid})
+        else: left.append(d)
+    return resolved, left
+
+
+# ==========================================
+# 여러 파일 / 전체 시트 일괄 파싱
+# ==========================================
+
+def make_parse_pool(max_workers=None):
+    """파싱 전용 프로세스 풀 (spawn - Streamlit 서버의 스레드/소켓 상태를 fork 로 복제하지 않음)"""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def read_upload_sheets(name, data):
+    """업로드 파일 1개 -> [(시트명, DataFrame)] (xlsx: 전체 시트, csv: 시트 1개)"""
+    if name.lower().endswith('.csv'):
+        try: return [('CSV', pd.read_csv(io.BytesIO(data)))]
+        except UnicodeDecodeError: return [('CSV', pd.read_csv(io.BytesIO(data), encoding='cp949'))]
+    return list(pd.read_excel(io.BytesIO(data), sheet_name=None).items())
+
+
+def parse_upload_file(name, data, p_df):
+    """파일 1개의 전체 시트 파싱 -> [{'file', 'sheet', 'rows', 'errors', 'pending'}] (워커 프로세스에서 실행, 빈 시트는 건너뜀)"""
+    try: sheets = read_upload_sheets(name, data)
+    except Exception as e: return [{'file': name, 'sheet': None, 'rows': [], 'errors': [f"파일 읽기 오류: {e}"], 'pending': []}]
+
+    results = []
+    for sheet, df in sheets:
+        if df.dropna(how='all').empty and df.columns.astype(str).str.startswith('Unnamed').all(): continue
+        try: rows, errors, pending = parse_import_full_excel(df, p_df)
+        except Exception as e: rows, errors, pending = [], [f"시트 파싱 오류: {e}"], []
+        results.append({'file': name, 'sheet': sheet, 'rows': rows, 'errors': errors, 'pending': pending})
+    return results
+
+
+def parse_upload_files(files, p_df, executor=None):
+    """여러 업로드 파일 파싱 -> 파일별 [시트별 결과] 목록 (업로드 순서 유지)
+    files: [(파일명, bytes)], executor 가 있고 파일이 2개 이상이면 파일 단위로 병렬 처리
+    워커 비정상 종료로 풀이 깨지면(BrokenProcessPool, submit / result 모두) 호출 측이 풀을 교체하도록 그대로 전달"""
+    if executor is None or len(files) < 2:
+        return [parse_upload_file(name, data, p_df) for name, data in files]
+
+    futures = [(name, executor.submit(parse_upload_file, name, data, p_df)) for name, data in files]
+    results = []
+    for name, fut in futures:
+        try: results.append(fut.result())
+        except BrokenProcessPool: raise
+        except Exception as e: results.append([{'file': name, 'sheet': None, 'rows': [], 'errors': [f"처리 오류: {e}"], 'pending': []}])
+    return results
+
+
+def parse_upload_batch(files, p_df, executor=None):
+    """여러 업로드 파일 파싱 -> 파일/시트별 결과 목록 (parse_upload_files 결과를 펼침)"""
+    return [r for res in parse_upload_files(files, p_df, executor) for r in res]
+
+
+# ==========================================
+# 등록 전 미리보기 (기존 데이터와 비교)
+# ==========================================
+
+# (ck_code, product_id) 가 같으면 같은 건 - CK 1건에 품목 여러 개가 있을 수 있음
+DIFF_KEYS = ('ck_code', 'product_id')
+DIFF_TEXT_COLS = ('global_code', 'doojin_code', 'agency', 'agency_contract', 'supplier', 'origin', 'size', 'packing',
+                  'unit2', 'tt_check', 'bank', 'usance', 'at_sight', 'lc_no', 'invoice_no', 'bl_no', 'lg_no', 'insurance',
+                  'warehouse', 'destination', 'note')
+DIFF_NUM_COLS = ('open_qty', 'doc_qty', 'box_qty', 'unit_price', 'open_amount', 'doc_amount', 'actual_in_qty',
+                 'acceptance_rate', 'acceptance_fee', 'discount_fee', 'payment_amount', 'exchange_rate', 'balance', 'avg_exchange_rate')
+DIFF_DATE_COLS = ('open_date', 'customs_broker_date', 'etd', 'expected_date', 'arrival_date', 'doc_acceptance',
+                  'maturity_date', 'ext_maturity_date', 'payment_date')
+DIFF_JSON_COLS = ('clearance_info', 'declaration_info')
+DIFF_COLS = DIFF_TEXT_COLS + DIFF_NUM_COLS + DIFF_DATE_COLS + DIFF_JSON_COLS
+
+
+def _norm_text(col):
+    txt = col.astype(object).where(col.notna(), '').astype(str).str.strip()
+    return txt.where(~txt.isin(['nan', 'None', '<NA>']), '')
+
+
+def _norm_frame(df):
+    """비교용 정규화: 문자열(빈 값 ''), 숫자(float, 빈 값 0), 날짜('YYYY-MM-DD', 빈 값 ''), JSONB(정렬된 JSON 문자열)"""
+    out = {}
+    for c in DIFF_TEXT_COLS + ('ck_code',):
+        out[c] = _norm_text(df[c]) if c in df else pd.Series('', index=df.index)
+    for c in DIFF_NUM_COLS:
+        out[c] = pd.to_numeric(df[c], errors='coerce').fillna(0.0).astype(float) if c in df else pd.Series(0.0, index=df.index)
+    for c in DIFF_DATE_COLS:
+        out[c] = pd.to_datetime(df[c], errors='coerce').dt.strftime('%Y-%m-%d').fillna('') if c in df else pd.Series('', index=df.index)
+    for c in DIFF_JSON_COLS:
+        out[c] = pd.Series([json.dumps(load_json_list(v), sort_keys=True, ensure_ascii=False) for v in df[c]], index=df.index) \
+            if c in df else pd.Series('[]', index=df.index)
+    out['product_id'] = pd.to_numeric(df['product_id'], errors='coerce') if 'product_id' in df else pd.Series(np.nan, index=df.index)
+    return pd.DataFrame(out, index=df.index)
+
+
+def diff_import(new_rows, cur_df):
+    """파싱 결과 vs 기존 데이터 -> (판정 DataFrame, 입력값 있음 마스크)
+    판정: 'status'(신규/변경/동일/중복), 'db_id'(비교한 기존 건), 'changes'(바뀌는 컬럼, 쉼표 구분)
+    파일에 값이 없는 칸(빈 문자열/0/빈 목록)은 비교하지 않음 - 기존 값을 지우지 않는다.
+    ETA 가 비어 파서가 오늘 날짜로 채운 경우와 구분할 수 없으므로 오늘 날짜 ETA 도 비교하지 않음"""
+    new = _norm_frame(pd.DataFrame(new_rows)).reset_index(drop=True)
+    provided = pd.DataFrame({c: new[c] != (0.0 if c in DIFF_NUM_COLS else '[]' if c in DIFF_JSON_COLS else '') for c in DIFF_COLS})
+    provided['expected_date'] &= new['expected_date'] != str(get_kst_today())
+
+    res = pd.DataFrame({'status': '신규', 'db_id': pd.array([pd.NA] * len(new), dtype='Int64'), 'changes': ''})
+    if new.empty: return res, provided
+    keyed = new['ck_code'] != ''
+    batch_dup = keyed & new.duplicated(list(DIFF_KEYS), keep='first')
+
+    if cur_df is not None and not cur_df.empty:
+        cur = _norm_frame(cur_df).assign(id=cur_df['id'].to_numpy())
+        counts = cur.groupby(list(DIFF_KEYS), dropna=False).size().rename('_cnt')
+        cur = cur.sort_values('id').drop_duplicates(list(DIFF_KEYS), keep='first').join(counts, on=list(DIFF_KEYS))
+        m = new[list(DIFF_KEYS)].merge(cur, how='left', on=list(DIFF_KEYS), suffixes=('', '_db'))
+        found = keyed & m['id'].notna()
+
+        mismatch = pd.DataFrame({c: provided[c] & found & (
+            ~np.isclose(new[c], m[c].fillna(0.0)) if c in DIFF_NUM_COLS else new[c] != m[c].fillna('')) for c in DIFF_COLS})
+        changed = mismatch.any(axis=1)
+        res['db_id'] = m['id'].where(found).astype('Int64')
+        res['changes'] = mismatch.dot(pd.Index(DIFF_COLS) + ',').str.rstrip(',')
+        res.loc[found & ~changed, 'status'] = '동일'
+        res.loc[found & changed, 'status'] = '변경'
+        res.loc[found & (m['_cnt'] > 1), 'status'] = '중복'
+    res.loc[batch_dup, 'status'] = '중복'
+    return res, provided
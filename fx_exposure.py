@@ -0,0 +1,114 @@
+"""
+L/C 미결제 포지션 FX / 만기 분석
+- Streamlit/DB 비의존 순수 pandas/NumPy 벡터 연산 (행 단위 루프 없음)
+- 입력: import_schedules 조회 결과 + schedule_clearances (schedule_id, qty, rate)
+"""
+import numpy as np
+import pandas as pd
+
+NUMERIC_COLS = ['open_amount', 'doc_amount', 'payment_amount', 'exchange_rate',
+                'arrival_exchange_rate', 'avg_exchange_rate']
+
+# 적용 환율 우선순위: 통관 가중평균 > 평균환율 > 도착일 환율 > 환율
+RATE_PRIORITY = ['clr_avg_rate', 'avg_exchange_rate', 'arrival_exchange_rate', 'exchange_rate']
+
+OVERDUE_LABEL = '만기경과'
+NO_MATURITY_LABEL = '만기미정'
+NO_BANK_LABEL = '미지정'
+
+
+def weighted_avg_rates(clr_df):
+    """건별 통관 수량 가중평균 환율 (schedule_id -> rate Series)"""
+    if clr_df is None or clr_df.empty: return pd.Series(dtype=float)
+    qty = pd.to_numeric(clr_df['qty'], errors='coerce').astype(float)
+    rate = pd.to_numeric(clr_df['rate'], errors='coerce').astype(float)
+    mask = (qty > 0) & (rate > 0)
+    sid = clr_df['schedule_id'][mask]
+    amt_sum = (qty[mask] * rate[mask]).groupby(sid).sum()
+    qty_sum = qty[mask].groupby(sid).sum()
+    return amt_sum / qty_sum
+
+
+def prepare_positions(pos_df, clr_df=None):
+    """원시 조회 결과 -> 미결제 포지션 (잔액, 적용 만기일, 적용 환율 계산)"""
+    if pos_df is None or pos_df.empty: return pd.DataFrame()
+    df = pos_df.copy()
+    for c in NUMERIC_COLS:
+        df[c] = pd.to_numeric(df[c], errors='coerce').astype(float).fillna(0.0)
+
+    # 서류금액이 있으면 서류금액, 없으면 오픈금액 기준 잔액
+    notional = np.where(df['doc_amount'].to_numpy() > 0, df['doc_amount'].to_numpy(), df['open_amount'].to_numpy())
+    df['outstanding'] = np.clip(notional - df['payment_amount'].to_numpy(), 0.0, None)
+
+    # 연장만기일이 있으면 연장만기일 우선
+    df['eff_maturity'] = pd.to_datetime(df['ext_maturity_date'], errors='coerce').fillna(
+        pd.to_datetime(df['maturity_date'], errors='coerce'))
+
+    df['clr_avg_rate'] = df['id'].map(weighted_avg_rates(clr_df)).astype(float)
+    rates = df[RATE_PRIORITY].where(df[RATE_PRIORITY] > 0)
+    df['booked_rate'] = rates.bfill(axis=1).iloc[:, 0]
+    df['bank'] = df['bank'].fillna(NO_BANK_LABEL).replace('', NO_BANK_LABEL)
+
+    return df[df['outstanding'] > 0].reset_index(drop=True)
+
+
+def maturity_buckets(df, as_of):
+    """적용 만기일 -> 주 단위 버킷 라벨 (월요일 시작, 경과/미정 별도)"""
+    as_of = pd.Timestamp(as_of)
+    week_start = df['eff_maturity'].dt.to_period('W-SUN').dt.start_time
+    this_week = as_of.to_period('W-SUN').start_time
+    labels = week_start.dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+    labels = np.where(week_start.isna().to_numpy(), NO_MATURITY_LABEL, labels)
+    labels = np.where((week_start < this_week).to_numpy(), OVERDUE_LABEL, labels)
+    return pd.Series(labels, index=df.index)
+
+
+def maturity_ladder(df, as_of):
+    """주 단위 × 은행별 만기 잔액 사다리 (행: 버킷, 열: 은행, 마지막 열: 합계)"""
+    if df.empty: return pd.DataFrame()
+    ladder = df.assign(bucket=maturity_buckets(df, as_of)).pivot_table(
+        index='bucket', columns='bank', values='outstanding', aggfunc='sum', fill_value=0.0)
+    ladder['합계'] = ladder.sum(axis=1)
+    # 경과 -> 주차(날짜순) -> 미정 순서
+    weeks = sorted(i for i in ladder.index if i not in (OVERDUE_LABEL, NO_MATURITY_LABEL))
+    order = ([OVERDUE_LABEL] if OVERDUE_LABEL in ladder.index else []) + weeks + \
+            ([NO_MATURITY_LABEL] if NO_MATURITY_LABEL in ladder.index else [])
+    return ladder.loc[order]
+
+
+def krw_exposure(df, what_if_rate):
+    """적용 환율 vs 가정 환율 기준 원화 환산액 및 차이
+    booked_krw / what_if_krw / krw_diff 는 적용 환율이 있는 건만 (같은 포지션 집합 -> 가정 - 적용 = 차이)
+    환율 미상 건은 unrated_out (USD 잔액) / unrated_krw (가정 환율 환산) 로 따로"""
+    if df.empty: return df.assign(booked_krw=[], what_if_krw=[], krw_diff=[], unrated_out=[], unrated_krw=[])
+    out = df['outstanding'].to_numpy()
+    has_rate = df['booked_rate'].notna().to_numpy()
+    booked_krw = out * df['booked_rate'].to_numpy()
+    all_krw = out * float(what_if_rate)
+    what_if_krw = np.where(has_rate, all_krw, np.nan)
+    return df.assign(booked_krw=booked_krw, what_if_krw=what_if_krw, krw_diff=what_if_krw - booked_krw,
+                     unrated_out=np.where(has_rate, 0.0, out), unrated_krw=np.where(has_rate, 0.0, all_krw))
+
+
+def exposure_by_bank(exp_df):
+    """은행별 미결제 잔액 / 원화 환산 / 차이 합계 + 잔액 가중평균 적용 환율 (원화_적용/가정/차이는 환율 있는 건, 미상_* 은 환율 미상 건)"""
+    if exp_df.empty: return pd.DataFrame()
+    has_rate = exp_df['booked_rate'].notna()
+    g = exp_df.assign(
+        rated_out=np.where(has_rate, exp_df['outstanding'], 0.0),
+        rated_krw=np.where(has_rate, exp_df['booked_krw'], 0.0),
+    ).groupby('bank')
+    summary = g.agg(건수=('id', 'size'), 잔액_USD=('outstanding', 'sum'), 원화_적용=('booked_krw', 'sum'),
+                    원화_가정=('what_if_krw', 'sum'), 차이=('krw_diff', 'sum'),
+                    미상_USD=('unrated_out', 'sum'), 미상_원화_가정=('unrated_krw', 'sum'),
+                    rated_out=('rated_out', 'sum'), rated_krw=('rated_krw', 'sum'))
+    summary['가중평균_환율'] = summary['rated_krw'] / summary['rated_out'].replace(0, np.nan)
+    return summary.drop(columns=['rated_out', 'rated_krw']).sort_values('잔액_USD', ascending=False)
+
+
+def portfolio_avg_rate(df):
+    """전체 포지션 잔액 가중평균 적용 환율 (환율 미상 건 제외)"""
+    if df.empty: return None
+    m = df['booked_rate'].notna()
+    w = df.loc[m, 'outstanding'].sum()
+    return float((df.loc[m, 'outstanding'] * df.loc[m, 'booked_rate']).sum() / w) if w > 0 else None
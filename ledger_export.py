@@ -0,0 +1,137 @@
+"""
+수입장부 / 수출장부 스트리밍 내보내기 (Excel / Parquet)
+- 서버 사이드 커서(stream_results)로 배치 단위 조회 -> openpyxl write-only 시트 / Parquet 행 그룹에 바로 기록
+- 전체 결과를 DataFrame 하나로 올리지 않으므로 행 수와 무관하게 메모리 사용량 일정
+- 엑셀 헤더는 업로드 양식(parse_import_full_excel 컬럼 탐색 키워드)과 같은 한글 컬럼명 사용 -> 재업로드 가능
+"""
+import tempfile
+from decimal import Decimal
+
+from sqlalchemy import text
+
+BATCH_SIZE = 2000
+
+# (SELECT 식, 엑셀 헤더, 타입) - 순서 주의: 업로드 파서가 부분 문자열로 컬럼을 찾으므로
+# '단가' 바로 다음 열이 단가 단위, '인수수수료'는 '인수수수료율'보다, '만기일'은 '연장만기일'보다, '환율'은 '평균환율'보다 앞에 둔다.
+LEDGER_COLUMNS = [
+    ("s.ck_code", "CK관리번호", "text"),
+    ("s.global_code", "글로벌번호", "text"),
+    ("s.doojin_code", "두진번호", "text"),
+    ("s.agency", "대행", "text"),
+    ("s.agency_contract", "대행계약서", "text"),
+    ("s.supplier", "수출자(수입자)", "text"),
+    ("s.origin", "원산지", "text"),
+    ("p.product_name", "품명", "text"),
+    ("s.size", "사이즈", "text"),
+    ("s.packing", "Packing", "text"),
+    ("s.open_qty", "오픈수량", "num"),
+    ("p.unit", "단위", "text"),
+    ("s.doc_qty", "서류수량", "num"),
+    ("s.box_qty", "박스수량", "num"),
+    ("s.unit_price", "단가", "num"),
+    ("s.unit2", "단가단위", "text"),
+    ("s.open_amount", "오픈금액", "num"),
+    ("s.doc_amount", "서류금액", "num"),
+    ("s.tt_check", "T/T", "text"),
+    ("s.bank", "은행", "text"),
+    ("s.usance", "Usance", "text"),
+    ("s.at_sight", "At Sight", "text"),
+    ("s.open_date", "개설일", "date"),
+    ("s.lc_no", "L/C No", "text"),
+    ("s.invoice_no", "Invoice No", "text"),
+    ("s.bl_no", "B/L No", "text"),
+    ("s.lg_no", "L/G", "text"),
+    ("s.insurance", "보험", "text"),
+    ("s.customs_broker_date", "관세사전달일", "date"),
+    ("s.etd", "ETD", "date"),
+    ("s.expected_date", "ETA", "date"),
+    ("s.arrival_date", "입고일", "date"),
+    ("s.warehouse", "창고", "text"),
+    ("s.actual_in_qty", "실입고수량", "num"),
+    ("s.destination", "착지", "text"),
+    ("s.doc_acceptance", "서류인수일", "date"),
+    ("s.acceptance_fee", "인수수수료", "num"),
+    ("s.acceptance_rate", "인수수수료율", "num"),
+    ("s.maturity_date", "만기일", "date"),
+    ("s.ext_maturity_date", "연장만기일", "date"),
+    ("s.discount_fee", "인수할인료", "num"),
+    ("s.payment_date", "결제일", "date"),
+    ("s.payment_amount", "결제금액", "num"),
+    ("s.exchange_rate", "환율", "num"),
+    ("s.balance", "잔액", "num"),
+    ("s.avg_exchange_rate", "평균환율", "num"),
+    ("s.note", "비고", "text"),
+    ("s.status", "상태", "text"),
+]
+
+SHEET_TITLES = {'import_schedules': '수입장부', 'export_schedules': '수출장부'}
+
+
+def _col_name(expr):
+    return "p_unit" if expr == "p.unit" else expr.split('.')[1]
+
+
+def ledger_sql(table_name, include_archive=False):
+    """include_archive: 보관 테이블({table_name}_archive) 건도 포함 (필요한 컬럼만 UNION ALL)"""
+    cols = ", ".join(f"{expr} AS {_col_name(expr)}" for expr, _, _ in LEDGER_COLUMNS)
+    source = table_name
+    if include_archive:
+        s_cols = ", ".join(dict.fromkeys(['id', 'product_id', 'expected_date'] + [e[2:] for e, _, _ in LEDGER_COLUMNS if e.startswith('s.')]))
+        source = f"(SELECT {s_cols} FROM {table_name} UNION ALL SELECT {s_cols} FROM {table_name}_archive)"
+    return f"""
+        SELECT {cols}
+        FROM {source} s
+        LEFT JOIN products p ON s.product_id = p.product_id
+        ORDER BY s.expected_date ASC, s.id DESC
+    """
+
+
+def iter_ledger_batches(engine, table_name, batch_size=BATCH_SIZE, include_archive=False):
+    """서버 사이드 커서로 batch_size 행씩 튜플 리스트 반환"""
+    with engine.connect() as c:
+        result = c.execution_options(stream_results=True, max_row_buffer=batch_size).execute(text(ledger_sql(table_name, include_archive)))
+        for part in result.partitions(batch_size):
+            yield part
+
+
+def _to_file_bytes(write_fn):
+    """임시 파일(일정 크기 이상은 디스크)로 기록 후 bytes 반환"""
+    with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as f:
+        write_fn(f)
+        f.seek(0)
+        return f.read()
+
+
+def export_xlsx(engine, table_name, batch_size=BATCH_SIZE, include_archive=False):
+    """write-only 워크북으로 스트리밍 기록한 xlsx bytes"""
+    from openpyxl import Workbook
+
+    def write(f):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(SHEET_TITLES.get(table_name, table_name))
+        ws.append([heading for _, heading, _ in LEDGER_COLUMNS])
+        for part in iter_ledger_batches(engine, table_name, batch_size, include_archive):
+            for row in part: ws.append(list(row))
+        wb.save(f)
+
+    return _to_file_bytes(write)
+
+
+def export_parquet(engine, table_name, batch_size=BATCH_SIZE, include_archive=False):
+    """배치마다 행 그룹 1개씩 기록한 Parquet bytes (컬럼명은 DB 컬럼명)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {"text": pa.string(), "num": pa.float64(), "date": pa.date32()}
+    schema = pa.schema([(_col_name(expr), arrow_types[kind]) for expr, _, kind in LEDGER_COLUMNS])
+    num_idx = [i for i, (_, _, kind) in enumerate(LEDGER_COLUMNS) if kind == "num"]
+
+    def write(f):
+        with pq.ParquetWriter(f, schema, compression="zstd") as writer:
+            for part in iter_ledger_batches(engine, table_name, batch_size, include_archive):
+                columns = [list(c) for c in zip(*part)]
+                for i in num_idx:
+                    columns[i] = [float(v) if isinstance(v, Decimal) else v for v in columns[i]]
+                writer.write_table(pa.Table.from_arrays([pa.array(c, type=t) for c, t in zip(columns, schema.types)], schema=schema))
+
+    return _to_file_bytes(write)
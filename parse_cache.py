@@ -0,0 +1,96 @@
+"""
+업로드 파싱 결과 로컬 디스크 캐시 (내용 해시 키, 크기 제한 LRU)
+- 키: 파일 bytes + 확장자(csv/xlsx 읽기 방식) + 파서 모듈 소스 해시 + 파싱에 쓴 품목 목록 지문 + 파싱 날짜(KST)
+  같은 파일을 다시 올리면(저장 실패 후 재시도, 품목 등록 후 재분석 등) 엑셀 읽기/헤더 탐색/행 파싱을 건너뜀
+  품목이 추가/수정되면 지문이 바뀌므로 미등록 품목(pending) 판정이 예전 목록으로 남지 않음
+  ETA 빈 칸은 파싱 당일로 채워지므로(미리보기는 오늘 날짜 ETA 를 '입력 없음'으로 봄) 날짜가 바뀌면 다시 파싱
+- 항목 1개 = pickle 파일 1개 (임시 파일 -> 원자적 교체), 적중 시 mtime 갱신 -> 전체 크기 초과 시 오래된 것부터 삭제
+- 여러 프로세스가 같은 디렉터리를 써도 됨 (삭제/교체 경합은 무시, 최악의 경우 다시 파싱)
+"""
+import hashlib
+import os
+import pickle
+import threading
+
+import pandas as pd
+
+PARSE_CACHE_DIR = os.environ.get('CK_PARSE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.parse_cache'))
+SUFFIX = '.pkl'
+
+
+def module_digest(*modules):
+    """파서 코드가 바뀌면 예전 결과를 쓰지 않도록 모듈 소스 해시를 키에 포함 (파서 + 파서가 쓰는 공용 변환 함수 모듈)"""
+    h = hashlib.sha256()
+    for module in modules:
+        with open(module.__file__, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def frame_digest(df):
+    """품목 목록 DataFrame 지문 (컬럼 + 값, 행 순서 포함)"""
+    h = hashlib.sha256(repr(list(df.columns)).encode())
+    if not df.empty: h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+class ParseCache:
+    """파일 단위 파싱 결과([시트별 결과 dict]) 저장소 - 값은 매번 디스크에서 새로 읽으므로 호출 측이 수정해도 됨"""
+
+    def __init__(self, cache_dir=None, max_bytes=256 * 1024 * 1024, version=''):
+        self.cache_dir = cache_dir or PARSE_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self.stats = {'hit': 0, 'miss': 0, 'evicted': 0}
+
+    def key(self, name, data, catalogue, day):
+        """catalogue: frame_digest(품목 목록), day: 파싱 날짜 (ETA 기본값)"""
+        h = hashlib.sha256(f"{self.version}|{os.path.splitext(name)[1].lower()}|{catalogue}|{day}|".encode())
+        h.update(data)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + SUFFIX)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except Exception:
+            self.stats['miss'] += 1
+            return None
+        self.stats['hit'] += 1
+        return value
+
+    def put(self, key, value):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path): os.remove(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self):
+        """전체 크기가 max_bytes 를 넘으면 최근 사용(mtime)이 오래된 항목부터 삭제"""
+        with self._lock:
+            entries = []
+            for e in os.scandir(self.cache_dir):
+                if not e.name.endswith(SUFFIX): continue
+                try: info = e.stat()
+                except FileNotFoundError: continue
+                entries.append((info.st_mtime, info.st_size, e.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes: break
+                try: os.remove(path)
+                except FileNotFoundError: pass
+                total -= size
+                self.stats['evicted'] += 1
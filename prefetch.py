@@ -0,0 +1,62 @@
+"""
+다음 탭 데이터 선조회 (백그라운드 스레드 풀)
+- 현재 탭 렌더링이 끝난 뒤 다음에 열 가능성이 높은 탭의 캐시를 미리 채움 (st.cache_data / 증분 동기화 캐시)
+- 프로세스당 1개, 작업은 key 로 중복 제거 (여러 세션이 같은 캐시를 요청해도 1번만 조회)
+- 세션이 다른 탭으로 이동하면 그 세션만 원하던 대기 작업은 취소 (실행 시작 전이면 건너뜀)
+- 워커 수는 DB 커넥션 풀보다 작게 유지하고, 풀이 사용 중(is_busy)이면 선조회를 건너뜀 -> 화면 조회가 항상 우선
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """key -> 캐시 워밍 함수 실행기 (결과는 버림, 캐시에 남는 것이 목적)"""
+
+    def __init__(self, max_workers=2, is_busy=None):
+        self.max_workers = max_workers
+        self.is_busy = is_busy
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ck-prefetch")
+        self._pending = {}   # key -> Future (대기/실행 중)
+        self._wanted = {}    # key -> 요청한 세션(owner) 집합
+        self._lock = threading.RLock()   # 취소 시 done 콜백이 같은 스레드에서 바로 실행됨
+        self.stats = {'done': 0, 'skipped': 0, 'cancelled': 0, 'failed': 0}
+
+    def schedule(self, owner, tasks):
+        """owner(세션)의 선조회 목록 교체: 더 이상 아무도 원하지 않는 대기 작업 취소 후 새 작업 제출"""
+        with self._lock:
+            for key in list(self._wanted):
+                owners = self._wanted[key]
+                owners.discard(owner)
+                if owners or key in tasks: continue
+                del self._wanted[key]
+                fut = self._pending.get(key)
+                if fut is not None and fut.cancel():
+                    self._pending.pop(key, None)
+                    self.stats['cancelled'] += 1
+
+            for key, fn in tasks.items():
+                self._wanted.setdefault(key, set()).add(owner)
+                if key in self._pending: continue   # 이미 대기/실행 중 -> 재사용
+                fut = self._pool.submit(self._run, key, fn)
+                self._pending[key] = fut
+                fut.add_done_callback(lambda _f, k=key: self._finish(k))
+
+    def _run(self, key, fn):
+        with self._lock:
+            stale = key not in self._wanted
+        if stale or (self.is_busy is not None and self.is_busy()):
+            self.stats['skipped'] += 1
+            return
+        try:
+            fn()
+            self.stats['done'] += 1
+        except Exception:
+            self.stats['failed'] += 1
+
+    def _finish(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._wanted.pop(key, None)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,78 @@
+"""
+읽기/쓰기 라우팅 (읽기 전용 레플리카 + 프라이머리)
+- 쓰기는 항상 프라이머리, 읽기 헬퍼는 pick() 이 고른 연결 사용
+- 레플리카 지연(pg_last_xact_replay_timestamp 기준)을 check_interval 마다 1번 측정 -> max_lag 초과/접속 실패 시 프라이머리로 읽음
+- 자기 쓰기 읽기 보장: 쓰기(또는 다른 프로세스의 쓰기로 인한 캐시 무효화) 직후 sticky 초 동안 프라이머리에서 읽음
+  읽기 헬퍼는 모두 세션 간 공유 캐시를 채우므로 세션 단위가 아니라 프로세스 단위로 고정 (쓴 세션 + 지연된 값이 공유 캐시에 남는 것 방지)
+  레플리카 지연 <= max_lag 일 때만 레플리카를 쓰므로 sticky = max_lag + check_interval 이면 쓰기가 반영된 뒤에 레플리카로 돌아감
+- 증분 동기화 DeltaFrame 의 overlap(30초)보다 max_lag 가 작아야 워터마크 이전 변경분을 놓치지 않음
+- 로컬 구성 (Postgres 2개, 스트리밍 복제):
+    pg_basebackup -h <프라이머리 소켓 디렉터리> -U postgres -D /tmp/pgreplica -R -X stream
+    pg_ctl -D /tmp/pgreplica -o "-h '' -k /tmp/pgreplica" start
+    secrets.toml: [connections.supabase_replica] url = "postgresql+psycopg2://postgres@/postgres?host=/tmp/pgreplica"
+  지연 재현: 레플리카에서 SELECT pg_wal_replay_pause() / pg_wal_replay_resume()
+"""
+import threading
+import time
+
+from sqlalchemy import text
+
+# 스탠바이가 아니면(논리 복제 등) 지연 0, WAL 수신 중단이면 무한대, 수신분을 모두 재생했으면 0
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 'Infinity'::float8
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 'Infinity'::float8)
+    END
+"""
+
+
+class ReadRouter:
+    """primary / replica: .session 컨텍스트를 가진 연결 (st.connection(type="sql")), replica 가 None 이면 항상 primary"""
+
+    def __init__(self, primary, replica=None, max_lag=5.0, check_interval=2.0, sticky=None):
+        self.primary = primary
+        self.replica = replica
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky = sticky if sticky is not None else max_lag + check_interval
+        self._lag = None
+        self._checked_at = 0.0
+        self._last_write = float('-inf')
+        self._lock = threading.Lock()
+        self.stats = {'replica': 0, 'sticky': 0, 'stale': 0}
+
+    def note_write(self):
+        """쓰기/캐시 무효화 기록 -> sticky 초 동안 프라이머리에서 읽음"""
+        with self._lock:
+            self._last_write = time.monotonic()
+
+    def replica_lag(self):
+        """레플리카 지연(초), check_interval 동안 재사용 / 측정 실패 시 무한대"""
+        now = time.monotonic()
+        with self._lock:
+            if self._lag is not None and now - self._checked_at < self.check_interval: return self._lag
+            self._checked_at = now   # 측정 중 다른 스레드는 직전 값 사용
+        try:
+            with self.replica.session as s:
+                lag = float(s.execute(text(REPLICA_LAG_SQL)).scalar())
+        except Exception:
+            lag = float('inf')
+        with self._lock:
+            self._lag = lag
+        return lag
+
+    def pick(self):
+        """읽기 연결 선택: 레플리카 미설정 / 최근 쓰기 / 레플리카 지연 초과 -> 프라이머리"""
+        if self.replica is None: return self.primary
+        with self._lock:
+            recent = time.monotonic() - self._last_write < self.sticky
+        if recent:
+            self.stats['sticky'] += 1
+            return self.primary
+        if self.replica_lag() > self.max_lag:
+            self.stats['stale'] += 1
+            return self.primary
+        self.stats['replica'] += 1
+        return self.replica
@@ -0,0 +1,235 @@
+"""
+로컬 컬럼형 스냅샷 (Arrow IPC 파일, 메모리 매핑 로드)
+- 앱: 기동 시 스냅샷으로 증분 동기화 캐시(DeltaFrame)를 채우고, 이후에는 워터마크 이후 변경분만 DB에서 조회
+- SnapshotWorker: 백그라운드 스레드가 주기적으로 증분 동기화 후 변경이 있을 때만 스냅샷 재기록 (임시 파일 -> 원자적 교체)
+  작은 테이블(품목)은 기동 시 1번 + 변경 알림(reload) 시 전체 재조회 후 재기록
+- CLI: 운영 DB 접속 없이 스냅샷을 조회/추출
+    python snapshot.py list
+    python snapshot.py show import_schedules --query "status == 'PENDING'" --columns ck_code,product_name,expected_date
+    python snapshot.py export import_schedules ledger.parquet
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+
+SNAPSHOT_DIR = os.environ.get('CK_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.snapshot'))
+META_KEY = b'ck_snapshot'
+
+
+def snapshot_path(name, snapshot_dir=None):
+    return os.path.join(snapshot_dir or SNAPSHOT_DIR, f"{name}.arrow")
+
+
+def _iso(dt):
+    return dt.isoformat() if dt is not None else None
+
+
+def _parse_iso(val):
+    return datetime.fromisoformat(val) if val else None
+
+
+def save_frame(name, df, row_watermark=None, tomb_watermark=None, synced_at=None, snapshot_dir=None):
+    """DataFrame -> Arrow IPC 스냅샷 (JSON 컬럼은 문자열로 직렬화, 메타데이터에 워터마크 기록)"""
+    path = snapshot_path(name, snapshot_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    out = df.copy(deep=False)
+    json_cols = []
+    for c in out.columns:
+        if out[c].dtype != object: continue
+        sample = out[c].dropna()
+        if not sample.empty and isinstance(sample.iloc[0], (list, dict)):
+            out[c] = [json.dumps(v, ensure_ascii=False) if isinstance(v, (list, dict)) else None for v in out[c]]
+            json_cols.append(c)
+
+    table = pa.Table.from_pandas(out, preserve_index=False)
+    meta = {
+        'row_watermark': _iso(row_watermark), 'tomb_watermark': _iso(tomb_watermark),
+        'synced_at': _iso(synced_at), 'saved_at': _iso(datetime.now(timezone.utc)),
+        'json_cols': json_cols, 'rows': len(out),
+    }
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), META_KEY: json.dumps(meta).encode()})
+
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_meta(name, snapshot_dir=None):
+    path = snapshot_path(name, snapshot_dir)
+    if not os.path.exists(path): return None
+    with pa.memory_map(path, 'r') as src:
+        schema = pa.ipc.open_file(src).schema
+    return json.loads((schema.metadata or {}).get(META_KEY, b'{}'))
+
+
+def load_frame(name, snapshot_dir=None):
+    """메모리 매핑으로 스냅샷 로드 -> (DataFrame, 메타데이터), 없거나 손상 시 (None, None)"""
+    path = snapshot_path(name, snapshot_dir)
+    if not os.path.exists(path): return None, None
+    try:
+        with pa.memory_map(path, 'r') as src:
+            table = pa.ipc.open_file(src).read_all()
+            meta = json.loads((table.schema.metadata or {}).get(META_KEY, b'{}'))
+            df = table.to_pandas()
+    except Exception:
+        return None, None
+
+    # DB 조회 결과와 같은 값 형태로 복원 (NUMERIC 결측 -> None, JSONB -> list)
+    for c in df.columns:
+        if df[c].dtype == float and df[c].isna().any():
+            df[c] = df[c].astype(object).where(df[c].notna(), None)
+    for c in meta.get('json_cols', []):
+        df[c] = [json.loads(v) if isinstance(v, str) else v for v in df[c]]
+    meta['row_watermark'] = _parse_iso(meta.get('row_watermark'))
+    meta['tomb_watermark'] = _parse_iso(meta.get('tomb_watermark'))
+    meta['synced_at'] = _parse_iso(meta.get('synced_at'))
+    return df, meta
+
+
+def seed_delta_frame(frame, name, snapshot_dir=None):
+    """스냅샷이 있으면 DeltaFrame 초기화 (True: 스냅샷 사용)"""
+    df, meta = load_frame(name, snapshot_dir)
+    if df is None or not meta or not meta.get('row_watermark') or not meta.get('synced_at'): return False
+    frame.seed(df, meta['row_watermark'], meta['tomb_watermark'] or meta['row_watermark'], meta['synced_at'])
+    return True
+
+
+class SnapshotWorker:
+    """주기적 증분 동기화 + 변경 시 스냅샷 재기록 (프로세스당 1개, 데몬 스레드)"""
+
+    def __init__(self, interval=60.0, snapshot_dir=None):
+        self.interval = interval
+        self.snapshot_dir = snapshot_dir
+        self._frames = []   # (name, DeltaFrame, session_factory)
+        self._extras = []   # (name, load_fn) - 작은 테이블 전체 스냅샷
+        self._dirty = set()
+        self._written = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add_frame(self, name, frame, session_factory):
+        self._frames.append((name, frame, session_factory))
+        return self
+
+    def add_table(self, name, load_fn):
+        """load_fn() -> DataFrame 전체 스냅샷 (기동 시 1번, 이후 reload(name) 때만 재기록)"""
+        self._extras.append((name, load_fn))
+        with self._lock: self._dirty.add(name)
+        return self
+
+    def reload(self, name):
+        """변경 알림 -> 다음 주기를 기다리지 않고 전체 재조회 후 재기록"""
+        with self._lock: self._dirty.add(name)
+        self._wake.set()
+
+    def start(self):
+        if self._thread and self._thread.is_alive(): return self
+        self._thread = threading.Thread(target=self._run, name="ck-snapshot", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def run_once(self):
+        for name, frame, session_factory in self._frames:
+            try:
+                with session_factory() as s:
+                    frame.refresh(s)
+                df, row_wm, tomb_wm, synced_at, version = frame.state()
+                if df is None or self._written.get(name) == version: continue
+                save_frame(name, df, row_wm, tomb_wm, synced_at, self.snapshot_dir)
+                self._written[name] = version
+            except Exception:
+                pass
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        for name, load_fn in self._extras:
+            if name not in dirty: continue
+            try:
+                df = load_fn()
+                if df is not None: save_frame(name, df, synced_at=datetime.now(timezone.utc), snapshot_dir=self.snapshot_dir)
+            except Exception:
+                with self._lock: self._dirty.add(name)  # 다음 주기에 재시도
+
+    def _run(self):
+        self.run_once()
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set(): break
+            self.run_once()
+
+
+# ==========================================
+# CLI (오프라인 분석용)
+# ==========================================
+
+def _cli(argv=None):
+    parser = argparse.ArgumentParser(description="CK 수입/수출 로컬 스냅샷 조회 (운영 DB 비접속)")
+    parser.add_argument('--dir', default=None, help=f"스냅샷 디렉터리 (기본: {SNAPSHOT_DIR})")
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    sub.add_parser('list', help="스냅샷 목록")
+    p_show = sub.add_parser('show', help="스냅샷 조회")
+    p_show.add_argument('name')
+    p_show.add_argument('--query', help="pandas DataFrame.query 식")
+    p_show.add_argument('--columns', help="쉼표로 구분한 컬럼 목록")
+    p_show.add_argument('--head', type=int, default=50)
+    p_exp = sub.add_parser('export', help="스냅샷을 parquet/csv/xlsx 파일로 추출")
+    p_exp.add_argument('name')
+    p_exp.add_argument('out')
+    p_exp.add_argument('--query')
+    args = parser.parse_args(argv)
+
+    snap_dir = args.dir or SNAPSHOT_DIR
+    if args.cmd == 'list':
+        if not os.path.isdir(snap_dir):
+            print(f"스냅샷 없음: {snap_dir}"); return 1
+        for fn in sorted(os.listdir(snap_dir)):
+            if not fn.endswith('.arrow'): continue
+            name = fn[:-len('.arrow')]
+            meta = read_meta(name, snap_dir) or {}
+            print(f"{name:<24} rows={meta.get('rows', '?'):<8} saved_at={meta.get('saved_at')}  watermark={meta.get('row_watermark')}")
+        return 0
+
+    df, meta = load_frame(args.name, snap_dir)
+    if df is None:
+        print(f"스냅샷을 찾을 수 없습니다: {snapshot_path(args.name, snap_dir)}"); return 1
+    if args.query: df = df.query(args.query)
+
+    if args.cmd == 'show':
+        if args.columns: df = df[[c.strip() for c in args.columns.split(',')]]
+        with pd.option_context('display.max_columns', 30, 'display.width', 200):
+            print(df.head(args.head).to_string(index=False))
+        print(f"\n{len(df)} rows (saved_at={meta.get('saved_at')})")
+        return 0
+
+    out = args.out
+    json_cols = meta.get('json_cols', [])
+    if json_cols: df = df.assign(**{c: [json.dumps(v, ensure_ascii=False) for v in df[c]] for c in json_cols})
+    if out.endswith('.parquet'): df.to_parquet(out, index=False)
+    elif out.endswith('.csv'): df.to_csv(out, index=False, encoding='utf-8-sig')
+    elif out.endswith('.xlsx'):
+        for c in df.select_dtypes(include=['datetimetz']).columns: df[c] = df[c].dt.tz_localize(None)
+        df.to_excel(out, index=False)
+    else:
+        print("지원 형식: .parquet / .csv / .xlsx"); return 1
+    print(f"{len(df)} rows -> {out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(_cli())
@@ -0,0 +1,82 @@
+"""
+탭별 rerun 소요 시간 측정 (streamlit.testing.v1.AppTest)
+    python tools/bench_rerun.py [--script impot_app.py] [--runs 10]
+- ~/.streamlit 또는 ./.streamlit/secrets.toml 의 [connections.supabase] 설정 사용
+- 탭마다 1회 진입(캐시 예열) 후 같은 탭에서 rerun 을 runs 회 반복해 중앙값 / p95 / 최대값(ms) 출력
+- --switch: 탭을 순서대로 이동하는 시간 측정 (매 순회 시작 시 st.cache_data 전체 clear, 이동 사이 --think 초 대기)
+    CK_PREFETCH_WORKERS=0 python tools/bench_rerun.py --switch   # 선조회 끄고 비교
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _pct(samples, q):
+    return samples[min(len(samples) - 1, int(round(q * (len(samples) - 1))))]
+
+
+def _print(results):
+    print(f"{'탭':<28}{'median(ms)':>12}{'p95(ms)':>10}{'max(ms)':>10}")
+    for tab, med, p95, mx in results:
+        print(f"{tab:<28}{med:>12.1f}{p95:>10.1f}{mx:>10.1f}")
+
+
+def bench_switch(script, runs, timeout, think):
+    at = AppTest.from_file(script, default_timeout=timeout)
+    at.run()
+    nav = [r for r in at.radio if r.key == "nav_menu"]
+    if not nav:
+        print("nav_menu 라디오를 찾을 수 없습니다."); return 1
+    options = list(nav[0].options)
+    samples = {tab: [] for tab in options}
+    for _ in range(runs):
+        st.cache_data.clear()
+        for tab in options[1:] + options[:1]:
+            time.sleep(think)
+            t0 = time.perf_counter()
+            [r for r in at.radio if r.key == "nav_menu"][0].set_value(tab).run()
+            samples[tab].append((time.perf_counter() - t0) * 1000)
+            if at.exception: print(f"{tab}: 오류 {at.exception[0].value}")
+    _print([(tab, statistics.median(v), _pct(sorted(v), 0.95), max(v)) for tab, v in samples.items()])
+    return 0
+
+
+def bench(script, runs, timeout):
+    at = AppTest.from_file(script, default_timeout=timeout)
+    at.run()
+    nav = [r for r in at.radio if r.key == "nav_menu"]
+    if not nav:
+        print("nav_menu 라디오를 찾을 수 없습니다."); return 1
+    results = []
+    for tab in nav[0].options:
+        [r for r in at.radio if r.key == "nav_menu"][0].set_value(tab).run()
+        if at.exception:
+            print(f"{tab}: 오류 {at.exception[0].value}"); continue
+        samples = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - t0) * 1000)
+        samples.sort()
+        results.append((tab, statistics.median(samples), _pct(samples, 0.95), samples[-1]))
+    _print(results)
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="탭별 rerun 시간 측정")
+    parser.add_argument('--script', default=os.path.join(ROOT, 'impot_app.py'))
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--switch', action='store_true', help="탭 이동 시간 측정")
+    parser.add_argument('--think', type=float, default=1.0, help="--switch 탭 이동 사이 대기(초)")
+    args = parser.parse_args()
+    if args.switch: sys.exit(bench_switch(args.script, args.runs, args.timeout, args.think))
+    sys.exit(bench(args.script, args.runs, args.timeout))
@@ -0,0 +1,195 @@
+"""
+핫 SQL 실행 계획 회귀 검사 (EXPLAIN (ANALYZE, FORMAT JSON))
+    python tools/check_query_plans.py                        # 합성 데이터 20000건 시드 -> 검사 -> 정리
+    python tools/check_query_plans.py --seed-rows 0          # 현재 DB 데이터 그대로 검사 (운영 복제본 등)
+    python tools/check_query_plans.py --show ledger_full     # 지정한 검사만 실행 + 실행 계획 트리 출력 (이름 없이 --show 면 전체)
+- 검사 대상은 db / delta_sync / ledger_export 모듈이 실제로 실행하는 SQL (모듈 상수·SQL 생성 함수 재사용 -> 쿼리 변경이 그대로 검사됨)
+- 실패 조건
+  1) 허용 목록 밖 테이블의 Seq Scan 이 --seq-rows 행 초과 조회 (조회 행 = (반환 + 필터 제거) × 반복 횟수)
+     운영 테이블/품목 Seq Scan 은 전체 조회(장부/내보내기/잔량)와 해시 조인 상대로만 허용 (운영 테이블 크기는 보관 작업이 제한)
+     필터 대상 테이블(통관일, CK관리번호, updated_at, import_id, 재고 lot)과 서브쿼리는 인덱스 필수
+  2) 서버 실행 시간(Execution Time) 중앙값이 예산(ms × --budget-scale) 초과 - 예산은 기본 시드 규모 기준
+- 종료 코드: 0 통과 / 1 회귀 -> 스키마(부트스트랩 ALTER 목록)·쿼리 변경 후 실행
+- DB 접속: 앱과 같은 secrets.toml [connections.supabase] (db 모듈 import, 스키마 부트스트랩 포함)
+- 검사는 1개 트랜잭션 안에서 실행 후 롤백 (EXPLAIN ANALYZE 는 DELETE 도 실제 실행하므로)
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db
+import delta_sync
+import load_test
+from ledger_export import ledger_sql
+
+IMP = 'import_schedules'
+FULL_SCAN_OK = {IMP, 'products'}
+
+
+# ==========================================
+# 합성 데이터 (load_test 시드 + 삼각무역 / 통관 / 재고)
+# ==========================================
+
+def seed(engine, rows):
+    """수입/수출 일정(load_test.seed, 최근 5년) + 수입 50건당 삼각무역 태그 1건, 통관 1~3건, 도착 건 재고 1행"""
+    load_test.seed(engine, rows, years=5)
+    pid = load_test.ensure_product(engine)
+    rnd = random.Random(7)
+    with engine.begin() as c:
+        imp = c.execute(text(f"SELECT id, ck_code, expected_date, quantity, status FROM {IMP} WHERE ck_code LIKE :p ORDER BY id"),
+                        {"p": f"{load_test.LT_PREFIX}%"}).fetchall()
+        tri = [{"iid": r[0], "ck": r[1]} for r in imp[::50]]
+        c.execute(text("INSERT INTO triangular_trades (import_id, ck_code, importer) VALUES (:iid, :ck, 'LT')"), tri)
+        clr = [{"t": IMP, "sid": r[0], "seq": k + 1, "d": r[2] + timedelta(days=rnd.randint(0, 30)),
+                "q": float(r[3]) / 3, "r": round(rnd.uniform(1200, 1450), 2)}
+               for r in imp for k in range(rnd.randint(1, 3))]
+        c.execute(text("""
+            INSERT INTO schedule_clearances (table_name, schedule_id, seq, clearance_date, qty, rate)
+            VALUES (:t, :sid, :seq, :d, :q, :r)
+        """), clr)
+        stock = 0
+        if c.execute(text("SELECT to_regclass('stock_by_lot') IS NOT NULL")).scalar():
+            lots = [{"pid": pid, "lot": r[2].strftime('%Y-%m-%d'), "qty": r[3], "ed": r[2], "note": f"수입도착({r[1]}) LT"}
+                    for r in imp if r[4] == 'ARRIVED']
+            c.execute(text("""
+                INSERT INTO stock_by_lot (product_id, lot_number, quantity, entry_date, note, is_cleared)
+                VALUES (:pid, :lot, :qty, :ed, :note, FALSE)
+            """), lots)
+            stock = len(lots)
+    print(f"seed: triangular_trades {len(tri)}건, schedule_clearances {len(clr)}건, stock_by_lot {stock}건")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as c:
+        for tbl in ('import_schedules', 'export_schedules', 'triangular_trades', 'schedule_clearances', 'schedule_tombstones'):
+            c.execute(text(f"VACUUM ANALYZE {tbl}"))
+        if stock: c.execute(text("VACUUM ANALYZE stock_by_lot"))
+
+
+def sample_params(c):
+    """검사 파라미터용 실제 값 (태그가 있는 수입 건, CK관리번호 200개, 재고 lot)"""
+    now = c.execute(text("SELECT NOW()")).scalar()
+    iid = c.execute(text("SELECT import_id FROM triangular_trades WHERE import_id IS NOT NULL ORDER BY id DESC LIMIT 1")).scalar()
+    keys = [r[0] for r in c.execute(text(f"SELECT ck_code FROM {IMP} WHERE ck_code IS NOT NULL ORDER BY id DESC LIMIT 200"))]
+    lot = None
+    if c.execute(text("SELECT to_regclass('stock_by_lot') IS NOT NULL")).scalar():
+        lot = c.execute(text("SELECT product_id, lot_number, quantity FROM stock_by_lot WHERE is_cleared = FALSE ORDER BY stock_id DESC LIMIT 1")).fetchone()
+    return {"now": now, "import_id": iid or 0, "keys": keys or ['-'], "lot": lot}
+
+
+# ==========================================
+# 검사 목록 (이름, SQL, 파라미터, Seq Scan 허용 테이블, 예산 ms)
+# ==========================================
+
+def build_checks(p):
+    """증분 동기화 검사는 정상 상태(마지막 동기화 이후 변경 없음) 기준 - 워터마크 = 현재 시각"""
+    today = date.today()
+    checks = [
+        ('ledger_full', db.schedule_select_sql(IMP), {}, FULL_SCAN_OK, 400),
+        ('ledger_delta', db.schedule_select_sql(IMP) + " WHERE s.updated_at > :wm", {"wm": p['now']}, {'products'}, 20),
+        ('ledger_tombstones', delta_sync.TOMBSTONES_SINCE_SQL, {"t": IMP, "wm": p['now']}, set(), 20),
+        ('ledger_export', ledger_sql(IMP), {}, FULL_SCAN_OK, 400),
+        ('eta_board', db.eta_board_sql(IMP), {}, FULL_SCAN_OK, 400),
+        ('clearance_balance', db.clearance_balance_sql(IMP), {"t": IMP}, FULL_SCAN_OK | {'schedule_clearances'}, 400),
+        ('clearances_between', db.clearances_between_sql(IMP), {"t": IMP, "df": today - timedelta(days=30), "dt": today}, FULL_SCAN_OK, 50),
+        ('preview_lookup', db.preview_lookup_sql(IMP), {"keys": p['keys']}, {'products'}, 50),
+        ('triangular_by_import', db.TRIANGULAR_BY_IMPORT_SQL, {"id": p['import_id']}, set(), 20),
+    ]
+    if p['lot'] is not None:
+        pid, lot, qty = p['lot']
+        checks += [
+            ('stock_lot_check', db.STOCK_LOT_CHECK_SQL, {"pid": pid, "lot": lot, "qty": qty}, set(), 20),
+            ('stock_lot_delete', db.STOCK_LOT_DELETE_SQL, {"pid": pid, "lot": lot, "note": "수입도착(-)%"}, set(), 20),
+        ]
+    return checks
+
+
+# ==========================================
+# 실행 계획 분석
+# ==========================================
+
+def walk(node, depth=0):
+    yield node, depth
+    for child in node.get('Plans', []):
+        yield from walk(child, depth + 1)
+
+
+def scanned_rows(node):
+    return (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * max(node.get('Actual Loops', 1), 1)
+
+
+def explain(c, sql, params):
+    plan = c.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()
+    plan = plan[0] if isinstance(plan, list) else plan
+    return plan['Plan'], plan['Execution Time']
+
+
+def seq_violations(plan, allowed, limit):
+    return [(n['Relation Name'], int(scanned_rows(n))) for n, _ in walk(plan)
+            if n['Node Type'] == 'Seq Scan' and n.get('Relation Name') not in allowed and scanned_rows(n) > limit]
+
+
+def print_plan(plan):
+    for n, depth in walk(plan):
+        rel = f" on {n['Relation Name']}" if 'Relation Name' in n else ""
+        idx = f" using {n['Index Name']}" if 'Index Name' in n else ""
+        print(f"  {'  ' * depth}-> {n['Node Type']}{rel}{idx}  rows={n.get('Actual Rows')} loops={n.get('Actual Loops')}"
+              f" removed={n.get('Rows Removed by Filter', 0)} time={n.get('Actual Total Time')}ms")
+
+
+def run_checks(engine, args):
+    failures = []
+    with engine.connect() as c:
+        p = sample_params(c)
+        checks = build_checks(p)
+        if args.show: checks = [ch for ch in checks if ch[0] in args.show]
+        print(f"\n{'검사':<22}{'실행(ms)':>10}{'예산(ms)':>10}  Seq Scan 위반")
+        for name, sql, params, allowed, budget in checks:
+            times, plan = [], None
+            for _ in range(args.repeat):
+                plan, ms = explain(c, sql, params)
+                times.append(ms)
+            ms, limit = statistics.median(times), budget * args.budget_scale
+            bad = seq_violations(plan, allowed, args.seq_rows)
+            problems = [f"Seq Scan {rel} {rows}행" for rel, rows in bad] + ([f"예산 초과 {ms:.1f} > {limit:.0f}ms"] if ms > limit else [])
+            print(f"{name:<22}{ms:>10.1f}{limit:>10.0f}  {', '.join(problems) or '-'}")
+            if args.show is not None: print_plan(plan)
+            if problems: failures.append((name, problems))
+        c.rollback()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핫 SQL 실행 계획 회귀 검사")
+    parser.add_argument('--seed-rows', type=int, default=20000, help="합성 수입 건 수 (수출은 1/5), 0 이면 시드 없이 현재 데이터로 검사")
+    parser.add_argument('--seq-rows', type=int, default=1000, help="허용 목록 밖 Seq Scan 조회 행 한도")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="실행 시간 예산 배율 (느린 CI 장비)")
+    parser.add_argument('--repeat', type=int, default=3, help="검사별 실행 횟수 (중앙값 사용)")
+    parser.add_argument('--show', nargs='*', help="실행 계획 트리 출력 (검사 이름을 주면 그 검사만 실행)")
+    parser.add_argument('--keep', action='store_true', help="검사 후 합성 데이터 유지 (정리: tools/load_test.py --cleanup)")
+    args = parser.parse_args()
+
+    db.bootstrap_schema()
+    engine = db.conn.engine
+    try:
+        if args.seed_rows > 0: seed(engine, args.seed_rows)
+        failures = run_checks(engine, args)
+    finally:
+        if args.seed_rows > 0 and not args.keep: load_test.cleanup(engine)
+
+    if failures:
+        print(f"\n실행 계획 회귀 {len(failures)}건")
+        for name, problems in failures:
+            print(f"  {name}: {'; '.join(problems)}")
+        return 1
+    print("\n모든 검사 통과")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,467 @@
+"""
+동시 접속 부하 테스트 (rerun 지연 / DB 커넥션 포화도)
+    python tools/load_test.py --seed-rows 5000 --sessions 10 --iterations 3
+    python tools/load_test.py --cleanup          # 부하 테스트 데이터(CK 'LT-' 접두어) 삭제
+    python tools/load_test.py --seed-rows 20000 --seed-years 5 --sessions 3   # 누적 장부(대부분 마감 건) 재현
+- 앱을 별도 streamlit 서버 프로세스로 띄우고, 세션 N개를 웹소켓 클라이언트(브라우저와 같은 BackMsg/ForwardMsg 프로토콜)로 동시에 구동
+  (AppTest 는 실행마다 전역 Runtime 을 교체하므로 한 프로세스에서 동시 실행 불가 -> 실제 서버처럼 캐시/커넥션 풀을 공유하는 방식으로 측정)
+- 세션별 흐름: 수입장부 열기 -> 행 선택(등록/관리로 이동) -> 상세 폼 저장 -> 엑셀 업로드 미리보기/등록 -> 수출 그리드 수정 저장
+- rerun 지연: rerun 요청 전송 ~ script_finished 수신 (st.rerun 으로 이어지는 재실행 포함), 단계별 / 전체 p50 / p95 / p99
+- DB 포화도: pg_stat_activity 를 주기적으로 샘플링해 앱 커넥션 수(전체/active/락 대기) 최대·평균, 풀 한도 도달 비율 출력
+- DB 접속 정보: --db-url 또는 .streamlit/secrets.toml 의 [connections.supabase] url
+- 필요 패키지: websockets (streamlit 서버 의존성으로 설치됨)
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tomllib
+import urllib.request
+import uuid
+from datetime import date, timedelta
+
+import pandas as pd
+import websockets
+from sqlalchemy import create_engine, text
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LT_PREFIX = 'LT-'
+LT_PRODUCT = ('LT-PROD', 'LT 부하테스트 품목')
+WIDGET_TYPES = ('button', 'radio', 'text_input', 'file_uploader', 'dataframe', 'selectbox', 'toggle', 'checkbox')
+# st.connection(type="sql") 기본 풀: pool_size 5 + max_overflow 10
+POOL_SIZE, POOL_MAX = 5, 15
+
+
+# ==========================================
+# DB: 합성 데이터 / 정리 / 포화도 샘플링
+# ==========================================
+
+def load_db_url(cli_url):
+    if cli_url: return cli_url
+    for path in (os.path.join(ROOT, '.streamlit', 'secrets.toml'), os.path.expanduser('~/.streamlit/secrets.toml')):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                url = tomllib.load(f).get('connections', {}).get('supabase', {}).get('url')
+            if url: return url
+    raise SystemExit("DB 접속 정보가 없습니다: --db-url 또는 .streamlit/secrets.toml [connections.supabase] url")
+
+
+def ensure_product(engine):
+    with engine.begin() as c:
+        pid = c.execute(text("SELECT product_id FROM products WHERE product_code = :c"), {"c": LT_PRODUCT[0]}).scalar()
+        if pid is None:
+            pid = c.execute(text("""
+                INSERT INTO products (product_code, product_name, category, unit, is_active)
+                VALUES (:c, :n, 'LT', 'kg', TRUE) RETURNING product_id
+            """), {"c": LT_PRODUCT[0], "n": LT_PRODUCT[1]}).scalar()
+    return pid
+
+
+def seed(engine, rows, years=0):
+    """수입 rows 건 + 수출 rows/5 건 합성 데이터 (CK 'LT-' 접두어)
+    years > 0: ETA 를 최근 years 년에 고르게 분포 (90일 지난 건은 대부분 ARRIVED, 일부 CANCELED - 누적 장부 재현)
+               도착 후 90일 지난 건은 대부분 결제/통관 완료 (잔액 없음 -> 보관 대상), 일부는 잔액이 남은 채로 둠"""
+    pid = ensure_product(engine)
+    rnd, today = random.Random(42), date.today()
+    suppliers, banks = ['ACME', 'BETA', 'GAMMA', 'DELTA', 'OMEGA'], ['KB', 'SH', 'WR', 'HN', 'NH']
+
+    def eta_status():
+        eta = today + timedelta(days=rnd.randint(-years * 365, 90) if years else rnd.randint(-60, 90))
+        if (today - eta).days > 90: return eta, rnd.choice(['ARRIVED'] * 9 + ['CANCELED'])
+        return eta, rnd.choice(['PENDING'] * 3 + ['ARRIVED', 'CANCELED'])
+
+    for table, n in (('import_schedules', rows), ('export_schedules', max(1, rows // 5))):
+        batch = []
+        for i in range(n):
+            eta, status = eta_status()
+            qty, price = rnd.randint(10, 5000), round(rnd.uniform(0.5, 30), 2)
+            settled = status == 'ARRIVED' and (today - eta).days > 90 and rnd.random() < 0.9
+            batch.append({
+                "pid": pid, "ck": f"{LT_PREFIX}{table[:3].upper()}-{i:06d}", "eta": eta,
+                "qty": qty, "price": price, "status": status,
+                "sup": rnd.choice(suppliers), "bank": rnd.choice(banks),
+                "settled": settled,
+                "clr": json.dumps([{'date': eta.isoformat(), 'qty': qty, 'rate': 1300}] if settled else []),
+            })
+        with engine.begin() as c:
+            c.execute(text(f"""
+                INSERT INTO {table} (product_id, ck_code, expected_date, quantity, open_qty, unit_price, open_amount, status, supplier, bank,
+                                     payment_amount, clearance_info, declaration_info)
+                VALUES (:pid, :ck, :eta, :qty, :qty, :price, :qty * :price, :status, :sup, :bank,
+                        CASE WHEN :settled THEN :qty * :price END, CAST(:clr AS JSONB), '[]'::jsonb)
+            """), batch)
+            # 통관 자식 테이블 (save_schedule 의 sync_schedule_children 과 같은 내용)
+            c.execute(text(f"""
+                INSERT INTO schedule_clearances (table_name, schedule_id, seq, clearance_date, qty, rate)
+                SELECT :t, s.id, e.ord, CAST(e.item->>'date' AS DATE), CAST(e.item->>'qty' AS NUMERIC), CAST(e.item->>'rate' AS NUMERIC)
+                FROM {table} s, jsonb_array_elements(s.clearance_info) WITH ORDINALITY AS e(item, ord)
+                WHERE s.ck_code LIKE :p AND jsonb_array_length(s.clearance_info) > 0
+            """), {"t": table, "p": f"{LT_PREFIX}{table[:3].upper()}-%"})
+        print(f"seed: {table} {n}건")
+
+
+def cleanup(engine):
+    """부하 테스트 데이터 삭제 (묘비 기록 -> 실행 중인 앱 캐시/스냅샷에도 반영)
+    삼각무역 태그(CK 'LT-'), 부하 테스트 품목의 재고(stock_by_lot, 있을 때만)도 삭제"""
+    with engine.begin() as c:
+        tri = c.execute(text("DELETE FROM triangular_trades WHERE ck_code LIKE :p"), {"p": f"{LT_PREFIX}%"}).rowcount
+        if tri:
+            c.execute(text("SELECT pg_notify('ck_cache_invalidate', :p)"), {"p": json.dumps({"table": 'triangular_trades'})})
+            print(f"cleanup: triangular_trades {tri}건 삭제")
+        if c.execute(text("SELECT to_regclass('stock_by_lot') IS NOT NULL")).scalar():
+            stock = c.execute(text("""
+                DELETE FROM stock_by_lot WHERE product_id = (SELECT product_id FROM products WHERE product_code = :c)
+            """), {"c": LT_PRODUCT[0]}).rowcount
+            if stock: print(f"cleanup: stock_by_lot {stock}건 삭제")
+        for table in ('import_schedules', 'export_schedules'):
+            ids = [r[0] for r in c.execute(text(f"DELETE FROM {table} WHERE ck_code LIKE :p RETURNING id"), {"p": f"{LT_PREFIX}%"})]
+            if c.execute(text("SELECT to_regclass(:t) IS NOT NULL"), {"t": f"{table}_archive"}).scalar():
+                ids += [r[0] for r in c.execute(text(f"DELETE FROM {table}_archive WHERE ck_code LIKE :p RETURNING id"), {"p": f"{LT_PREFIX}%"})]
+            if not ids: continue
+            c.execute(text("DELETE FROM schedule_clearances WHERE table_name = :t AND schedule_id = ANY(:ids)"), {"t": table, "ids": ids})
+            c.execute(text("DELETE FROM schedule_declarations WHERE table_name = :t AND schedule_id = ANY(:ids)"), {"t": table, "ids": ids})
+            c.execute(text("INSERT INTO schedule_tombstones (table_name, row_id) SELECT :t, unnest(CAST(:ids AS BIGINT[]))"), {"t": table, "ids": ids})
+            c.execute(text("SELECT pg_notify('ck_cache_invalidate', :p)"), {"p": json.dumps({"table": table})})
+            print(f"cleanup: {table} {len(ids)}건 삭제")
+
+
+class ConnSampler(threading.Thread):
+    """pg_stat_activity 주기 샘플링 (이 도구 자신의 커넥션 제외)"""
+
+    def __init__(self, engine, interval=0.1):
+        super().__init__(daemon=True)
+        self.engine, self.interval = engine, interval
+        self.samples = []   # (total, active, lock_wait)
+        self._halt = threading.Event()
+
+    def run(self):
+        with self.engine.connect() as c:
+            while not self._halt.is_set():
+                row = c.execute(text("""
+                    SELECT COUNT(*),
+                           COUNT(*) FILTER (WHERE state = 'active'),
+                           COUNT(*) FILTER (WHERE wait_event_type = 'Lock')
+                    FROM pg_stat_activity
+                    WHERE datname = current_database() AND backend_type = 'client backend'
+                      AND pid <> pg_backend_pid() AND query NOT ILIKE 'LISTEN%'
+                """)).fetchone()
+                self.samples.append(tuple(row))
+                c.rollback()
+                self._halt.wait(self.interval)
+
+    def stop(self):
+        self._halt.set()
+        if self.is_alive(): self.join()
+
+
+# ==========================================
+# 웹소켓 세션 클라이언트
+# ==========================================
+
+class Session:
+    """브라우저 1개 흉내: 위젯 상태를 보관하고 rerun 마다 전송, script_finished 까지 대기"""
+
+    def __init__(self, base_url, name, timeout):
+        self.base_url, self.name, self.timeout = base_url, name, timeout
+        self.ws = None
+        self.session_id = None
+        self.page_hash = ''
+        self.widgets = {}     # widget id -> (타입, 라벨, element proto)
+        self.states = {}      # widget id -> 유지할 WidgetState (값 위젯)
+        self.errors = []
+        self.latencies = []   # (단계, ms)
+
+    async def connect(self):
+        ws_url = self.base_url.replace('http', 'ws', 1) + '/_stcore/stream'
+        self.ws = await websockets.connect(ws_url, subprotocols=['streamlit'], max_size=None, open_timeout=self.timeout)
+        await self.rerun('접속')
+
+    async def close(self):
+        if self.ws is not None: await self.ws.close()
+
+    # --- 위젯 탐색 ---
+    def find(self, wtype, label=None, key=None):
+        for wid, (t, lab, _) in self.widgets.items():
+            if t != wtype: continue
+            if key is not None and not wid.endswith(f"-{key}"): continue
+            if label is not None and label not in lab: continue
+            return wid
+        return None
+
+    def find_prefix(self, wtype, key_prefix):
+        return [wid for wid, (t, _, _) in self.widgets.items() if t == wtype and f"-{key_prefix}" in wid]
+
+    # --- rerun ---
+    async def rerun(self, step, triggers=(), values=None):
+        """values: {widget_id: WidgetState 설정 함수} (유지), triggers: 이번 실행만 True 인 버튼 id"""
+        for wid, setter in (values or {}).items():
+            ws = WidgetState(id=wid)
+            setter(ws)
+            self.states[wid] = ws
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = self.page_hash
+        for ws in self.states.values():
+            msg.rerun_script.widget_states.widgets.add().CopyFrom(ws)
+        for wid in triggers:
+            w = msg.rerun_script.widget_states.widgets.add()
+            w.id, w.trigger_value = wid, True
+
+        t0 = time.perf_counter()
+        self.widgets = {}
+        await self.ws.send(msg.SerializeToString())
+        await self._until_finished(step)
+        self.latencies.append((step, (time.perf_counter() - t0) * 1000))
+
+    async def _until_finished(self, step):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), timeout=max(0.1, deadline - time.monotonic()))
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof('type')
+            if kind == 'new_session':
+                self.session_id = fwd.new_session.initialize.session_id or self.session_id
+                self.page_hash = fwd.new_session.page_script_hash or self.page_hash
+                self.widgets = {}
+            elif kind == 'delta' and fwd.delta.WhichOneof('type') == 'new_element':
+                el = fwd.delta.new_element
+                etype = el.WhichOneof('type')
+                if etype == 'exception':
+                    self.errors.append(f"{step}: {el.exception.type}: {el.exception.message[:200]}")
+                elif etype in WIDGET_TYPES:
+                    w = getattr(el, etype)
+                    if getattr(w, 'id', ''): self.widgets[w.id] = (etype, getattr(w, 'label', ''), w)
+            elif kind == 'script_finished':
+                # st.rerun() 으로 이어지는 재실행은 같은 사용자 동작의 일부로 포함
+                if fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN: return
+
+    # --- 파일 업로드 (브라우저와 같은 2단계: URL 발급 -> PUT) ---
+    async def upload(self, filename, content):
+        req_id = uuid.uuid4().hex
+        msg = BackMsg()
+        msg.file_urls_request.request_id = req_id
+        msg.file_urls_request.file_names.append(filename)
+        msg.file_urls_request.session_id = self.session_id
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await asyncio.wait_for(self.ws.recv(), timeout=self.timeout))
+            if fwd.WhichOneof('type') == 'file_urls_response' and fwd.file_urls_response.response_id == req_id: break
+        info = fwd.file_urls_response.file_urls[0]
+        url = info.upload_url if info.upload_url.startswith('http') else self.base_url + info.upload_url
+        await asyncio.to_thread(_put_multipart, url, filename, content)
+        return info, len(content)
+
+
+def _put_multipart(url, filename, content):
+    boundary = uuid.uuid4().hex
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n").encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    req = urllib.request.Request(url, data=body, method='PUT', headers={'Content-Type': f'multipart/form-data; boundary={boundary}'})
+    with urllib.request.urlopen(req, timeout=60) as r: r.read()
+
+
+def upload_workbook(tag, rows=5):
+    df = pd.DataFrame({
+        'CK관리번호': [f"{LT_PREFIX}UP-{tag}-{i}" for i in range(rows)],
+        '품명': [LT_PRODUCT[1]] * rows,
+        '수출자(수입자)': ['LOADTEST'] * rows,
+        '오픈수량': [100 + i for i in range(rows)],
+        '단가': [1.5] * rows,
+        'ETA': [(date.today() + timedelta(days=30)).isoformat()] * rows,
+    })
+    buf = io.BytesIO()
+    df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+# ==========================================
+# 사용자 흐름
+# ==========================================
+
+def _radio(value):
+    return lambda ws: setattr(ws, 'string_value', value)
+
+
+async def flow(sess, it, think):
+    nav = lambda: sess.find('radio', key='nav_menu')
+    tabs = list(sess.widgets[nav()][2].options)   # 메뉴 라벨 (views.MENU_OPTIONS 순서)
+
+    async def pause():
+        if think > 0: await asyncio.sleep(random.uniform(0, think))
+
+    # 1) 수입장부 열기
+    await sess.rerun('장부 열기', values={nav(): _radio(tabs[1])})
+    await pause()
+
+    # 2) 행 선택 -> 등록/관리 탭으로 이동 (앱이 nav_menu 를 바꾸고 st.rerun)
+    grid = sess.find_prefix('dataframe', 'ledger_df_')
+    if grid:
+        sel = json.dumps({"selection": {"rows": [random.randint(0, 20)], "columns": [], "cells": []}})
+        await sess.rerun('행 선택', values={grid[0]: lambda ws: setattr(ws, 'string_value', sel)})
+        sess.states.pop(grid[0], None)
+        sess.states.pop(nav(), None)   # 서버가 바꾼 탭 값을 유지
+    await pause()
+
+    # 3) 상세 폼 저장
+    save_btn = sess.find('button', label='정보 저장')
+    if save_btn:
+        await sess.rerun('폼 저장', triggers=[save_btn])
+    await pause()
+
+    # 4) 엑셀 업로드 -> 분석 및 등록
+    if sess.find('radio', key='nav_menu') and sess.find('file_uploader') is None:
+        await sess.rerun('등록 탭', values={nav(): _radio(tabs[4])})
+    up = sess.find('file_uploader')
+    if up:
+        content = upload_workbook(f"{sess.name}-{it}")
+        info, size = await sess.upload('loadtest.xlsx', content)
+
+        def set_file(ws):
+            f = ws.file_uploader_state_value.uploaded_file_info.add()
+            f.file_id, f.name, f.size = info.file_id, 'loadtest.xlsx', size
+            f.file_urls.CopyFrom(info)
+        await sess.rerun('파일 선택', values={up: set_file})
+        start = sess.find('button', label='분석')
+        if start: await sess.rerun('엑셀 미리보기', triggers=[start])
+        commit = sess.find('button', label='등록 실행')
+        if commit: await sess.rerun('엑셀 등록', triggers=[commit])
+        sess.states.pop(up, None)
+    await pause()
+
+    # 5) 수출 그리드 수정 -> 저장
+    await sess.rerun('수출 탭', values={nav(): _radio(tabs[2])})
+    editor = sess.find('dataframe', key='export_editor')
+    save_exp = sess.find('button', label='변경사항 저장')
+    if editor and save_exp:
+        edit = json.dumps({"edited_rows": {"0": {"note": f"LT {sess.name}-{it}"}}, "added_rows": [], "deleted_rows": []})
+        await sess.rerun('그리드 편집', values={editor: lambda ws: setattr(ws, 'string_value', edit)})
+        await sess.rerun('그리드 저장', triggers=[save_exp])
+        sess.states.pop(editor, None)
+    await pause()
+
+
+async def run_session(base_url, idx, iterations, think, timeout, start_gate):
+    sess = Session(base_url, f"s{idx}", timeout)
+    await start_gate.wait()
+    try:
+        await sess.connect()
+        for it in range(iterations):
+            await flow(sess, it, think)
+    except Exception as e:
+        sess.errors.append(f"세션 중단: {e!r}")
+    finally:
+        await sess.close()
+    return sess
+
+
+async def run_load(base_url, sessions, iterations, think, timeout):
+    # 모든 세션을 만든 뒤 동시에 시작
+    gate = asyncio.Event()
+    tasks = [asyncio.create_task(run_session(base_url, i, iterations, think, timeout, gate)) for i in range(sessions)]
+    gate.set()
+    return await asyncio.gather(*tasks)
+
+
+# ==========================================
+# 서버 기동 / 보고
+# ==========================================
+
+def start_server(script, port):
+    cmd = [sys.executable, '-m', 'streamlit', 'run', script, '--server.port', str(port), '--server.headless', 'true',
+           '--server.enableXsrfProtection', 'false', '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false']
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(120):
+        try:
+            with urllib.request.urlopen(base_url + '/_stcore/health', timeout=1) as r:
+                if r.status == 200: return proc, base_url
+        except Exception:
+            time.sleep(0.5)
+    proc.terminate()
+    raise SystemExit("streamlit 서버 기동 실패")
+
+
+def _pct(samples, q):
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(round(q * (len(s) - 1))))] if s else float('nan')
+
+
+def report(results, sampler, elapsed):
+    lat = [ms for s in results for _, ms in s.latencies]
+    by_step = {}
+    for s in results:
+        for step, ms in s.latencies: by_step.setdefault(step, []).append(ms)
+    errors = [e for s in results for e in s.errors]
+
+    print(f"\n세션 {len(results)}개, rerun {len(lat)}회, {elapsed:.1f}s ({len(lat) / elapsed:.1f} rerun/s), 오류 {len(errors)}건")
+    print(f"{'단계':<14}{'n':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for step, v in list(by_step.items()) + [('전체', lat)]:
+        print(f"{step:<14}{len(v):>6}{_pct(v, .5):>10.1f}{_pct(v, .95):>10.1f}{_pct(v, .99):>10.1f}{max(v):>10.1f}")
+
+    if sampler.samples:
+        total = [t for t, _, _ in sampler.samples]
+        active = [a for _, a, _ in sampler.samples]
+        locks = [w for _, _, w in sampler.samples]
+        print(f"\nDB 커넥션 (샘플 {len(total)}개, 앱 풀 한도 {POOL_SIZE}+{POOL_MAX - POOL_SIZE})")
+        print(f"  열린 커넥션  최대 {max(total)}  평균 {statistics.mean(total):.1f}")
+        print(f"  active      최대 {max(active)}  평균 {statistics.mean(active):.2f}  p95 {_pct(active, .95)}")
+        print(f"  락 대기      최대 {max(locks)}")
+        print(f"  풀 기본 크기 이상 사용 {100 * sum(t >= POOL_SIZE for t in total) / len(total):.0f}%  "
+              f"/ 최대치 도달 {100 * sum(t >= POOL_MAX for t in total) / len(total):.0f}% 구간")
+    for e in errors[:10]: print("  !", e)
+    return 1 if errors else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 부하 테스트")
+    parser.add_argument('--script', default=os.path.join(ROOT, 'impot_app.py'))
+    parser.add_argument('--db-url', default=None)
+    parser.add_argument('--seed-rows', type=int, default=0, help="실행 전 합성 수입 건 수 (수출은 1/5)")
+    parser.add_argument('--seed-years', type=int, default=0, help="합성 데이터 ETA 분포 기간(년), 0 이면 -60~+90일")
+    parser.add_argument('--cleanup', action='store_true', help="부하 테스트 데이터만 삭제하고 종료")
+    parser.add_argument('--sessions', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=2)
+    parser.add_argument('--think', type=float, default=0.5, help="동작 사이 최대 대기(초, 균등 분포)")
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--port', type=int, default=8599)
+    parser.add_argument('--url', default=None, help="이미 실행 중인 서버 주소 (지정 시 서버를 띄우지 않음)")
+    args = parser.parse_args()
+
+    engine = create_engine(load_db_url(args.db_url))
+    if args.cleanup:
+        cleanup(engine); return 0
+    if args.seed_rows: seed(engine, args.seed_rows, args.seed_years)
+    ensure_product(engine)
+
+    proc, base_url = (None, args.url) if args.url else start_server(args.script, args.port)
+    sampler = ConnSampler(engine)
+    try:
+        # 워밍업 세션 1개 (프로세스 기동/스키마 부트스트랩 비용 제외)
+        asyncio.run(run_load(base_url, 1, 0, 0, args.timeout))
+        sampler.start()
+        t0 = time.perf_counter()
+        results = asyncio.run(run_load(base_url, args.sessions, args.iterations, args.think, args.timeout))
+        elapsed = time.perf_counter() - t0
+    finally:
+        if proc is not None:
+            proc.terminate(); proc.wait(timeout=30)
+        sampler.stop()
+    return report(results, sampler, elapsed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
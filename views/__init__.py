@@ -0,0 +1,54 @@
+"""
+탭(화면)별 렌더링 모듈
+- 선택된 탭의 모듈만 처음 방문 시 import (importlib 는 sys.modules 캐시 -> 이후 rerun 은 render() 호출만)
+- 렌더링 후 다음에 열 가능성이 높은 탭의 데이터를 백그라운드에서 선조회 (prefetch_next)
+"""
+import importlib
+
+import db
+
+# 탭 메뉴 정의
+MENU_OPTIONS = [
+    "📊 수입진행상황", 
+    "📒 수입장부 (상세)", 
+    "📤 수출 (Export)", 
+    "tj 삼각무역 (Triangular)", 
+    "📝 수입 등록/관리", 
+    "📦 품목 관리",
+    "💱 FX/만기 분석"
+]
+
+VIEW_MODULES = dict(zip(MENU_OPTIONS, [
+    'views.dashboard', 'views.ledger', 'views.export', 'views.triangular',
+    'views.register', 'views.products', 'views.fx',
+]))
+
+
+# 탭별 조회 데이터 (db.PREFETCH_WARMERS 키)
+TAB_DATA = dict(zip(MENU_OPTIONS, [
+    ('eta_summary', 'eta_board'),
+    ('import_schedules',),
+    ('export_schedules',),
+    ('import_schedules', 'triangular_trades'),
+    ('import_schedules', 'products'),
+    ('products',),
+    ('open_positions',),
+]))
+
+
+def next_tabs(tab):
+    """다음에 열 가능성이 높은 탭: 장부 행 클릭 시 이동하는 등록/관리 + 좌우 인접 탭"""
+    i = MENU_OPTIONS.index(tab) if tab in MENU_OPTIONS else 0
+    tabs = [MENU_OPTIONS[4]] if i == 1 else []
+    return tabs + [MENU_OPTIONS[j] for j in (i + 1, i - 1) if 0 <= j < len(MENU_OPTIONS) and MENU_OPTIONS[j] not in tabs]
+
+
+def prefetch_next(tab):
+    """현재 탭이 이미 조회한 데이터는 제외하고 다음 탭 후보의 데이터만 선조회"""
+    loaded = set(TAB_DATA.get(tab, ()))
+    keys = [k for t in next_tabs(tab) for k in TAB_DATA[t] if k not in loaded]
+    db.prefetch_data(list(dict.fromkeys(keys)))
+
+
+def render(tab):
+    importlib.import_module(VIEW_MODULES.get(tab, VIEW_MODULES[MENU_OPTIONS[0]])).render()
@@ -0,0 +1,76 @@
+"""
+TAB 1: 수입진행상황
+"""
+import streamlit as st
+from datetime import timedelta
+
+from common import get_kst_today, to_records
+from db import get_eta_board, get_eta_summary
+
+
+def render_eta_heatmap(summary_df, start_date, weeks=8):
+    """ETA 캘린더 히트맵 스트립 HTML (주 단위 행, 요일 열)"""
+    cnt_map = {}
+    if not summary_df.empty:
+        active = summary_df[summary_df['status'] != 'CANCELED']
+        cnt_map = active.groupby('expected_date')['cnt'].sum().to_dict()
+    max_cnt = max(cnt_map.values()) if cnt_map else 0
+    palette = ['#f8f9fa', '#d0ebff', '#a5d8ff', '#74c0fc', '#339af0', '#1c7ed6']
+    today = get_kst_today()
+    week_start = start_date - timedelta(days=start_date.weekday())
+
+    html = """<table style="width:100%; border-collapse: separate; border-spacing:3px; font-size:12px; text-align:center; margin-bottom:15px;"><thead><tr><th></th>"""
+    html += "".join(f"<th style='color:#868e96; font-weight:normal;'>{d}</th>" for d in ['월', '화', '수', '목', '금', '토', '일'])
+    html += "</tr></thead><tbody>"
+    for w in range(weeks):
+        w_start = week_start + timedelta(weeks=w)
+        html += f"<tr><td style='color:#868e96; white-space:nowrap; padding-right:6px;'>{w_start.strftime('%m/%d')}~</td>"
+        for d in range(7):
+            day = w_start + timedelta(days=d)
+            c = int(cnt_map.get(day, 0))
+            level = 0 if c == 0 else 1 + int((len(palette) - 2) * c / max_cnt)
+            color = '#fff' if level >= 4 else '#495057'
+            border = "2px solid #f08c00" if day == today else "1px solid #e9ecef"
+            html += f"<td title='{day} : {c}건' style='background-color:{palette[level]}; color:{color}; border:{border}; border-radius:4px; padding:6px;'>{day.day}<br><b>{c if c else ''}</b></td>"
+        html += "</tr>"
+    html += "</tbody></table>"
+    return html
+
+def render():
+    st.markdown("### 📅 수입 진행 현황판")
+
+    # 헤더/히트맵은 사전 집계 테이블, 표는 표시 컬럼만 조회 (장부 전체 프레임 미사용)
+    eta_sum = get_eta_summary('import_schedules')
+    if not eta_sum.empty:
+        by_status = eta_sum.groupby('status')[['cnt', 'quantity', 'open_amount']].sum()
+        def status_total(code, col):
+            return by_status.loc[code, col] if code in by_status.index else 0
+
+        today = get_kst_today()
+        week_end = today + timedelta(days=6 - today.weekday())
+        this_week = eta_sum[(eta_sum['expected_date'] >= today) & (eta_sum['expected_date'] <= week_end) & (eta_sum['status'] != 'CANCELED')]
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("진행중", f"{int(status_total('PENDING', 'cnt')):,}건", f"수량 {status_total('PENDING', 'quantity'):,.0f}", delta_color="off")
+        m2.metric("진행중 오픈금액", f"${status_total('PENDING', 'open_amount'):,.0f}")
+        m3.metric("이번주 입항 예정", f"{int(this_week['cnt'].sum()):,}건", f"수량 {this_week['quantity'].sum():,.0f}", delta_color="off")
+        m4.metric("입고완료 / 취소", f"{int(status_total('ARRIVED', 'cnt')):,} / {int(status_total('CANCELED', 'cnt')):,}")
+
+        st.markdown(render_eta_heatmap(eta_sum, today), unsafe_allow_html=True)
+
+    df = get_eta_board('import_schedules')
+    if df.empty:
+        st.info("등록된 수입 일정이 없습니다.")
+    else:
+        html_content = """<table style="width:100%; border-collapse: collapse; font-size:13px; text-align:center;"><thead><tr style="background-color:#f8f9fa; border-bottom:2px solid #dee2e6;"><th style="padding:10px;">입항일</th><th style="padding:10px;">공급사</th><th style="padding:10px;">품명</th><th style="padding:10px;">CK</th><th style="padding:10px;">사이즈</th><th style="padding:10px;">단가</th><th style="padding:10px;">수량</th><th style="padding:10px;">상태</th></tr></thead><tbody>"""
+        prev_date = None
+        for row in to_records(df):
+            date_str = row['eta_str']
+            if date_str != prev_date:
+                html_content += f"""<tr style="background-color:#e7f5ff; border-top:1px solid #dee2e6; border-bottom:1px solid #dee2e6;"><td colspan="8" style="padding:8px; font-weight:bold; text-align:left; padding-left:15px; color:#495057;">📅 {date_str} (총 {int(row['day_cnt'])}건)</td></tr>"""
+                prev_date = date_str
+            status_cls = "status-pending" if row['status'] == 'PENDING' else ("status-arrived" if row['status'] == 'ARRIVED' else "status-canceled")
+            status_txt = "진행중" if row['status'] == 'PENDING' else ("입고완료" if row['status'] == 'ARRIVED' else "취소")
+            html_content += f"""<tr style="border-bottom:1px solid #f1f3f5; height: 40px;"><td style="color:#868e96;">{date_str}</td><td>{row['supplier'] or '-'}</td><td style="font-weight:bold; color:#343a40;">{row['product_name']}</td><td style="font-family:monospace; color:#495057;">{row['ck_code'] or '-'}</td><td>{row['size'] or '-'}</td><td>${float(row['unit_price'] or 0):.2f}</td><td style="font-weight:bold; color:#1c7ed6;">{int(row['quantity'] or 0):,}</td><td><span class="status-badge {status_cls}">{status_txt}</span></td></tr>"""
+        html_content += "</tbody></table>"
+        st.markdown(html_content, unsafe_allow_html=True)
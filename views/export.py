@@ -0,0 +1,77 @@
+"""
+TAB 3: 수출 (Export) - Editable
+"""
+import time
+
+import pandas as pd
+import streamlit as st
+
+from common import py_value
+from db import ARCHIVE_HORIZON_DAYS, get_archived_schedules, get_schedule_data, save_schedule
+from views.shared import render_ledger_download
+
+
+def render():
+    st.markdown("### 📤 수출 장부 (직접 입력 가능)")
+    st.info("💡 엑셀처럼 셀을 더블클릭하여 내용을 수정하세요. '수출자(수입자)' 칸은 바이어 정보를 입력하면 됩니다.")
+    
+    render_ledger_download('export_schedules', 'export_ledger_export')
+    df_export = get_schedule_data('export_schedules', 'ALL')
+    
+    if st.button("➕ 빈 행 추가 (신규 수출 건)"):
+        save_schedule({'status': 'PENDING'}, None, 'export_schedules')
+        st.rerun()
+
+    if not df_export.empty:
+        ui_cols = [
+            'id', 'ck_code', 'global_code', 'doojin_code', 'supplier', 'origin', 'product_name', 'size', 'packing',
+            'quantity', 'unit', 'unit_price', 'unit2', 'open_amount', 'tt_check', 'bank', 'lc_no', 
+            'invoice_no', 'bl_no', 'etd', 'expected_date', 'status', 'note'
+        ]
+        ui_cols = [c for c in ui_cols if c in df_export.columns]
+        
+        # data_editor 는 category 컬럼을 기존 값 목록으로 제한하므로 일반 문자열 컬럼 사본으로 편집
+        df_export = df_export.astype({c: object for c in df_export.columns if isinstance(df_export[c].dtype, pd.CategoricalDtype)})
+        edited_df = st.data_editor(
+            df_export,
+            column_config={
+                "id": st.column_config.NumberColumn("ID", disabled=True, width="small"),
+                "supplier": st.column_config.TextColumn("바이어(수입자)"),
+                "product_name": st.column_config.TextColumn("품명 (수정불가, ID로 관리)", disabled=True),
+                "expected_date": st.column_config.DateColumn("ETA", format="YYYY-MM-DD"),
+                "etd": st.column_config.DateColumn("ETD", format="YYYY-MM-DD"),
+            },
+            hide_index=True,
+            use_container_width=True,
+            num_rows="fixed",
+            key="export_editor"
+        )
+        
+        if st.button("💾 변경사항 저장 (수출)"):
+            diff_count = 0
+            for index, row in edited_df.iterrows():
+                orig_row = df_export[df_export['id'] == row['id']].iloc[0]
+                changed = {}
+                for col in ui_cols:
+                    if col == 'product_name': continue 
+                    if str(row[col]) != str(orig_row[col]):
+                        changed[col] = py_value(row[col])
+                
+                if changed:
+                    save_schedule(changed, row['id'], 'export_schedules')
+                    diff_count += 1
+            
+            if diff_count > 0:
+                st.success(f"{diff_count}건 저장 완료!")
+                time.sleep(1)
+                st.rerun()
+            else: st.info("변경 사항이 없습니다.")
+    else: st.warning("등록된 수출 건이 없습니다.")
+
+    # 보관 건은 편집 대상이 아니므로 별도 조회 전용 표로 표시
+    if st.toggle(f"🗄️ 보관 건 보기 (ETA {ARCHIVE_HORIZON_DAYS}일 지난 취소 건 · 잔액 없는 도착 건, 읽기 전용)", key="export_show_archive"):
+        df_arc = get_archived_schedules('export_schedules')
+        if df_arc.empty: st.caption("보관된 수출 건이 없습니다.")
+        else:
+            st.caption(f"보관 {len(df_arc)}건")
+            st.dataframe(df_arc, use_container_width=True, hide_index=True, height=400)
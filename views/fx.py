@@ -0,0 +1,45 @@
+"""
+TAB 7: FX/만기 분석
+"""
+import streamlit as st
+
+import fx_exposure
+from common import get_kst_today
+from db import get_open_positions
+
+
+def render():
+    st.markdown("### 💱 L/C 미결제 포지션 FX / 만기 분석")
+    st.caption("취소 건 제외, 서류금액(없으면 오픈금액) - 결제금액 > 0 인 건 기준. 적용 환율: 통관 가중평균 > 평균환율 > 도착일 환율 > 환율")
+
+    positions = get_open_positions()
+    if positions.empty:
+        st.info("미결제 포지션이 없습니다.")
+    else:
+        avg_rate = fx_exposure.portfolio_avg_rate(positions)
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("미결제 건수", f"{len(positions):,}건")
+        m2.metric("미결제 잔액 (USD)", f"${positions['outstanding'].sum():,.0f}")
+        m3.metric("가중평균 적용 환율", f"{avg_rate:,.2f}" if avg_rate else "-")
+        m4.metric("환율 미상 건수", f"{int(positions['booked_rate'].isna().sum()):,}건")
+
+        what_if = st.number_input("가정 환율 (KRW/USD)", value=round(avg_rate or 1300.0, 2), step=1.0, format="%.2f", key="fx_what_if")
+        exp_df = fx_exposure.krw_exposure(positions, what_if)
+
+        # m1~m3 은 적용 환율이 있는 건만 (m2 - m1 = m3), 환율 미상 건은 m4 에 따로
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("원화 환산 (적용 환율)", f"₩{exp_df['booked_krw'].sum():,.0f}")
+        m2.metric("원화 환산 (가정 환율)", f"₩{exp_df['what_if_krw'].sum():,.0f}")
+        m3.metric("차이 (환율 미상 건 제외)", f"₩{exp_df['krw_diff'].sum():,.0f}")
+        m4.metric("환율 미상 잔액", f"${exp_df['unrated_out'].sum():,.0f}", f"가정 환율 ₩{exp_df['unrated_krw'].sum():,.0f}", delta_color="off")
+
+        st.markdown("<div class='form-header'>주별 × 은행별 만기 사다리 (USD)</div>", unsafe_allow_html=True)
+        ladder = fx_exposure.maturity_ladder(positions, get_kst_today())
+        st.dataframe(ladder.style.format("{:,.0f}"), use_container_width=True)
+
+        st.markdown("<div class='form-header'>은행별 노출</div>", unsafe_allow_html=True)
+        st.dataframe(fx_exposure.exposure_by_bank(exp_df).style.format("{:,.2f}", subset=['가중평균_환율']).format("{:,.0f}", subset=['잔액_USD', '원화_적용', '원화_가정', '차이', '미상_USD', '미상_원화_가정']), use_container_width=True)
+
+        st.markdown("<div class='form-header'>잔액 상위 포지션 (최대 500건)</div>", unsafe_allow_html=True)
+        top_cols = ['ck_code', 'product_name', 'bank', 'lc_no', 'eff_maturity', 'outstanding', 'clr_avg_rate', 'booked_rate', 'booked_krw', 'what_if_krw', 'krw_diff']
+        st.dataframe(exp_df.nlargest(500, 'outstanding')[top_cols], use_container_width=True, hide_index=True, height=400)
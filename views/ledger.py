@@ -0,0 +1,82 @@
+"""
+TAB 2: 수입장부 (상세)
+"""
+import streamlit as st
+from datetime import timedelta
+
+from common import get_kst_today, load_json_list
+from db import ARCHIVE_HORIZON_DAYS, get_clearance_balance, get_clearances_between, get_schedule_data
+from views import MENU_OPTIONS
+from views.shared import render_ledger_download, reset_detail_form_widgets
+
+
+def render():
+    st.markdown("### 📒 수입장부 상세 내역")
+    st.info("💡 행을 클릭하면 해당 건의 수정(등록/관리) 페이지로 이동합니다.")
+    
+    if st.toggle("🛃 통관 현황 보기 (기간 통관 내역 / 미통관 잔량)", key="show_clearance_status"):
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown("<div class='form-header'>기간 통관 내역</div>", unsafe_allow_html=True)
+            today = get_kst_today()
+            clr_range = st.date_input("통관일 범위", value=(today - timedelta(days=7), today), key="clr_range")
+            if isinstance(clr_range, (list, tuple)) and len(clr_range) == 2:
+                df_clr = get_clearances_between(clr_range[0], clr_range[1])
+                if df_clr.empty: st.caption("해당 기간 통관 내역이 없습니다.")
+                else:
+                    st.caption(f"총 {len(df_clr)}건 / 통관수량 {df_clr['qty'].astype(float).sum():,.0f}")
+                    st.dataframe(df_clr, use_container_width=True, hide_index=True, height=300)
+        with c2:
+            st.markdown("<div class='form-header'>미통관 잔량 (건별)</div>", unsafe_allow_html=True)
+            df_bal = get_clearance_balance()
+            if df_bal.empty: st.caption("미통관 잔량이 없습니다.")
+            else:
+                st.caption(f"총 {len(df_bal)}건 / 미통관 잔량 {df_bal['outstanding_qty'].astype(float).sum():,.0f}")
+                st.dataframe(df_bal, use_container_width=True, hide_index=True, height=300)
+        st.markdown("---")
+
+    include_archive = st.toggle(f"🗄️ 보관 건 포함 (ETA {ARCHIVE_HORIZON_DAYS}일 지난 취소 건 · 잔액 없는 도착 건, 읽기 전용)", key="ledger_include_archive")
+    render_ledger_download('import_schedules', 'ledger_export', include_archive)
+    df_ledger = get_schedule_data('import_schedules', 'ALL', include_archive=include_archive)
+
+    if not df_ledger.empty:
+        if 'tri_cnt' in df_ledger.columns:
+            df_ledger.insert(0, '구분', df_ledger['tri_cnt'].apply(lambda x: '삼각' if x > 0 else ''))
+        if include_archive and 'archived' in df_ledger.columns:
+            if '구분' not in df_ledger.columns: df_ledger.insert(0, '구분', '')
+            df_ledger['구분'] = df_ledger['구분'].where(~df_ledger['archived'].astype(bool), '보관')
+            df_ledger = df_ledger.drop(columns=['archived'])
+        
+        # [수정] 동적 키 사용 (선택 상태 초기화용)
+        dynamic_key = f"ledger_df_{st.session_state['df_key_tracker']}"
+        
+        event = st.dataframe(
+            df_ledger, 
+            use_container_width=True, 
+            height=600, 
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=dynamic_key
+        )
+        
+        if len(event.selection.rows) > 0:
+            selected_idx = event.selection.rows[0]
+            selected_row = df_ledger.iloc[selected_idx]
+            if selected_row.get('구분') == '보관':
+                st.warning("보관된 건은 수정할 수 없습니다 (조회 전용)."); return
+            
+            # 세션에는 id만 보관 (행 값은 공유 캐시에서 조회)
+            st.session_state['edit_mode'] = 'edit'
+            st.session_state['selected_id'] = int(selected_row['id'])
+            st.session_state['clearance_list'] = load_json_list(selected_row['clearance_info'])
+            st.session_state['declaration_list'] = load_json_list(selected_row['declaration_info'])
+            reset_detail_form_widgets()
+            
+            # [핵심 수정] 탭 이동 및 데이터프레임 키 변경(다음 렌더링 시 선택 초기화)
+            # nav_menu 라디오는 이미 생성됐으므로 직접 바꿀 수 없음 -> 다음 실행에서 라디오 생성 전에 반영
+            st.session_state['nav_target'] = MENU_OPTIONS[4] # "📝 수입 등록/관리"
+            st.session_state['df_key_tracker'] += 1
+            st.rerun()
+            
+    else: st.info("데이터가 없습니다.")
@@ -0,0 +1,37 @@
+"""
+TAB 6: 품목 관리
+"""
+import time
+
+import streamlit as st
+
+from db import get_products_df, register_new_product
+
+
+def render():
+    st.markdown("### 📦 시스템 품목 관리")
+    col_p1, col_p2 = st.columns([1, 2])
+    with col_p1:
+        st.markdown("#### 신규 품목 등록")
+        with st.form("new_prod_form"):
+            new_code = st.text_input("품목코드 (고유값)", placeholder="예: P1001")
+            new_name = st.text_input("품목명")
+            new_cat = st.text_input("카테고리", placeholder="예: 수입")
+            new_unit = st.text_input("기본 단위", value="Box")
+            
+            if st.form_submit_button("품목 저장", type="primary"):
+                if new_code and new_name:
+                    succ, msg = register_new_product(new_code, new_name, new_cat, new_unit)
+                    if succ:
+                        st.success(msg)
+                        time.sleep(1)
+                        st.rerun()
+                    else: st.error(msg)
+                else: st.warning("코드와 품목명은 필수입니다.")
+    
+    with col_p2:
+        st.markdown("#### 등록된 품목 리스트")
+        curr_prods = get_products_df()
+        if not curr_prods.empty:
+            st.dataframe(curr_prods, use_container_width=True, hide_index=True)
+        else: st.info("등록된 품목이 없습니다.")
@@ -0,0 +1,338 @@
+"""
+TAB 5: 등록 및 관리 (복원됨)
+"""
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from common import get_kst_today, load_json_list, safe_date_parse, to_records
+from db import (commit_import, delete_schedule, get_products_df, get_schedule_data, get_schedule_record, parse_uploads,
+                preview_import, register_products_bulk, save_schedule)
+from excel_import import product_key, resolve_pending
+from views.shared import reset_detail_form_widgets
+
+
+def render():
+    col_list, col_form = st.columns([1, 2])
+    
+    with col_list:
+        sub_t1, sub_t2 = st.tabs(["목록 선택", "엑셀 일괄 등록"])
+        
+        with sub_t1:
+            st.subheader("등록 건 목록")
+            df_list = get_schedule_data('import_schedules', 'ALL')
+            
+            search_txt = st.text_input("🔍 검색 (CK, 품명 등)", key="list_search")
+            if not df_list.empty and search_txt:
+                mask = df_list.apply(lambda x: x.astype(str).str.contains(search_txt, case=False).any(), axis=1)
+                df_list = df_list[mask]
+            
+            if st.button("➕ 신규 등록 (빈 양식)", type="primary", use_container_width=True):
+                st.session_state['edit_mode'] = 'new'
+                st.session_state['selected_id'] = None
+                st.session_state['clearance_list'] = []
+                st.session_state['declaration_list'] = []
+                reset_detail_form_widgets()
+                st.rerun()
+                
+            st.markdown("---")
+            if not df_list.empty:
+                for row in to_records(df_list):
+                    st_icon = "🟢" if row['status'] == 'ARRIVED' else ("🟠" if row['status'] == 'PENDING' else "🔴")
+                    label = f"{st_icon} **[{row['ck_code'] or 'NO-CK'}]** {row['product_name']}"
+                    sub = f"{row['supplier'] or '-'} | ETA: {row['expected_date']}"
+                    with st.container(border=True):
+                        st.markdown(label)
+                        st.caption(sub)
+                        if st.button("상세/수정", key=f"sel_{row['id']}", use_container_width=True):
+                            st.session_state['edit_mode'] = 'edit'
+                            st.session_state['selected_id'] = row['id']
+                            
+                            st.session_state['clearance_list'] = load_json_list(row['clearance_info'])
+                            st.session_state['declaration_list'] = load_json_list(row['declaration_info'])
+                            reset_detail_form_widgets()
+                            
+                            st.rerun()
+            else: st.info("데이터가 없습니다.")
+        
+        with sub_t2:
+            st.subheader("엑셀 파일 업로드 (수입)")
+            up_files = st.file_uploader("파일 선택 (여러 개 가능, 엑셀은 전체 시트)", type=['csv', 'xlsx'], accept_multiple_files=True)
+            if up_files:
+                if st.button("분석 (등록 전 미리보기)", use_container_width=True):
+                    try:
+                        with st.spinner(f"{len(up_files)}개 파일 분석 중..."):
+                            results = parse_uploads([(f.name, f.getvalue()) for f in up_files])
+                            rows, pending = [], []
+                            for r in results:
+                                src = f"{r['file']}/{r['sheet'] or '-'}"
+                                rows += [{**d, '_source': src} for d in r['rows']]
+                                pending += [{**d, '_source': src} for d in r['pending']]
+                            # 미리보기 결과는 등록/취소 전까지만 세션에 보관
+                            st.session_state['import_preview'] = {
+                                'files': [{'file': r['file'], 'sheet': r['sheet'] or '-', 'rows': len(r['rows']),
+                                           'pending': len(r['pending']), 'errors': r['errors']} for r in results],
+                                'rows': rows, 'pending': pending, 'items': preview_import(rows),
+                            }
+                    except Exception as e: st.error(f"오류 발생: {e}")
+
+            preview = st.session_state.get('import_preview')
+            if preview:
+                st.dataframe(pd.DataFrame([
+                    {'파일': f['file'], '시트': f['sheet'], '유효': f['rows'], '미등록 품목': f['pending'], '에러': len(f['errors'])}
+                    for f in preview['files']
+                ]), hide_index=True, use_container_width=True)
+                err_cnt = sum(len(f['errors']) for f in preview['files'])
+                if err_cnt:
+                    st.error(f"{err_cnt}건의 에러가 있습니다.")
+                    with st.expander("에러 상세 보기"):
+                        for f in preview['files']:
+                            for e in f['errors']: st.write(f"- [{f['file']}/{f['sheet']}] {e}")
+
+                if preview['pending']:
+                    render_bulk_product_form(preview)
+
+                items = preview['items']
+                counts = pd.Series([it['status'] for it in items], dtype=object).value_counts()
+                m1, m2, m3, m4, m5 = st.columns(5)
+                m1.metric("신규", int(counts.get('신규', 0)))
+                m2.metric("변경", int(counts.get('변경', 0)))
+                m3.metric("동일", int(counts.get('동일', 0)))
+                m4.metric("중복 (건너뜀)", int(counts.get('중복', 0)))
+                m5.metric("보관 (건너뜀)", int(counts.get('보관', 0)), help="보관 테이블로 옮겨진 마감 건 - 읽기 전용")
+                if items:
+                    st.dataframe(pd.DataFrame([{
+                        '판정': it['status'], '출처': it['source'], 'CK관리번호': it['data'].get('ck_code'),
+                        '기존 ID': it['db_id'], '변경 항목': it['changes'],
+                    } for it in items]), hide_index=True, use_container_width=True)
+
+                c_ok, c_cancel = st.columns([3, 1])
+                n_todo = int(counts.get('신규', 0) + counts.get('변경', 0))
+                if c_ok.button(f"✅ 등록 실행 (신규 {int(counts.get('신규', 0))} / 변경 {int(counts.get('변경', 0))})",
+                               type="primary", use_container_width=True, disabled=n_todo == 0):
+                    prog = st.progress(0)
+                    added, updated, fail_reasons = commit_import(items, on_progress=prog.progress)
+                    del st.session_state['import_preview']
+                    if added or updated: st.toast(f"신규 {added}건 / 변경 {updated}건 반영 완료!"); st.success(f"신규 {added}건 등록, {updated}건 수정")
+                    if fail_reasons:
+                        with st.expander("실패 상세 사유 보기"):
+                            for reason in fail_reasons: st.write(reason)
+                if c_cancel.button("취소", use_container_width=True):
+                    del st.session_state['import_preview']
+                    st.rerun()
+
+    # [우측] 상세 입력 폼 (복원)
+    with col_form:
+        edit_mode = st.session_state.get('edit_mode', 'new')
+        data = get_schedule_record('import_schedules', st.session_state.get('selected_id'))
+        
+        if 'clearance_list' not in st.session_state: st.session_state['clearance_list'] = []
+        if 'declaration_list' not in st.session_state: st.session_state['declaration_list'] = []
+        
+        title_prefix = "수정" if edit_mode == 'edit' else "신규 등록"
+        st.subheader(f"📝 상세 정보 {title_prefix}")
+        
+        if edit_mode == 'edit' and not data:
+            st.info("좌측 목록에서 항목을 선택해주세요.")
+        else:
+            with st.form("detail_form"):
+                ft1, ft2, ft3, ft4 = st.tabs(["기본/계약", "물류/일정", "결제/L/C", "통관/기타"])
+
+                with ft1:
+                    st.markdown("<div class='form-header'>기본 식별 정보</div>", unsafe_allow_html=True)
+                    c1, c2, c3 = st.columns(3)
+                    ck_code = c1.text_input("CK 관리번호", value=data.get('ck_code', ''))
+                    global_code = c2.text_input("글로벌 번호", value=data.get('global_code', ''))
+                    doojin_code = c3.text_input("두진 번호", value=data.get('doojin_code', ''))
+                    
+                    p_df = get_products_df()
+                    p_opts = {row['ID']: f"[{row['카테고리']}] {row['품목명']} ({row['품목코드']})" for _, row in p_df.iterrows()}
+                    def_pid = data.get('product_id')
+                    if def_pid not in p_opts: def_pid = None
+                    opt_keys = list(p_opts.keys())
+                    sel_idx = opt_keys.index(def_pid) if def_pid in opt_keys else 0
+                    sel_pid = st.selectbox("품목 (필수)", options=opt_keys, format_func=lambda x: p_opts[x], index=sel_idx)
+
+                    st.markdown("<div class='form-header'>계약 및 물품 정보</div>", unsafe_allow_html=True)
+                    c1, c2, c3 = st.columns(3)
+                    supplier = c1.text_input("수출자(수입자)", value=data.get('supplier', ''))
+                    agency = c2.text_input("대행사", value=data.get('agency', ''))
+                    agency_contract = c3.text_input("대행 계약서", value=data.get('agency_contract', ''))
+                    
+                    c1, c2, c3 = st.columns(3)
+                    origin = c1.text_input("원산지", value=data.get('origin', ''))
+                    size = c2.text_input("사이즈", value=data.get('size', ''))
+                    packing = c3.text_input("Packing", value=data.get('packing', ''))
+                    
+                    c1, c2, c3 = st.columns(3)
+                    unit_price = c1.number_input("단가 (USD)", value=float(data.get('unit_price') or 0.0), step=0.01, format="%.2f")
+                    unit2 = c2.text_input("단가 단위", value=data.get('unit2', 'kg'))
+                    quantity = c3.number_input("오픈 수량", value=float(data.get('quantity') or 0.0))
+
+                    c1, c2, c3 = st.columns(3)
+                    doc_qty = c1.number_input("서류 수량", value=float(data.get('doc_qty') or 0.0))
+                    box_qty = c2.number_input("박스 수량", value=float(data.get('box_qty') or 0.0))
+                    open_amount = c3.number_input("오픈 금액", value=float(data.get('open_amount') or 0.0))
+
+                with ft2:
+                    st.markdown("<div class='form-header'>일정 및 물류 정보</div>", unsafe_allow_html=True)
+                    c1, c2 = st.columns(2)
+                    etd = c1.date_input("ETD (출항)", value=safe_date_parse(data.get('etd')))
+                    eta = c2.date_input("ETA (입항/예정일)", value=safe_date_parse(data.get('expected_date')) or get_kst_today())
+                    
+                    c1, c2 = st.columns(2)
+                    arrival_date = c1.date_input("실 입고일", value=safe_date_parse(data.get('arrival_date')))
+                    actual_in_qty = c2.number_input("실 입고 수량", value=float(data.get('actual_in_qty') or 0.0))
+                    
+                    c1, c2 = st.columns(2)
+                    warehouse = c1.text_input("창고", value=data.get('warehouse', ''))
+                    destination = c2.text_input("착지", value=data.get('destination', ''))
+                    
+                    st.markdown("<div class='form-header'>B/L 정보</div>", unsafe_allow_html=True)
+                    c1, c2, c3 = st.columns(3)
+                    invoice_no = c1.text_input("Invoice No.", value=data.get('invoice_no', ''))
+                    bl_no = c2.text_input("B/L No.", value=data.get('bl_no', ''))
+                    customs_broker_date = c3.date_input("관세사 전달일", value=safe_date_parse(data.get('customs_broker_date')))
+
+                with ft3:
+                    st.markdown("<div class='form-header'>L/C 정보</div>", unsafe_allow_html=True)
+                    c1, c2, c3 = st.columns(3)
+                    tt_check = c1.text_input("T/T 여부", value=data.get('tt_check', ''))
+                    bank = c2.text_input("개설 은행", value=data.get('bank', ''))
+                    open_date = c3.date_input("개설일", value=safe_date_parse(data.get('open_date')))
+                    
+                    c1, c2, c3 = st.columns(3)
+                    lc_no = c1.text_input("L/C No.", value=data.get('lc_no', ''))
+                    lg_no = c2.text_input("L/G", value=data.get('lg_no', ''))
+                    insurance = c3.text_input("보험", value=data.get('insurance', ''))
+
+                    st.markdown("<div class='form-header'>결제 및 인수</div>", unsafe_allow_html=True)
+                    c1, c2, c3 = st.columns(3)
+                    doc_acceptance = c1.date_input("서류 인수일", value=safe_date_parse(data.get('doc_acceptance')))
+                    maturity_date = c2.date_input("만기일", value=safe_date_parse(data.get('maturity_date')))
+                    payment_date = c3.date_input("결제일", value=safe_date_parse(data.get('payment_date')))
+                    
+                    c1, c2 = st.columns(2)
+                    payment_amount = c1.number_input("결제 금액", value=float(data.get('payment_amount') or 0.0))
+
+                with ft4:
+                    st.markdown("<div class='form-header'>통관 정보 (저장 후 입력칸 자동 추가)</div>", unsafe_allow_html=True)
+                    clr_data = st.session_state['clearance_list']
+                    new_clr_list = []
+                    
+                    for i in range(max(5, len(clr_data) + 1)):
+                        def_date = None; def_qty = 0.0; def_rate = 0.0
+                        if i < len(clr_data):
+                            try:
+                                if clr_data[i].get('date'): def_date = datetime.strptime(clr_data[i]['date'], '%Y-%m-%d').date()
+                                def_qty = float(clr_data[i].get('qty', 0))
+                                def_rate = float(clr_data[i].get('rate', 0))
+                            except: pass
+                        
+                        cc1, cc2, cc3 = st.columns(3)
+                        cd = cc1.date_input(f"통관일자 #{i+1}", value=def_date, key=f"clr_d_{i}")
+                        cq = cc2.number_input(f"수량 #{i+1}", value=def_qty, key=f"clr_q_{i}")
+                        cr = cc3.number_input(f"환율 #{i+1}", value=def_rate, key=f"clr_r_{i}")
+                        if cd or cq > 0: new_clr_list.append({"date": str(cd) if cd else None, "qty": cq, "rate": cr})
+
+                    st.markdown("<div class='form-header'>수입신고 정보 (저장 후 입력칸 자동 추가)</div>", unsafe_allow_html=True)
+                    decl_data = st.session_state['declaration_list']
+                    new_decl_list = []
+                    
+                    for i in range(max(5, len(decl_data) + 1)):
+                        d_def_date = None; d_def_no = ""
+                        if i < len(decl_data):
+                            try:
+                                if decl_data[i].get('date'): d_def_date = datetime.strptime(decl_data[i]['date'], '%Y-%m-%d').date()
+                                d_def_no = decl_data[i].get('no', "")
+                            except: pass
+                            
+                        dc1, dc2 = st.columns(2)
+                        dd = dc1.date_input(f"신고일 #{i+1}", value=d_def_date, key=f"decl_d_{i}")
+                        dn = dc2.text_input(f"신고번호 #{i+1}", value=d_def_no, key=f"decl_n_{i}")
+                        if dd or dn: new_decl_list.append({"date": str(dd) if dd else None, "no": dn})
+
+                    st.markdown("---")
+                    note = st.text_area("비고 / 메모", value=data.get('note', ''), height=100)
+                    
+                    st.markdown("##### 🏁 진행 상태 설정")
+                    curr_status = data.get('status', 'PENDING')
+                    status = st.radio("상태", ["PENDING", "ARRIVED", "CANCELED"], index=["PENDING", "ARRIVED", "CANCELED"].index(curr_status), horizontal=True)
+                    
+                    if status == 'ARRIVED' and curr_status != 'ARRIVED':
+                         st.warning("⚠️ 'ARRIVED'로 저장 시 자동으로 재고 테이블에 등록됩니다.")
+
+                st.markdown("---")
+                c_submit, c_del = st.columns([4, 1])
+                with c_submit:
+                    if st.form_submit_button("💾 정보 저장", type="primary", use_container_width=True):
+                        save_data = {
+                            'ck_code': ck_code, 'global_code': global_code, 'doojin_code': doojin_code,
+                            'product_id': sel_pid, 'agency': agency, 'agency_contract': agency_contract,
+                            'supplier': supplier, 'origin': origin, 'size': size, 'packing': packing,
+                            'unit_price': unit_price, 'unit2': unit2, 
+                            'quantity': quantity, 'doc_qty': doc_qty, 'box_qty': box_qty,
+                            'open_amount': open_amount, 
+                            'tt_check': tt_check, 'bank': bank, 'lc_no': lc_no, 'open_date': open_date,
+                            'invoice_no': invoice_no, 'bl_no': bl_no, 'lg_no': lg_no, 'insurance': insurance,
+                            'etd': etd, 'expected_date': eta, 'arrival_date': arrival_date, 'customs_broker_date': customs_broker_date,
+                            'warehouse': warehouse, 'destination': destination, 'actual_in_qty': actual_in_qty,
+                            'doc_acceptance': doc_acceptance, 'maturity_date': maturity_date, 'payment_date': payment_date,
+                            'payment_amount': payment_amount, 'note': note, 'status': status,
+                            'clearance_info': new_clr_list, 'declaration_info': new_decl_list
+                        }
+                        sid = data.get('id') if edit_mode == 'edit' else None
+                        succ, msg = save_schedule(save_data, sid)
+                        if succ:
+                            st.session_state['clearance_list'] = new_clr_list
+                            st.session_state['declaration_list'] = new_decl_list
+                            st.success(msg)
+                            time.sleep(1)
+                            st.rerun()
+                        else: st.error(f"저장 실패: {msg}")
+                
+                with c_del:
+                    if edit_mode == 'edit':
+                        if st.form_submit_button("🗑️ 삭제"):
+                            delete_schedule(data['id'])
+                            st.session_state['edit_mode'] = 'new'
+                            st.session_state['selected_id'] = None
+                            st.rerun()
+
+
+def _next_product_codes(p_df, n):
+    """기존 'P숫자' 품목코드 다음 번호부터 n개 제안"""
+    nums = p_df['품목코드'].astype(str).str.extract(r'^P(\d+)$')[0].dropna().astype(int) if not p_df.empty else pd.Series(dtype=int)
+    start = int(nums.max()) + 1 if not nums.empty else 1
+    return [f"P{start + i}" for i in range(n)]
+
+
+def render_bulk_product_form(preview):
+    """업로드의 미등록 품목을 한 번에 등록 -> 파일 재파싱 없이 대기 행 재판정"""
+    pending = preview['pending']
+    grp = pd.DataFrame({'key': [product_key(d['_product_name']) for d in pending], '품목명': [d['_product_name'] for d in pending]})
+    grid = grp.groupby('key', sort=False).agg(품목명=('품목명', 'first'), 행수=('품목명', 'size')).reset_index(drop=True)
+    grid = grid.rename(columns={'행수': '행 수'}).assign(품목코드=_next_product_codes(get_products_df(), len(grid)), 카테고리='', 단위='Box')
+
+    st.warning(f"미등록 품목 {len(grid)}종 ({len(pending)}행) - 품목을 등록하면 해당 행을 다시 판정합니다.")
+    with st.expander("🆕 미등록 품목 일괄 등록", expanded=True):
+        edited = st.data_editor(grid, key="bulk_product_editor", hide_index=True, use_container_width=True,
+                                disabled=['품목명', '행 수'], num_rows="fixed")
+        if st.button("품목 일괄 등록 후 다시 판정", type="primary", use_container_width=True):
+            codes = edited['품목코드'].astype(str).str.strip()
+            if (codes == '').any() or codes.duplicated().any():
+                st.error("품목코드는 비어 있거나 중복될 수 없습니다."); return
+            ok, msg = register_products_bulk([
+                {'code': c, 'name': n, 'cat': cat, 'unit': u}
+                for c, n, cat, u in zip(codes, edited['품목명'], edited['카테고리'], edited['단위'])
+            ])
+            if not ok: st.error(msg); return
+            resolved, left = resolve_pending(pending, get_products_df())
+            preview['rows'] += resolved
+            preview['pending'] = left
+            preview['items'] = preview_import(preview['rows'])
+            st.session_state.pop('bulk_product_editor', None)
+            st.toast(msg)
+            st.rerun()
@@ -0,0 +1,29 @@
+"""
+여러 탭에서 공용으로 쓰는 UI 헬퍼
+"""
+import functools
+
+import streamlit as st
+
+import ledger_export
+from common import get_kst_today
+from db import conn
+
+def render_ledger_download(table_name, key_prefix, include_archive=False):
+    """장부 내보내기 버튼 (클릭 시점에 서버 사이드 커서로 스트리밍 생성, include_archive: 보관 건 포함)"""
+    c1, c2 = st.columns([1, 3])
+    fmt = c1.selectbox("내보내기 형식", ["Excel (.xlsx)", "Parquet (.parquet)"], key=f"{key_prefix}_fmt", label_visibility="collapsed")
+    file_stem = f"{ledger_export.SHEET_TITLES.get(table_name, table_name)}{'_보관포함' if include_archive else ''}_{get_kst_today().strftime('%Y%m%d')}"
+    if fmt.startswith("Excel"):
+        c2.download_button("⬇️ 장부 내보내기", data=functools.partial(ledger_export.export_xlsx, conn.engine, table_name, include_archive=include_archive),
+                           file_name=f"{file_stem}.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                           key=f"{key_prefix}_download", on_click="ignore")
+    else:
+        c2.download_button("⬇️ 장부 내보내기", data=functools.partial(ledger_export.export_parquet, conn.engine, table_name, include_archive=include_archive),
+                           file_name=f"{file_stem}.parquet", mime="application/octet-stream",
+                           key=f"{key_prefix}_download", on_click="ignore")
+
+def reset_detail_form_widgets():
+    """통관/신고 입력칸 위젯 상태 초기화 (선택 건 변경 시 기본값이 반영되도록)"""
+    for k in list(st.session_state.keys()):
+        if str(k).startswith(('clr_d_', 'clr_q_', 'clr_r_', 'decl_d_', 'decl_n_')): del st.session_state[k]
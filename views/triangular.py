@@ -0,0 +1,113 @@
+"""
+TAB 4: 삼각무역 (Triangular) - Tag Management
+"""
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from common import safe_date_parse, to_records
+from db import get_schedule_data, get_triangular_trades, save_triangular_trade
+
+
+def render():
+    st.markdown("### 📐 삼각무역 (부가 정보 관리)")
+    st.markdown("기존 수입 건에 **삼각무역 관련 부가 정보(Tag)**를 연결하여 관리합니다.")
+    
+    col_sel, col_detail = st.columns([1, 2])
+    
+    with col_sel:
+        st.markdown("#### 1. 대상 수입 건 선택")
+        imp_df = get_schedule_data('import_schedules', 'ALL')
+        if imp_df.empty:
+            st.warning("등록된 수입 건이 없습니다.")
+            selected_imp_id = None
+        else:
+            imp_df['label'] = [f"[{x['ck_code'] or 'NO-CK'}] {x['product_name']}" for x in to_records(imp_df[['ck_code', 'product_name']])]
+            selected_imp_id = st.selectbox("수입 건 목록", imp_df['id'], format_func=lambda x: imp_df[imp_df['id']==x]['label'].values[0])
+    
+    with col_detail:
+        if selected_imp_id:
+            target_row = to_records(imp_df[imp_df['id'] == selected_imp_id])[0]
+            
+            st.markdown("#### 2. 선택된 수입 건 정보 (참고용)")
+            c1, c2, c3 = st.columns(3)
+            c1.info(f"**CK관리번호**: {target_row.get('ck_code') or '-'}")
+            c2.info(f"**원산지**: {target_row.get('origin') or '-'}")
+            c3.info(f"**품명**: {target_row.get('product_name')}")
+
+            # 기존 삼각무역 태그 조회 (단일 건)
+            tri_df = get_triangular_trades(selected_imp_id)
+            existing_data = None
+            if not tri_df.empty:
+                existing_data = tri_df.iloc[0].to_dict()
+
+            action_txt = "수정" if existing_data else "등록"
+            st.markdown(f"#### 3. 삼각무역 부가 정보 ({action_txt})")
+            
+            with st.form("add_tri_tag_form"):
+                st.caption(f"이 수입 건에 대한 부가 정보를 {action_txt}합니다.")
+                
+                # 값 초기화 로직
+                val_importer = existing_data.get('importer', '') if existing_data else ''
+                val_size = existing_data.get('size', '') if existing_data else ''
+                val_packing = existing_data.get('packing', '') if existing_data else ''
+                
+                val_qty = float(existing_data.get('open_qty', 0)) if existing_data else 0.0
+                val_unit = existing_data.get('unit', '') if existing_data else ''
+                val_amt = float(existing_data.get('open_amount', 0)) if existing_data else 0.0
+                
+                val_inv = existing_data.get('invoice_no', '') if existing_data else ''
+                val_eta = safe_date_parse(existing_data.get('eta')) if existing_data and existing_data.get('eta') else None
+                if val_eta: val_eta = datetime.strptime(val_eta, '%Y-%m-%d')
+                
+                val_pay_dt = safe_date_parse(existing_data.get('payment_date')) if existing_data and existing_data.get('payment_date') else None
+                if val_pay_dt: val_pay_dt = datetime.strptime(val_pay_dt, '%Y-%m-%d')
+                
+                val_pay_amt = float(existing_data.get('payment_amount', 0)) if existing_data else 0.0
+                val_ex_rate = float(existing_data.get('exchange_rate', 0)) if existing_data else 0.0
+
+                c1, c2, c3 = st.columns(3)
+                in_ck = c1.text_input("CK관리번호 (자동)", value=target_row.get('ck_code') or '', disabled=True)
+                in_og = c2.text_input("원산지 (자동)", value=target_row.get('origin') or '', disabled=True)
+                in_pn = c3.text_input("품명 (자동)", value=target_row.get('product_name') or '', disabled=True)
+
+                c1, c2, c3 = st.columns(3)
+                in_importer = c1.text_input("수입자", value=val_importer, placeholder="Buyer 입력")
+                in_size = c2.text_input("사이즈", value=val_size)
+                in_packing = c3.text_input("Packing", value=val_packing)
+                
+                c1, c2, c3 = st.columns(3)
+                in_qty = c1.number_input("오픈수량", value=val_qty)
+                in_unit = c2.text_input("단위", value=val_unit)
+                in_amt = c3.number_input("오픈금액", value=val_amt)
+                
+                c1, c2 = st.columns(2)
+                in_inv = c1.text_input("Invoice No.", value=val_inv)
+                in_eta = c2.date_input("ETA", value=val_eta)
+                
+                c1, c2, c3 = st.columns(3)
+                in_pay_dt = c1.date_input("결제일", value=val_pay_dt)
+                in_pay_amt = c2.number_input("결제금액", value=val_pay_amt)
+                in_ex_rate = c3.number_input("환율", value=val_ex_rate)
+
+                if st.form_submit_button(f"💾 정보 {action_txt} (Tag)"):
+                    save_data = {
+                        'import_id': selected_imp_id,
+                        'ck_code': target_row.get('ck_code'),
+                        'origin': target_row.get('origin'),
+                        'product_name': target_row.get('product_name'),
+                        'importer': in_importer,
+                        'size': in_size, 'packing': in_packing,
+                        'open_qty': in_qty, 'unit': in_unit, 'open_amount': in_amt,
+                        'invoice_no': in_inv, 'eta': in_eta,
+                        'payment_date': in_pay_dt, 'payment_amount': in_pay_amt, 'exchange_rate': in_ex_rate
+                    }
+                    
+                    tid = existing_data['id'] if existing_data else None
+                    ok, msg = save_triangular_trade(save_data, tid)
+                    if ok:
+                        st.success(msg)
+                        time.sleep(1)
+                        st.rerun()
+                    else: st.error(f"오류: {msg}")